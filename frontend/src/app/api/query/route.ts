@@ -1,21 +1,25 @@
-import type { QueryRequest, QueryResponse } from '@/types/python';
+import type { QueryEvent, QueryRequest, QueryResponse } from '@/types/python';
 
 import { NextResponse } from 'next/server';
-import { PythonExecutor } from '@/lib/python/executor';
+import { getPythonWorker } from '@/lib/python/executor';
 
 export async function POST(request: Request) {
   try {
     const body: QueryRequest = await request.json();
-    const executor = new PythonExecutor();
 
-    // Execute Python script with input
-    const result = await executor.execute('main.py', [
-      JSON.stringify(body)
-    ]);
+    if (body.stream) {
+      return streamQuery(body);
+    }
+
+    // Send the query to the long-running Python worker
+    const result = await getPythonWorker().request({
+      query: body.query,
+      additional_context: body.additional_context,
+    });
 
     return NextResponse.json({ 
       success: true, 
-      data: JSON.parse(result) 
+      data: result 
     } as QueryResponse);
   } catch (error) {
     console.error('Query execution error:', error);
@@ -27,4 +31,35 @@ export async function POST(request: Request) {
       { status: 500 }
     );
   }
-} 
\ No newline at end of file
+}
+
+/**
+ * Streams the stage events of a query as newline-delimited JSON, so the client can show the
+ * plan, Cypher and interpretation as they are produced. The last event holds the result.
+ */
+function streamQuery(body: QueryRequest): Response {
+  const encoder = new TextEncoder();
+  const stream = new ReadableStream({
+    async start(controller) {
+      const send = (event: QueryEvent) => {
+        controller.enqueue(encoder.encode(JSON.stringify(event) + '\n'));
+      };
+      try {
+        const result = await getPythonWorker().request(
+          { query: body.query, additional_context: body.additional_context },
+          send,
+        );
+        send({ stage: 'result', result });
+      } catch (error) {
+        console.error('Query execution error:', error);
+        send({ stage: 'error', error: 'Query processing failed' });
+      } finally {
+        controller.close();
+      }
+    },
+  });
+
+  return new Response(stream, {
+    headers: { 'Content-Type': 'application/x-ndjson' },
+  });
+}
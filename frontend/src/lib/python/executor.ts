@@ -1,5 +1,5 @@
 import path from 'path';
-import { spawn } from 'child_process';
+import { spawn, type ChildProcessWithoutNullStreams } from 'child_process';
 
 export class PythonExecutor {
   private pythonPath: string;
@@ -36,4 +36,123 @@ export class PythonExecutor {
       });
     });
   }
-} 
\ No newline at end of file
+} 
+type PendingRequest = {
+  resolve: (result: any) => void;
+  reject: (error: Error) => void;
+  onEvent?: (event: any) => void;
+  timer: NodeJS.Timeout;
+};
+
+/**
+ * Long-running Python query worker (scripts/api/worker.py) exchanging one JSON message per line,
+ * so the interpreter, imports, Neo4j driver and QueryEngine are only set up once.
+ */
+export class PythonWorker {
+  private pythonPath: string;
+  private timeoutMs: number;
+  private process: ChildProcessWithoutNullStreams | null = null;
+  private pending = new Map<number, PendingRequest>();
+  private nextId = 0;
+  private buffer = '';
+
+  constructor() {
+    this.pythonPath = process.env.PYTHON_PATH || 'python';
+    this.timeoutMs = Number(process.env.PYTHON_WORKER_TIMEOUT_MS || 120000);
+  }
+
+  private start(): ChildProcessWithoutNullStreams {
+    const scriptPath = path.join(process.cwd(), '..', 'scripts', 'api', 'worker.py');
+    const workerProcess = spawn(this.pythonPath, [scriptPath]);
+
+    workerProcess.stdout.on('data', (data) => {
+      this.buffer += data.toString();
+      let newline;
+      while ((newline = this.buffer.indexOf('\n')) >= 0) {
+        const line = this.buffer.slice(0, newline).trim();
+        this.buffer = this.buffer.slice(newline + 1);
+        if (line) {
+          this.handleMessage(line);
+        }
+      }
+    });
+
+    workerProcess.stderr.on('data', (data) => {
+      // Logs of the query engine
+      console.log(`[python worker] ${data.toString().trimEnd()}`);
+    });
+
+    workerProcess.on('close', (code) => {
+      // Fail the requests in flight, the next request starts a new worker
+      this.process = null;
+      this.buffer = '';
+      for (const request of this.pending.values()) {
+        clearTimeout(request.timer);
+        request.reject(new Error(`Python worker exited with code ${code}`));
+      }
+      this.pending.clear();
+    });
+
+    return workerProcess;
+  }
+
+  private handleMessage(line: string) {
+    let message;
+    try {
+      message = JSON.parse(line);
+    } catch {
+      console.error(`[python worker] Invalid message: ${line}`);
+      return;
+    }
+
+    const request = this.pending.get(message.id);
+    if (!request) {
+      return;
+    }
+    // Stage events of streamed requests come before their result
+    if (message.event) {
+      request.onEvent?.(message.event);
+      return;
+    }
+    this.pending.delete(message.id);
+    clearTimeout(request.timer);
+
+    if (message.error) {
+      request.reject(new Error(message.error));
+    } else {
+      request.resolve(message.result);
+    }
+  }
+
+  /**
+   * Sends a request to the worker. With `onEvent`, the request is streamed and every stage event
+   * is passed to it before the promise resolves with the result.
+   */
+  async request(input: Record<string, any>, onEvent?: (event: any) => void): Promise<any> {
+    if (!this.process) {
+      this.process = this.start();
+    }
+    const workerProcess = this.process;
+    const id = this.nextId++;
+
+    return new Promise((resolve, reject) => {
+      const timer = setTimeout(() => {
+        this.pending.delete(id);
+        reject(new Error(`Python worker timed out after ${this.timeoutMs} ms`));
+      }, this.timeoutMs);
+
+      this.pending.set(id, { resolve, reject, onEvent, timer });
+      workerProcess.stdin.write(JSON.stringify({ ...input, id, stream: Boolean(onEvent) }) + '\n');
+    });
+  }
+}
+
+// Kept on globalThis so hot reloads in development reuse the running worker
+const globalForWorker = globalThis as unknown as { pythonWorker?: PythonWorker };
+
+export function getPythonWorker(): PythonWorker {
+  if (!globalForWorker.pythonWorker) {
+    globalForWorker.pythonWorker = new PythonWorker();
+  }
+  return globalForWorker.pythonWorker;
+}
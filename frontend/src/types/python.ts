@@ -12,6 +12,13 @@ export interface ProcessingRequest {
 export interface QueryRequest {
   query: string;
   additional_context?: string;
+  // Respond with newline-delimited JSON stage events, the last one with the result
+  stream?: boolean;
+}
+
+export interface QueryEvent {
+  stage: 'generating' | 'plan' | 'validation' | 'cypher' | 'rows' | 'interpretation' | 'result' | 'error';
+  [key: string]: any;
 }
 
 export interface QueryResponse {
@@ -21,6 +28,15 @@ export interface QueryResponse {
     reasoning: string;
     interpretation: string;
     suggested_queries: string[];
+    truncation?: {
+      truncated: boolean;
+      reason: string | null;
+      records: number;
+      nodes: number;
+      relationships: number;
+      bytes: number;
+      limit_injected: boolean;
+    };
   };
   error?: string;
 } 
\ No newline at end of file
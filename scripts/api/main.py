@@ -1,7 +1,7 @@
 import sys
 import json
 import asyncio
-from services.query_processor import process_query
+from services.query_processor import process_query, stream_query
 
 
 async def main():
@@ -9,6 +9,19 @@ async def main():
         # Get input from Node.js
         input_data = json.loads(sys.argv[1])
 
+        if input_data.get("stream"):
+            # Return the stage events as newline-delimited JSON, the last one with the result.
+            # stdout only carries the events, everything printed by the query engine goes to stderr
+            stream = sys.stdout
+            sys.stdout = sys.stderr
+            try:
+                async for event in stream_query(input_data):
+                    stream.write(json.dumps(event, default=str) + "\n")
+                    stream.flush()
+            finally:
+                sys.stdout = stream
+            return
+
         # Process the query
         result = await process_query(input_data)
 
@@ -1,22 +1,54 @@
-import json
 from biz_opps.neo4j.helpers import get_neo4j_driver
 from biz_opps.query.interface.query_engine import QueryEngine
 import os
 
 
-async def process_query(input_data):
+def create_query_engine(neo4j_driver=None):
     """
-    Handles natural language queries using the QueryEngine
+    Creates a QueryEngine and, unless one is given, the Neo4j driver it uses. The driver keeps a
+    connection pool, so a long-running process should create them once and close the driver on exit.
+
+    Args:
+        neo4j_driver: Optional Neo4j driver (synchronous or async), a synchronous one is created if None
+
+    Returns:
+        tuple: (Neo4j driver, QueryEngine)
     """
-    try:
-        # Get Neo4j driver
+    # Get Neo4j driver
+    if neo4j_driver is None:
         neo4j_driver = get_neo4j_driver()
 
-        # Get openai api key from environment
-        openai_api_key = os.getenv("OPENAI_API_KEY")
+    # Get openai api key from environment
+    openai_api_key = os.getenv("OPENAI_API_KEY")
 
-        # Initialize query engine
-        query_engine = QueryEngine(neo4j_driver, openai_api_key, verbose=False)
+    # Optional query profiling into the slow-query log
+    profile_sample_rate = float(os.getenv("QUERY_PROFILE_SAMPLE_RATE", "0"))
+    slow_query_ms = os.getenv("SLOW_QUERY_MS")
+
+    # Initialize query engine
+    query_engine = QueryEngine(
+        neo4j_driver,
+        openai_api_key,
+        verbose=False,
+        profile_sample_rate=profile_sample_rate,
+        slow_query_ms=float(slow_query_ms) if slow_query_ms else None,
+    )
+
+    return neo4j_driver, query_engine
+
+
+async def process_query(input_data, query_engine=None):
+    """
+    Handles natural language queries using the QueryEngine
+
+    Args:
+        input_data: Dict with the "query" and optional "additional_context"
+        query_engine: Optional warm QueryEngine, a new one (and driver) is created and closed if None
+    """
+    neo4j_driver = None
+    try:
+        if query_engine is None:
+            neo4j_driver, query_engine = create_query_engine()
 
         # Process the query
         results = await query_engine.process_query(
@@ -24,10 +56,43 @@ async def process_query(input_data):
             additional_context=input_data.get("additional_context", ""),
         )
 
-        # Close the driver
-        neo4j_driver.close()
-
         return results
 
     except Exception as e:
         raise Exception(f"Query processing error: {str(e)}")
+
+    finally:
+        # Close the driver if it was created for this query
+        if neo4j_driver is not None:
+            neo4j_driver.close()
+
+
+async def stream_query(input_data, query_engine=None):
+    """
+    Handles natural language queries using the QueryEngine, yielding its stage events
+
+    Args:
+        input_data: Dict with the "query" and optional "additional_context"
+        query_engine: Optional warm QueryEngine, a new one (and driver) is created and closed if None
+
+    Yields:
+        dict: Stage events of QueryEngine.process_query_stream, the last one with the "result"
+    """
+    neo4j_driver = None
+    try:
+        if query_engine is None:
+            neo4j_driver, query_engine = create_query_engine()
+
+        async for event in query_engine.process_query_stream(
+            query=input_data["query"],
+            additional_context=input_data.get("additional_context", ""),
+        ):
+            yield event
+
+    except Exception as e:
+        raise Exception(f"Query processing error: {str(e)}")
+
+    finally:
+        # Close the driver if it was created for this query
+        if neo4j_driver is not None:
+            neo4j_driver.close()
@@ -0,0 +1,85 @@
+import sys
+import json
+import os
+import asyncio
+from biz_opps.neo4j.helpers import get_neo4j_async_driver
+from services.query_processor import create_query_engine, process_query, stream_query
+
+# Maximum number of queries processed at the same time
+MAX_CONCURRENT_QUERIES = int(os.getenv("QUERY_WORKER_CONCURRENCY", "4"))
+
+
+def write_message(stream, message):
+    """Write one JSON message per line and flush it to Node.js."""
+    stream.write(json.dumps(message, default=str) + "\n")
+    stream.flush()
+
+
+async def handle_request(line, query_engine, semaphore, stream):
+    """Process one request line and write its response, tagged with the request id."""
+    request_id = None
+    try:
+        request = json.loads(line)
+        request_id = request.get("id")
+        async with semaphore:
+            if request.get("stream"):
+                # Forward the stage events as they happen, the result event ends the request
+                async for event in stream_query(request, query_engine=query_engine):
+                    if event["stage"] == "result":
+                        result = event["result"]
+                    else:
+                        write_message(stream, {"id": request_id, "event": event})
+            else:
+                result = await process_query(request, query_engine=query_engine)
+        write_message(stream, {"id": request_id, "result": result})
+
+    except Exception as e:
+        write_message(stream, {"id": request_id, "error": str(e)})
+
+
+async def main():
+    """
+    Long-running query worker for the frontend. Reads one JSON request per line on stdin
+    ({"id", "query", "additional_context", "stream"}) and writes one JSON response per line on
+    stdout ({"id", "result"} or {"id", "error"}). Streamed requests are first sent their stage
+    events ({"id", "event"}) as they happen. The interpreter, imports, Neo4j driver and
+    QueryEngine are set up once and reused by every request. Queries run on the async Neo4j
+    driver, so concurrent requests share the event loop and its connection pool.
+    """
+    # stdout carries the protocol, everything printed by the query engine goes to stderr
+    stream = sys.stdout
+    sys.stdout = sys.stderr
+
+    neo4j_driver = await get_neo4j_async_driver()
+    if neo4j_driver is None:
+        raise RuntimeError("Could not connect to Neo4j")
+    _, query_engine = create_query_engine(neo4j_driver)
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
+    loop = asyncio.get_running_loop()
+    tasks = set()
+    write_message(stream, {"ready": True})
+
+    try:
+        while True:
+            line = await loop.run_in_executor(None, sys.stdin.readline)
+            # stdin is closed when Node.js stops the worker
+            if not line:
+                break
+            if not line.strip():
+                continue
+
+            task = asyncio.create_task(
+                handle_request(line, query_engine, semaphore, stream)
+            )
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    finally:
+        await neo4j_driver.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,97 @@
+# This script measures the import time of the query API entry point with python -X importtime.
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+API_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "api")
+
+# Modules imported by scripts/api/main.py before it can process a query
+DEFAULT_MODULE = "services.query_processor"
+
+# Modules that should only be imported by queries that render a map
+HEAVY_MODULES = ["folium", "geopandas", "pandas", "shapely"]
+
+
+def measure_imports(module):
+    """
+    Imports a module in a fresh interpreter with -X importtime.
+
+    Args:
+        module: Name of the module to import
+
+    Returns:
+        dict: Cumulative import time in microseconds per imported module
+
+    Raises:
+        RuntimeError: If the import fails
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [API_DIR, env.get("PYTHONPATH")]))
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=API_DIR,
+        env=env,
+    )
+    if process.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{process.stderr}")
+
+    # Lines look like "import time:      self [us] | cumulative | imported package"
+    timings = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        name = fields[2].strip()
+        timings.setdefault(name, int(fields[1]))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure the cold-start import time of the query API."
+    )
+    parser.add_argument(
+        "--module",
+        type=str,
+        help="Module to import, relative to scripts/api",
+        default=DEFAULT_MODULE,
+    )
+    parser.add_argument(
+        "--runs", type=int, help="Number of fresh interpreters to run", default=5
+    )
+    parser.add_argument(
+        "--top", type=int, help="Number of slowest imports to list", default=15
+    )
+    args = parser.parse_args()
+
+    runs = [measure_imports(args.module) for _ in range(args.runs)]
+    totals = [run.get(args.module, 0) for run in runs]
+
+    print(f"Import of {args.module} over {args.runs} runs:")
+    print(f"  median: {statistics.median(totals) / 1000:.1f} ms")
+    print(f"  min:    {min(totals) / 1000:.1f} ms")
+    print(f"  max:    {max(totals) / 1000:.1f} ms")
+
+    # Only top-level packages are listed, their submodules are part of their cumulative time
+    last_run = runs[-1]
+    packages = {
+        name: cumulative for name, cumulative in last_run.items() if "." not in name
+    }
+    print("\nSlowest top-level imports (cumulative, last run):")
+    for name, cumulative in sorted(
+        packages.items(), key=lambda item: item[1], reverse=True
+    )[: args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    loaded = [name for name in HEAVY_MODULES if name in last_run]
+    print(f"\nMap-only modules imported: {', '.join(loaded) if loaded else 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+# This script compares the latency of the single-call and two-step Cypher generation on a local stub model.
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from types import SimpleNamespace
+
+from biz_opps.query.context.doc_loader import DocumentationLoader
+from biz_opps.query.context.schema_loader import SchemaLoader
+from biz_opps.query.llm.openai_client import CYPHER_FORMAT, OpenAIClient
+from biz_opps.utils.file import get_root_dir
+
+DEFAULT_QUERIES_PATH = os.path.join(get_root_dir(), "queries", "test.txt")
+
+# Latency model of the stub, roughly that of a small hosted chat model
+FIRST_TOKEN_SECONDS = 0.4
+SECONDS_PER_PROMPT_TOKEN = 0.00002
+SECONDS_PER_OUTPUT_TOKEN = 0.012
+
+# Output tokens of the stub responses
+ANALYSIS_TOKENS = 300
+CYPHER_TOKENS = 200
+
+STUB_CYPHER = "MATCH (bg:BlockGroup)-[:IS_WITHIN]->(z:Zipcode) RETURN bg, z LIMIT 10"
+
+
+def load_test_queries(path=DEFAULT_QUERIES_PATH):
+    """
+    Read the test queries, blocks of a question, an optional 'Additional context: "..."' line
+    and a PASS/FAIL line separated by blank lines.
+
+    Returns:
+        list: Dicts with the "query" and its "additional_context"
+    """
+    with open(path, encoding="utf-8") as file:
+        blocks = file.read().strip().split("\n\n")
+
+    queries = []
+    for block in blocks:
+        lines = [line.strip() for line in block.splitlines() if line.strip()]
+        if not lines:
+            continue
+        additional_context = ""
+        for line in lines[1:]:
+            if line.startswith("Additional context:"):
+                additional_context = line[len("Additional context:") :].strip(' "')
+        queries.append({"query": lines[0], "additional_context": additional_context})
+    return queries
+
+
+class StubCompletions:
+    """Chat completions answering in the expected formats after a simulated delay."""
+
+    def __init__(self, time_scale):
+        self.time_scale = time_scale
+
+    async def create(self, model, messages, temperature, response_format=None):
+        prompt_tokens = sum(len(message["content"]) for message in messages) // 4
+        is_cypher_call = any(
+            CYPHER_FORMAT in message["content"] for message in messages
+        )
+
+        if response_format:
+            output_tokens = ANALYSIS_TOKENS + CYPHER_TOKENS
+            content = json.dumps(
+                {
+                    "analysis": "analysis " * ANALYSIS_TOKENS,
+                    "cypher": STUB_CYPHER,
+                    "reasoning": "reasoning " * (CYPHER_TOKENS - 50),
+                }
+            )
+        elif is_cypher_call:
+            output_tokens = CYPHER_TOKENS
+            content = (
+                f"```cypher\n{STUB_CYPHER}\n```\n\n"
+                f"REASONING:\n{'reasoning ' * (CYPHER_TOKENS - 50)}"
+            )
+        else:
+            output_tokens = ANALYSIS_TOKENS
+            content = "analysis " * ANALYSIS_TOKENS
+
+        latency = (
+            FIRST_TOKEN_SECONDS
+            + prompt_tokens * SECONDS_PER_PROMPT_TOKEN
+            + output_tokens * SECONDS_PER_OUTPUT_TOKEN
+        )
+        await asyncio.sleep(latency * self.time_scale)
+
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def get_stub_client(time_scale):
+    """Create an OpenAI compatible client backed by the stub completions."""
+    return SimpleNamespace(
+        chat=SimpleNamespace(completions=StubCompletions(time_scale))
+    )
+
+
+async def measure_mode(two_step, queries, context, time_scale):
+    """
+    Generate the Cypher of every query in one mode.
+
+    Returns:
+        list: Simulated seconds per query
+    """
+    client = OpenAIClient(
+        api_key=None, two_step=two_step, client=get_stub_client(time_scale)
+    )
+    latencies = []
+    for query in queries:
+        query_context = dict(context)
+        if query["additional_context"]:
+            query_context["additional"] = query["additional_context"]
+
+        start = time.perf_counter()
+        await client.generate_cypher(query["query"], query_context)
+        latencies.append((time.perf_counter() - start) / time_scale)
+    return latencies
+
+
+def print_latencies(name, latencies):
+    """Print the latency distribution of a mode."""
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, round(0.95 * (len(ordered) - 1)))]
+    print(
+        f"{name:<12} mean {statistics.mean(latencies):6.2f}s  "
+        f"p50 {statistics.median(latencies):6.2f}s  p95 {p95:6.2f}s  "
+        f"total {sum(latencies):7.2f}s"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Compare single-call and two-step Cypher generation latency"
+    )
+    parser.add_argument(
+        "--queries",
+        type=str,
+        help="Path of the test queries",
+        default=DEFAULT_QUERIES_PATH,
+    )
+    parser.add_argument(
+        "--time_scale",
+        type=float,
+        help="Factor applied to the simulated delays, e.g. 0.1 to run 10x faster",
+        default=1.0,
+    )
+    args = parser.parse_args()
+
+    queries = load_test_queries(args.queries)
+    context = {
+        "schema": SchemaLoader().get_formatted_context(),
+        **DocumentationLoader().get_context_docs(),
+    }
+
+    print(f"Generating Cypher for {len(queries)} queries on the stub model...")
+    single_call = await measure_mode(False, queries, context, args.time_scale)
+    two_step = await measure_mode(True, queries, context, args.time_scale)
+
+    print_latencies("single-call", single_call)
+    print_latencies("two-step", two_step)
+    print(
+        f"Single-call saves {statistics.mean(two_step) - statistics.mean(single_call):.2f}s "
+        "per query on average"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,33 +1,163 @@
 # This is the main script that will be executed to populate the entire knowledge graph.
 import argparse
 import asyncio
+import os
+from functools import partial
 from dotenv import load_dotenv
 
 from biz_opps.neo4j.cleanup import cleanup_neo4j
+from biz_opps.etl import (
+    administrative_topology,
+    block_groups,
+    businesses,
+    geoenrichment,
+)
 from biz_opps.etl.administrative_topology import populate_administrative_topology
 from biz_opps.etl.block_groups import populate_block_groups
-from biz_opps.etl.businesses import populate_businesses
+from biz_opps.etl.bulk_import import attach_spatial_layers, export_bulk_import
+from biz_opps.etl.checkpoint import CheckpointJournal
+from biz_opps.etl.loader import CHECKPOINT_STAGE as STAGED_LOAD_STAGE
+from biz_opps.etl.loader import load_staged_run
+from biz_opps.etl.staging import get_run_dir, stage_components
+from biz_opps.etl.fingerprint import FingerprintManifest
+from biz_opps.etl.businesses import harvest_businesses, load_businesses
 from biz_opps.etl.geoenrichment import populate_geoenrichments
+from biz_opps.etl.scheduler import print_stage_report, run_stages
+from biz_opps.neo4j.graph_version import bump_graph_version
 from biz_opps.neo4j.helpers import get_neo4j_driver
 from biz_opps.neo4j.constraints import create_constraints, load_constraints
 
-etl_components = {
-    "block_groups": populate_block_groups,
-    "administrative_topology": populate_administrative_topology,
-    "businesses": populate_businesses,
-    "geoenrichments": populate_geoenrichments,
+# Modules owning the node labels and spatial layers of each component
+etl_modules = {
+    "block_groups": block_groups,
+    "administrative_topology": administrative_topology,
+    "businesses": businesses,
+    "geoenrichments": geoenrichment,
 }
 
+# Stages run by the scheduler. Each stage belongs to a component and declares the stages whose
+# graph writes it reads, e.g. the Places harvest only needs BlockGroup geometries while loading
+# businesses also needs Zipcodes from the administrative topology.
+etl_stages = {
+    "block_groups": {
+        "component": "block_groups",
+        "depends_on": [],
+    },
+    "administrative_topology": {
+        "component": "administrative_topology",
+        "depends_on": ["block_groups"],
+    },
+    "business_harvest": {
+        "component": "businesses",
+        "depends_on": ["block_groups"],
+    },
+    "businesses": {
+        "component": "businesses",
+        "depends_on": ["business_harvest", "administrative_topology"],
+    },
+    "geoenrichments": {
+        "component": "geoenrichments",
+        "depends_on": ["block_groups"],
+    },
+}
+
+# Component names, in the order of their first stage
+etl_components = list(
+    dict.fromkeys(stage["component"] for stage in etl_stages.values())
+)
+
+
+def build_stages(
+    components,
+    neo4j_driver,
+    constraints,
+    verbose=False,
+    journal=None,
+    manifest=None,
+    incremental=False,
+):
+    """
+    Builds the runnable stages for the selected components.
+
+    Args:
+        components (list): Names of the components to populate.
+        neo4j_driver: Neo4j driver
+        constraints: Constraints schema
+        verbose: Verbose output
+        journal: Optional CheckpointJournal shared by all stages
+        manifest: Optional FingerprintManifest shared by all stages
+        incremental: Only write source rows that changed since the last run
+
+    Returns:
+        tuple: (stages dict for run_stages, results dict filled in by run_stages)
+    """
+    results = {}
+    stage_runs = {
+        "block_groups": partial(
+            populate_block_groups,
+            neo4j_driver,
+            constraints,
+            verbose=verbose,
+            journal=journal,
+            manifest=manifest,
+            incremental=incremental,
+        ),
+        "administrative_topology": partial(
+            populate_administrative_topology,
+            neo4j_driver,
+            constraints,
+            verbose=verbose,
+            journal=journal,
+            manifest=manifest,
+            incremental=incremental,
+        ),
+        "business_harvest": partial(
+            harvest_businesses, neo4j_driver, verbose=verbose, journal=journal
+        ),
+        "businesses": lambda: load_businesses(
+            neo4j_driver,
+            constraints,
+            results["business_harvest"],
+            verbose=verbose,
+            journal=journal,
+            manifest=manifest,
+            incremental=incremental,
+        ),
+        "geoenrichments": partial(
+            populate_geoenrichments,
+            neo4j_driver,
+            constraints,
+            verbose=verbose,
+            journal=journal,
+            manifest=manifest,
+            incremental=incremental,
+        ),
+    }
+
+    stages = {
+        name: {"run": stage_runs[name], "depends_on": stage["depends_on"]}
+        for name, stage in etl_stages.items()
+        if stage["component"] in components
+    }
+    return stages, results
+
 
 async def populate():
     """
     Main function to populate the Neo4j knowledge graph.
-    By default, all components are populated.
+    By default, all components are populated. Component stages run as soon as the stages they
+    depend on have completed, so independent stages run concurrently.
     Otherwise, components can be included or excluded using the --include OR --exclude flags.
     Args:
         --include: Comma-separated list of components to include (e.g., "block_groups,administrative_topology")
         --exclude: Comma-separated list of components to exclude (e.g., "businesses,geoenrichments")
         --cleanup: Cleanup Neo4j before populating (default: False)
+        --resume: Skip work completed by a previous, interrupted run (default: False)
+        --incremental: Only write source rows that changed since the last run (default: False)
+        --export: Write neo4j-admin import files to this directory instead of writing to Neo4j
+        --attach_spatial_layers: Create constraints and spatial layers of a bulk imported graph (default: False)
+        --stage: Stage the transformed components as Parquet in data/staging/<run_id>/ instead of writing to Neo4j (default: False)
+        --load: Load a staged run ("latest" or a run id) into Neo4j instead of running the ETL
         --verbose: Verbose output (default: False)
     """
     # Set up argument parser
@@ -47,6 +177,42 @@ async def populate():
     parser.add_argument(
         "--cleanup", type=bool, help="Cleanup Neo4j before populating", default=False
     )
+    parser.add_argument(
+        "--resume",
+        type=bool,
+        help="Skip work completed by a previous, interrupted run",
+        default=False,
+    )
+    parser.add_argument(
+        "--incremental",
+        type=bool,
+        help="Only write source rows that changed since the last run",
+        default=False,
+    )
+    parser.add_argument(
+        "--export",
+        type=str,
+        help="Write neo4j-admin import files to this directory instead of writing to Neo4j",
+        default=None,
+    )
+    parser.add_argument(
+        "--attach_spatial_layers",
+        type=bool,
+        help="Create constraints and spatial layers of a bulk imported graph",
+        default=False,
+    )
+    parser.add_argument(
+        "--stage",
+        type=bool,
+        help="Stage the transformed components as Parquet instead of writing to Neo4j",
+        default=False,
+    )
+    parser.add_argument(
+        "--load",
+        type=str,
+        help='Load a staged run ("latest" or a run id) into Neo4j',
+        default=None,
+    )
     parser.add_argument("--verbose", type=bool, help="Verbose output", default=False)
 
     args = parser.parse_args()
@@ -55,6 +221,12 @@ async def populate():
     if args.include and args.exclude:
         raise ValueError("Only one of --include or --exclude can be provided")
 
+    # Cleaned up data cannot be resumed or diffed
+    if args.cleanup and args.resume:
+        raise ValueError("Only one of --cleanup or --resume can be provided")
+    if args.cleanup and args.incremental:
+        raise ValueError("Only one of --cleanup or --incremental can be provided")
+
     # Convert comma-separated strings to lists if provided
     include = args.include.split(",") if args.include else None
     exclude = args.exclude.split(",") if args.exclude else None
@@ -62,38 +234,103 @@ async def populate():
     # Load environment variables
     load_dotenv()
 
+    components = [
+        component
+        for component in etl_components
+        if (include is None or component in include)
+        and (exclude is None or component not in exclude)
+    ]
+
+    # Initial graph builds can skip the transactional load and use neo4j-admin import
+    if args.export:
+        print(f"Exporting components: {', '.join(components)}")
+        await export_bulk_import(
+            args.export, load_constraints(), components, verbose=args.verbose
+        )
+        return
+
+    # Extract and transform once, so loads can be retried and benchmarked on a fixed snapshot
+    if args.stage:
+        print(f"Staging components: {', '.join(components)}")
+        await stage_components(load_constraints(), components, verbose=args.verbose)
+        return
+
     # Get Neo4j driver
     neo4j_driver = get_neo4j_driver()
 
-    if neo4j_driver:
-        # Get constraints
-        constraints = load_constraints()
-
-        # Create constraints
-        with neo4j_driver.session() as session:
-            create_constraints(session, constraints)
-
-        # populate data
-        for component in etl_components:
-            if include is None or component in include:
-                if exclude is None or component not in exclude:
-                    print(f"Executing {component} ETL...")
-                    if component == "businesses":
-                        await etl_components[component](
-                            neo4j_driver,
-                            constraints,
-                            cleanup=args.cleanup,
-                            verbose=args.verbose,
-                        )
-                    else:
-                        etl_components[component](
-                            neo4j_driver,
-                            constraints,
-                            cleanup=args.cleanup,
-                            verbose=args.verbose,
-                        )
-    else:
-        raise Exception("Failed to establish connection to Neo4j")
+    try:
+        if neo4j_driver and args.attach_spatial_layers:
+            constraints = load_constraints()
+            with neo4j_driver.session() as session:
+                create_constraints(session, constraints)
+            attach_spatial_layers(neo4j_driver, constraints)
+        elif neo4j_driver and args.load:
+            constraints = load_constraints()
+            with neo4j_driver.session() as session:
+                create_constraints(session, constraints)
+
+            run_dir = get_run_dir(args.load)
+            journal = CheckpointJournal()
+            if not args.resume:
+                journal.reset([f"{STAGED_LOAD_STAGE}:{os.path.basename(run_dir)}"])
+            load_staged_run(
+                neo4j_driver,
+                constraints,
+                run_dir,
+                components=components,
+                journal=journal,
+                verbose=args.verbose,
+            )
+            journal.close()
+        elif neo4j_driver:
+            # Get constraints
+            constraints = load_constraints()
+
+            # Cleanup before creating constraints since cleanup drops them
+            if args.cleanup:
+                for component in components:
+                    cleanup_neo4j(
+                        neo4j_driver,
+                        constraints,
+                        nodes=etl_modules[component].CLEANUP_NODES,
+                        spatial_layers=etl_modules[component].CLEANUP_SPATIAL_LAYERS,
+                    )
+
+            # Create constraints
+            with neo4j_driver.session() as session:
+                create_constraints(session, constraints)
+
+            # Checkpoint completed work so an interrupted run can be resumed, and fingerprint
+            # written source rows so the next run can write only what changed
+            journal = CheckpointJournal()
+            manifest = FingerprintManifest()
+            stages, results = build_stages(
+                components,
+                neo4j_driver,
+                constraints,
+                verbose=args.verbose,
+                journal=journal,
+                manifest=manifest,
+                incremental=args.incremental,
+            )
+            if not args.resume:
+                journal.reset(list(stages.keys()))
+            if args.cleanup:
+                manifest.reset(list(stages.keys()))
+
+            # populate data, running independent stages concurrently
+            print(f"Executing ETL for components: {', '.join(components)}")
+            report = await run_stages(stages, results=results, verbose=args.verbose)
+            print_stage_report(stages, report)
+            journal.close()
+            manifest.close()
+        else:
+            raise Exception("Failed to establish connection to Neo4j")
+
+    finally:
+        # Query results cached for the previous graph are stale once anything was written
+        if neo4j_driver:
+            bump_graph_version(f"populate {', '.join(components)}")
 
     neo4j_driver.close()
 
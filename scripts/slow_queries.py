@@ -0,0 +1,94 @@
+# This script reports the slowest or most expensive queries of the slow-query log.
+import argparse
+import os
+
+from biz_opps.query.cypher.slow_query_log import (
+    DEFAULT_LOG_PATH,
+    RANKING_COLUMNS,
+    SlowQueryLog,
+    get_hot_operators,
+)
+
+
+def print_offender(rank, offender, show_plan):
+    """Print the stats of a logged query and, optionally, its most expensive operators."""
+    # Queries logged as slow without a profile have no db hits or rows
+    avg_db_hits = (
+        f"{offender['avg_db_hits']:.0f}" if offender["avg_db_hits"] is not None else "-"
+    )
+    max_rows = offender["max_rows"] if offender["max_rows"] is not None else "-"
+    print(
+        f"\n{rank}. {offender['count']} runs, avg {offender['avg_ms']:.0f} ms, "
+        f"max {offender['max_ms']:.0f} ms, avg {avg_db_hits} db hits, "
+        f"max {max_rows} rows, last seen {offender['last_seen']}"
+    )
+    print(f"   {offender['cypher']}")
+
+    if show_plan and offender["plan"]:
+        print("   Hottest operators:")
+        for operator in get_hot_operators(offender["plan"]):
+            print(
+                f"     - {operator['operator']}: {operator['db_hits']} db hits, "
+                f"{operator['rows']} rows"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Report the top offenders of the slow-query log"
+    )
+    parser.add_argument(
+        "--path",
+        type=str,
+        help="Path of the slow-query log",
+        default=DEFAULT_LOG_PATH,
+    )
+    parser.add_argument(
+        "--by",
+        type=str,
+        choices=list(RANKING_COLUMNS),
+        help="Rank queries by average wall time, average db hits, total time or runs",
+        default="wall_ms",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        help="Number of queries to report",
+        default=10,
+    )
+    parser.add_argument(
+        "--since_days",
+        type=float,
+        help="Only consider queries logged in the last days",
+        default=None,
+    )
+    parser.add_argument(
+        "--hide_plan",
+        action="store_true",
+        help="Hide the operators with the most db hits of each query",
+    )
+    args = parser.parse_args()
+
+    if not os.path.exists(args.path):
+        print(f"No slow-query log at {args.path}")
+        return
+
+    log = SlowQueryLog(args.path)
+    try:
+        offenders = log.top_offenders(
+            by=args.by, limit=args.limit, since_days=args.since_days
+        )
+    finally:
+        log.close()
+
+    if not offenders:
+        print("No queries logged")
+        return
+
+    print(f"Top {len(offenders)} queries by {args.by}:")
+    for rank, offender in enumerate(offenders, start=1):
+        print_offender(rank, offender, not args.hide_plan)
+
+
+if __name__ == "__main__":
+    main()
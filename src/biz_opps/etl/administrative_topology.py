@@ -3,21 +3,34 @@ import os
 import pandas as pd
 import geopandas as gpd
 from shapely import wkt
+from shapely.strtree import STRtree
 
 from biz_opps.neo4j.cleanup import cleanup_neo4j
 from biz_opps.utils.postgres import get_sqlalchemy_engine
 from biz_opps.neo4j.construction import (
     create_node,
     create_relationship,
+    delete_node,
 )
 from biz_opps.neo4j.constraints import load_constraints
 from biz_opps.neo4j.validation import validate_data
 from biz_opps.neo4j.spatial import (
     add_node_to_spatial_layer,
     init_wkt_layer,
+    remove_nodes_from_spatial_layer,
 )
+from biz_opps.etl.block_groups import CHECKPOINT_STAGE as BLOCK_GROUP_STAGE
+from biz_opps.etl.fingerprint import fingerprint, fingerprint_rows, print_changes
+from biz_opps.etl.tables import node_table, relationship_table
 from biz_opps.utils.file import get_root_dir
 
+# Node labels and spatial layers owned by this component
+CLEANUP_NODES = ["Zipcode", "City", "Neighborhood"]
+CLEANUP_SPATIAL_LAYERS = ["zipcode_layer"]
+
+# Stage name used for checkpoints
+CHECKPOINT_STAGE = "administrative_topology"
+
 
 def get_administrative_topology_data(sql_filter: str = ""):
     """
@@ -72,26 +85,18 @@ def get_administrative_topology_data(sql_filter: str = ""):
     return zipcode_gdf, city_df, neighborhood_df
 
 
-def create_zipcode_nodes(
-    session, constraints, zipcode_df, city_df, neighborhood_df, verbose=False
-):
+def get_zipcode_properties(zipcode_df, city_df, neighborhood_df):
     """
-    Creates Zipcode nodes with spatial geometries(if they exist in the DataFrame).
+    Builds the Zipcode node properties for every zipcode referenced by the administrative topology.
 
     Args:
-        session: Neo4j session
-        constraints: Constraints object
         zipcode_df: DataFrame containing the Zipcode data
         city_df: DataFrame containing the City data
         neighborhood_df: DataFrame containing the Neighborhood data
-        verbose (bool): Whether to print verbose output
-    """
-    # Initialize spatial layer
-    init_wkt_layer(session, "zipcode_layer", geometry_property_name="wkt")
-
-    success_count = 0
-    failed_instances = []
 
+    Returns:
+        list: Zipcode node properties
+    """
     # Combine city and neighborhood zipcodes
     combined_zipcodes = (
         set(city_df["zipcodes"].explode().astype(str).unique())
@@ -99,10 +104,8 @@ def create_zipcode_nodes(
         | set(zipcode_df["ZIP"].astype(str).unique())
     )
 
+    zipcode_properties = []
     for zipcode in combined_zipcodes:
-        if verbose:
-            print(f"Creating Zipcode: {zipcode}...")
-
         properties = {"zipcode_number": str(zipcode)}
 
         # Add WKT if available in zipcode_df
@@ -110,6 +113,49 @@ def create_zipcode_nodes(
         if not zipcode_row.empty and "the_geom" in zipcode_row.columns:
             properties["wkt"] = zipcode_row.iloc[0]["the_geom"]
 
+        zipcode_properties.append(properties)
+
+    return zipcode_properties
+
+
+def create_zipcode_nodes(
+    session,
+    constraints,
+    zipcode_df,
+    city_df,
+    neighborhood_df,
+    verbose=False,
+    zipcodes=None,
+):
+    """
+    Creates Zipcode nodes with spatial geometries(if they exist in the DataFrame).
+
+    Args:
+        session: Neo4j session
+        constraints: Constraints object
+        zipcode_df: DataFrame containing the Zipcode data
+        city_df: DataFrame containing the City data
+        neighborhood_df: DataFrame containing the Neighborhood data
+        verbose (bool): Whether to print verbose output
+        zipcodes (set): Optional zipcode numbers to create, all zipcodes are created if None
+
+    Returns:
+        list: zipcode_number of the Zipcodes created or updated
+    """
+    # Initialize spatial layer
+    init_wkt_layer(session, "zipcode_layer", geometry_property_name="wkt")
+
+    success_count = 0
+    failed_instances = []
+    written = []
+
+    for properties in get_zipcode_properties(zipcode_df, city_df, neighborhood_df):
+        if zipcodes is not None and properties["zipcode_number"] not in zipcodes:
+            continue
+
+        if verbose:
+            print(f"Creating Zipcode: {properties['zipcode_number']}...")
+
         node_data = {"label": "Zipcode", "properties": properties}
 
         try:
@@ -132,6 +178,7 @@ def create_zipcode_nodes(
                 ):
                     raise Exception("Failed to add Zipcode node to spatial layer")
 
+            written.append(properties["zipcode_number"])
             success_count += 1
 
         except Exception as e:
@@ -147,6 +194,43 @@ def create_zipcode_nodes(
         for failure in failed_instances:
             print(failure)
 
+    return written
+
+
+def get_city_properties(row):
+    """
+    Builds the City node properties from a row of the City data.
+
+    Args:
+        row: Row of the City DataFrame returned by get_administrative_topology_data
+
+    Returns:
+        dict: City node properties
+    """
+    return {
+        "city_id": str(row["id"]),
+        "city_name": str(row["city"]),
+        "state_name": str(row["state_name"]),
+        "county": str(row["county"]),
+        "is_unincorporated": bool(row["is_unincorporated_place"]),
+    }
+
+
+def get_neighborhood_properties(row):
+    """
+    Builds the Neighborhood node properties from a row of the Neighborhood data.
+
+    Args:
+        row: Row of the Neighborhood DataFrame returned by get_administrative_topology_data
+
+    Returns:
+        dict: Neighborhood node properties
+    """
+    return {
+        "neighborhood_id": str(row["id"]),
+        "neighborhood_name": row["community"],
+    }
+
 
 def create_city_nodes(session, constraints, df, verbose=False):
     """
@@ -157,21 +241,19 @@ def create_city_nodes(session, constraints, df, verbose=False):
         constraints: Constraints object
         df: DataFrame containing the City data
         verbose (bool): Whether to print verbose output
+
+    Returns:
+        list: city_id of the Cities created or updated
     """
     success_count = 0
     failed_instances = []
+    written = []
 
     for _, row in df.iterrows():
         if verbose:
             print(f"Creating City: {row['city']}...")
 
-        properties = {
-            "city_id": str(row["id"]),
-            "city_name": str(row["city"]),
-            "state_name": str(row["state_name"]),
-            "county": str(row["county"]),
-            "is_unincorporated": bool(row["is_unincorporated_place"]),
-        }
+        properties = get_city_properties(row)
 
         node_data = {"label": "City", "properties": properties}
 
@@ -182,6 +264,7 @@ def create_city_nodes(session, constraints, df, verbose=False):
                 session, "City", properties, match_keys=["city_id"], verbose=verbose
             ):
                 raise Exception("Failed to create City node")
+            written.append(properties["city_id"])
             success_count += 1
         except Exception as e:
             failed_instances.append(
@@ -196,6 +279,8 @@ def create_city_nodes(session, constraints, df, verbose=False):
         for failure in failed_instances:
             print(failure)
 
+    return written
+
 
 def create_neighborhood_nodes(session, constraints, df, verbose=False):
     """
@@ -206,18 +291,19 @@ def create_neighborhood_nodes(session, constraints, df, verbose=False):
         constraints: Constraints object
         df: DataFrame containing the Neighborhood data
         verbose (bool): Whether to print verbose output
+
+    Returns:
+        list: neighborhood_id of the Neighborhoods created or updated
     """
     success_count = 0
     failed_instances = []
+    written = []
 
     for _, row in df.iterrows():
         if verbose:
             print(f"Creating Neighborhood: {row['community']}...")
 
-        properties = {
-            "neighborhood_id": str(row["id"]),
-            "neighborhood_name": row["community"],
-        }
+        properties = get_neighborhood_properties(row)
 
         node_data = {"label": "Neighborhood", "properties": properties}
 
@@ -231,6 +317,7 @@ def create_neighborhood_nodes(session, constraints, df, verbose=False):
                 verbose=verbose,
             ):
                 raise Exception("Failed to create Neighborhood node")
+            written.append(properties["neighborhood_id"])
             success_count += 1
         except Exception as e:
             failed_instances.append(
@@ -248,346 +335,218 @@ def create_neighborhood_nodes(session, constraints, df, verbose=False):
         for failure in failed_instances:
             print(failure)
 
+    return written
+
+
+# (column, rel_type, end_label, end_key, rel_properties) of the name-based relationships of each row
+CITY_RELATIONSHIP_COLUMNS = [
+    ("neighborhoods", "HAS_NEIGHBORHOOD", "Neighborhood", "neighborhood_name", None),
+    (
+        "neighboring_cities",
+        "HAS_NEIGHBOR",
+        "City",
+        "city_name",
+        {"neighbor_type": "City"},
+    ),
+    (
+        "neighboring_unincorporated_places",
+        "HAS_NEIGHBOR",
+        "City",
+        "city_name",
+        {"neighbor_type": "City"},
+    ),
+    ("nearby_cities", "HAS_NEARBY", "City", "city_name", {"nearby_type": "City"}),
+    (
+        "nearby_unincorporated_places",
+        "HAS_NEARBY",
+        "City",
+        "city_name",
+        {"nearby_type": "City"},
+    ),
+]
+NEIGHBORHOOD_RELATIONSHIP_COLUMNS = [
+    (
+        "neighboring_communities",
+        "HAS_NEIGHBOR",
+        "Neighborhood",
+        "neighborhood_name",
+        {"neighbor_type": "Neighborhood"},
+    ),
+    (
+        "neighboring_cities",
+        "HAS_NEIGHBOR",
+        "City",
+        "city_name",
+        {"neighbor_type": "City"},
+    ),
+    (
+        "nearby_communities",
+        "HAS_NEARBY",
+        "Neighborhood",
+        "neighborhood_name",
+        {"nearby_type": "Neighborhood"},
+    ),
+    ("nearby_cities", "HAS_NEARBY", "City", "city_name", {"nearby_type": "City"}),
+]
+
+
+def get_row_relationships(row, relationship_columns):
+    """
+    Builds the relationships of a City or Neighborhood row: IS_WITHIN its zipcodes, then the
+    name-based relationships listed in relationship_columns.
 
-def create_city_relationships(session, df, verbose=False):
+    Args:
+        row: Row of the City or Neighborhood DataFrame
+        relationship_columns: CITY_RELATIONSHIP_COLUMNS or NEIGHBORHOOD_RELATIONSHIP_COLUMNS
+
+    Returns:
+        list: Dicts with "rel_type", "end_label", "end_props" and "properties"
     """
-    Creates relationships for City nodes including incorporated and unincorporated places.
+    relationships = []
+
+    zipcodes = row["zipcodes"]
+    if isinstance(zipcodes, list) and zipcodes:
+        for zipcode in zipcodes:
+            relationships.append(
+                {
+                    "rel_type": "IS_WITHIN",
+                    "end_label": "Zipcode",
+                    "end_props": {"zipcode_number": str(zipcode)},
+                    "properties": {
+                        "containment_type": "Full" if len(zipcodes) == 1 else "Partial"
+                    },
+                }
+            )
+
+    for column, rel_type, end_label, end_key, properties in relationship_columns:
+        names = row[column]
+        if isinstance(names, list) and names:
+            for name in names:
+                relationships.append(
+                    {
+                        "rel_type": rel_type,
+                        "end_label": end_label,
+                        "end_props": {end_key: str(name)},
+                        "properties": properties,
+                    }
+                )
+
+    return relationships
+
+
+def create_row_relationships(
+    session, df, label, id_key, name_column, relationship_columns, verbose=False
+):
+    """
+    Creates the relationships of each City or Neighborhood row.
+
+    Args:
+        session: Neo4j session
+        df: DataFrame containing the City or Neighborhood data
+        label: "City" or "Neighborhood"
+        id_key: Node property matched to the row id
+        name_column: Column with the name of the row, used in output
+        relationship_columns: CITY_RELATIONSHIP_COLUMNS or NEIGHBORHOOD_RELATIONSHIP_COLUMNS
+        verbose (bool): Whether to print verbose output
+
+    Returns:
+        list: Ids of the rows whose relationships were all created
     """
     success_count = 0
     failed_instances = []
+    written = []
 
     for _, row in df.iterrows():
         if verbose:
-            print(f"Creating relationships for City: {row['city']}...")
-
-        # Create CITY->IS_WITHIN->ZIPCODE relationships
-        if isinstance(row["zipcodes"], list) and row["zipcodes"]:
-            for zipcode in row["zipcodes"]:
-                try:
-                    create_relationship(
-                        session,
-                        start_label="City",
-                        start_props={"city_id": str(row["id"])},
-                        start_match_keys=["city_id"],
-                        end_label="Zipcode",
-                        end_props={"zipcode_number": str(zipcode)},
-                        end_match_keys=["zipcode_number"],
-                        rel_type="IS_WITHIN",
-                        rel_properties={
-                            "containment_type": (
-                                "Full" if len(row["zipcodes"]) == 1 else "Partial"
-                            )
-                        },
-                        verbose=verbose,
-                    )
-                    success_count += 1
-                except Exception as e:
-                    failed_instances.append(
-                        {"city": row["city"], "zipcode": zipcode, "error": str(e)}
-                    )
-
-        # Create CITY->HAS_NEIGHBORHOOD->NEIGHBORHOOD relationships
-        neighborhoods = row["neighborhoods"]
-        if isinstance(neighborhoods, list) and neighborhoods:
-            for neighborhood_name in neighborhoods:
-                try:
-                    create_relationship(
-                        session,
-                        start_label="City",
-                        start_props={"city_id": str(row["id"])},
-                        start_match_keys=["city_id"],
-                        end_label="Neighborhood",
-                        end_props={"neighborhood_name": str(neighborhood_name)},
-                        end_match_keys=["neighborhood_name"],
-                        rel_type="HAS_NEIGHBORHOOD",
-                        verbose=verbose,
-                    )
-                    success_count += 1
-                except Exception as e:
-                    failed_instances.append(
-                        {
-                            "city": row["city"],
-                            "neighborhood": neighborhood_name,
-                            "error": str(e),
-                        }
-                    )
-
-        # Create CITY->HAS_NEIGHBOR->CITY relationships for incorporated cities
-        neighboring_cities = row["neighboring_cities"]
-        if isinstance(neighboring_cities, list) and neighboring_cities:
-            for neighboring_city in neighboring_cities:
-                try:
-                    create_relationship(
-                        session,
-                        start_label="City",
-                        start_props={"city_id": str(row["id"])},
-                        start_match_keys=["city_id"],
-                        end_label="City",
-                        end_props={"city_name": str(neighboring_city)},
-                        end_match_keys=["city_name"],
-                        rel_type="HAS_NEIGHBOR",
-                        rel_properties={"neighbor_type": "City"},
-                        verbose=verbose,
-                    )
-                    success_count += 1
-                except Exception as e:
-                    failed_instances.append(
-                        {
-                            "city": row["city"],
-                            "neighboring_city": neighboring_city,
-                            "error": str(e),
-                        }
-                    )
+            print(f"Creating relationships for {label}: {row[name_column]}...")
 
-        # Create CITY->HAS_NEIGHBOR->CITY relationships for unincorporated places
-        neighboring_unincorp = row["neighboring_unincorporated_places"]
-        if isinstance(neighboring_unincorp, list) and neighboring_unincorp:
-            for unincorp_place in neighboring_unincorp:
-                try:
-                    create_relationship(
-                        session,
-                        start_label="City",
-                        start_props={"city_id": str(row["id"])},
-                        start_match_keys=["city_id"],
-                        end_label="City",
-                        end_props={"city_name": str(unincorp_place)},
-                        end_match_keys=["city_name"],
-                        rel_type="HAS_NEIGHBOR",
-                        rel_properties={"neighbor_type": "City"},
-                        verbose=verbose,
-                    )
-                    success_count += 1
-                except Exception as e:
-                    failed_instances.append(
-                        {
-                            "city": row["city"],
-                            "neighboring_unincorporated": unincorp_place,
-                            "error": str(e),
-                        }
-                    )
+        failed_count = len(failed_instances)
 
-        # Create CITY->HAS_NEARBY->CITY relationships for incorporated cities
-        nearby_cities = row["nearby_cities"]
-        if isinstance(nearby_cities, list) and nearby_cities:
-            for nearby_city in nearby_cities:
-                try:
-                    create_relationship(
-                        session,
-                        start_label="City",
-                        start_props={"city_id": str(row["id"])},
-                        start_match_keys=["city_id"],
-                        end_label="City",
-                        end_props={"city_name": str(nearby_city)},
-                        end_match_keys=["city_name"],
-                        rel_type="HAS_NEARBY",
-                        rel_properties={"nearby_type": "City"},
-                        verbose=verbose,
-                    )
-                    success_count += 1
-                except Exception as e:
-                    failed_instances.append(
-                        {
-                            "city": row["city"],
-                            "nearby_city": nearby_city,
-                            "error": str(e),
-                        }
+        for relationship in get_row_relationships(row, relationship_columns):
+            try:
+                if not create_relationship(
+                    session,
+                    start_label=label,
+                    start_props={id_key: str(row["id"])},
+                    start_match_keys=[id_key],
+                    end_label=relationship["end_label"],
+                    end_props=relationship["end_props"],
+                    end_match_keys=list(relationship["end_props"].keys()),
+                    rel_type=relationship["rel_type"],
+                    rel_properties=relationship["properties"],
+                    verbose=verbose,
+                ):
+                    raise Exception(
+                        f"Failed to create {relationship['rel_type']} relationship"
                     )
+                success_count += 1
+            except Exception as e:
+                failed_instances.append(
+                    {
+                        label.lower(): row[name_column],
+                        "rel_type": relationship["rel_type"],
+                        "end": relationship["end_props"],
+                        "error": str(e),
+                    }
+                )
 
-        # Create CITY->HAS_NEARBY->CITY relationships for unincorporated places
-        nearby_unincorp = row["nearby_unincorporated_places"]
-        if isinstance(nearby_unincorp, list) and nearby_unincorp:
-            for unincorp_place in nearby_unincorp:
-                try:
-                    create_relationship(
-                        session,
-                        start_label="City",
-                        start_props={"city_id": str(row["id"])},
-                        start_match_keys=["city_id"],
-                        end_label="City",
-                        end_props={"city_name": str(unincorp_place)},
-                        end_match_keys=["city_name"],
-                        rel_type="HAS_NEARBY",
-                        rel_properties={"nearby_type": "City"},
-                        verbose=verbose,
-                    )
-                    success_count += 1
-                except Exception as e:
-                    failed_instances.append(
-                        {
-                            "city": row["city"],
-                            "nearby_unincorporated": unincorp_place,
-                            "error": str(e),
-                        }
-                    )
+        if len(failed_instances) == failed_count:
+            written.append(str(row["id"]))
 
-    print(f"City relationships created: {success_count}")
-    print(f"City relationships failed: {len(failed_instances)}")
+    print(f"{label} relationships created: {success_count}")
+    print(f"{label} relationships failed: {len(failed_instances)}")
 
     if failed_instances:
-        print("\nCity Relationship Failures:")
+        print(f"\n{label} Relationship Failures:")
         for failure in failed_instances:
             print(failure)
 
+    return written
 
-def create_neighborhood_relationships(session, df, verbose=False):
+
+def create_city_relationships(session, df, verbose=False):
     """
-    Creates relationships for Neighborhood nodes.
+    Creates relationships for City nodes including incorporated and unincorporated places.
+    Returns the city_id of the Cities whose relationships were all created.
     """
-    success_count = 0
-    failed_instances = []
-
-    for _, row in df.iterrows():
-        if verbose:
-            print(f"Creating relationships for Neighborhood: {row['community']}...")
-
-        # Create NEIGHBORHOOD->IS_WITHIN->ZIPCODE relationships
-        if isinstance(row["zipcodes"], list) and row["zipcodes"]:
-            for zipcode in row["zipcodes"]:
-                try:
-                    create_relationship(
-                        session,
-                        start_label="Neighborhood",
-                        start_props={"neighborhood_id": str(row["id"])},
-                        start_match_keys=["neighborhood_id"],
-                        end_label="Zipcode",
-                        end_props={"zipcode_number": str(zipcode)},
-                        end_match_keys=["zipcode_number"],
-                        rel_type="IS_WITHIN",
-                        rel_properties={
-                            "containment_type": (
-                                "Full" if len(row["zipcodes"]) == 1 else "Partial"
-                            )
-                        },
-                        verbose=verbose,
-                    )
-                    success_count += 1
-                except Exception as e:
-                    failed_instances.append(
-                        {
-                            "neighborhood": row["community"],
-                            "zipcode": zipcode,
-                            "error": str(e),
-                        }
-                    )
+    return create_row_relationships(
+        session, df, "City", "city_id", "city", CITY_RELATIONSHIP_COLUMNS, verbose
+    )
 
-        # Create NEIGHBORHOOD->HAS_NEIGHBOR->NEIGHBORHOOD relationships
-        neighboring_communities = row["neighboring_communities"]
-        if isinstance(neighboring_communities, list) and neighboring_communities:
-            for neighboring_community in neighboring_communities:
-                try:
-                    create_relationship(
-                        session,
-                        start_label="Neighborhood",
-                        start_props={"neighborhood_id": str(row["id"])},
-                        start_match_keys=["neighborhood_id"],
-                        end_label="Neighborhood",
-                        end_props={"neighborhood_name": str(neighboring_community)},
-                        end_match_keys=["neighborhood_name"],
-                        rel_type="HAS_NEIGHBOR",
-                        rel_properties={"neighbor_type": "Neighborhood"},
-                        verbose=verbose,
-                    )
-                    success_count += 1
-                except Exception as e:
-                    failed_instances.append(
-                        {
-                            "neighborhood": row["community"],
-                            "neighboring_community": neighboring_community,
-                            "error": str(e),
-                        }
-                    )
 
-        # Create NEIGHBORHOOD->HAS_NEIGHBOR->CITY relationships
-        neighboring_cities = row["neighboring_cities"]
-        if isinstance(neighboring_cities, list) and neighboring_cities:
-            for neighboring_city in neighboring_cities:
-                try:
-                    create_relationship(
-                        session,
-                        start_label="Neighborhood",
-                        start_props={"neighborhood_id": str(row["id"])},
-                        start_match_keys=["neighborhood_id"],
-                        end_label="City",
-                        end_props={"city_name": str(neighboring_city)},
-                        end_match_keys=["city_name"],
-                        rel_type="HAS_NEIGHBOR",
-                        rel_properties={"neighbor_type": "City"},
-                        verbose=verbose,
-                    )
-                    success_count += 1
-                except Exception as e:
-                    failed_instances.append(
-                        {
-                            "neighborhood": row["community"],
-                            "neighboring_city": neighboring_city,
-                            "error": str(e),
-                        }
-                    )
+def create_neighborhood_relationships(session, df, verbose=False):
+    """
+    Creates relationships for Neighborhood nodes.
+    Returns the neighborhood_id of the Neighborhoods whose relationships were all created.
+    """
+    return create_row_relationships(
+        session,
+        df,
+        "Neighborhood",
+        "neighborhood_id",
+        "community",
+        NEIGHBORHOOD_RELATIONSHIP_COLUMNS,
+        verbose,
+    )
 
-        # Create NEIGHBORHOOD->HAS_NEARBY->NEIGHBORHOOD relationships
-        nearby_communities = row["nearby_communities"]
-        if isinstance(nearby_communities, list) and nearby_communities:
-            for nearby_community in nearby_communities:
-                try:
-                    create_relationship(
-                        session,
-                        start_label="Neighborhood",
-                        start_props={"neighborhood_id": str(row["id"])},
-                        start_match_keys=["neighborhood_id"],
-                        end_label="Neighborhood",
-                        end_props={"neighborhood_name": str(nearby_community)},
-                        end_match_keys=["neighborhood_name"],
-                        rel_type="HAS_NEARBY",
-                        rel_properties={"nearby_type": "Neighborhood"},
-                        verbose=verbose,
-                    )
-                    success_count += 1
-                except Exception as e:
-                    failed_instances.append(
-                        {
-                            "neighborhood": row["community"],
-                            "nearby_community": nearby_community,
-                            "error": str(e),
-                        }
-                    )
 
-        # Create NEIGHBORHOOD->HAS_NEARBY->CITY relationships
-        nearby_cities = row["nearby_cities"]
-        if isinstance(nearby_cities, list) and nearby_cities:
-            for nearby_city in nearby_cities:
-                try:
-                    create_relationship(
-                        session,
-                        start_label="Neighborhood",
-                        start_props={"neighborhood_id": str(row["id"])},
-                        start_match_keys=["neighborhood_id"],
-                        end_label="City",
-                        end_props={"city_name": str(nearby_city)},
-                        end_match_keys=["city_name"],
-                        rel_type="HAS_NEARBY",
-                        rel_properties={"nearby_type": "City"},
-                        verbose=verbose,
-                    )
-                    success_count += 1
-                except Exception as e:
-                    failed_instances.append(
-                        {
-                            "neighborhood": row["community"],
-                            "nearby_city": nearby_city,
-                            "error": str(e),
-                        }
-                    )
+def get_containment_properties(overlap_ratio):
+    """
+    Builds the properties of a BlockGroup IS_WITHIN Zipcode relationship.
 
-    print(f"Neighborhood relationships created: {success_count}")
-    print(f"Failed relationships: {len(failed_instances)}")
+    Args:
+        overlap_ratio (float): Share of the BlockGroup area within the Zipcode
 
-    if failed_instances:
-        print("\nNeighborhood Relationship Failures:")
-        for failure in failed_instances:
-            print(failure)
+    Returns:
+        dict: Relationship properties
+    """
+    return {
+        "containment_type": "Full" if overlap_ratio > 0.95 else "Partial",
+        "overlap_ratio": float(overlap_ratio),
+    }
 
 
-def create_block_group_zipcode_intersection(session, verbose=False):
+def create_block_group_zipcode_intersection(session, verbose=False, block_groups=None):
     """
     Creates relationships between BlockGroups and Zipcodes based on spatial intersection.
     Uses Neo4j Spatial to find intersections and Shapely to calculate overlap ratios.
@@ -595,13 +554,32 @@ def create_block_group_zipcode_intersection(session, verbose=False):
     Args:
         session: Neo4j session
         verbose (bool): Whether to print verbose output
+        block_groups (list): Optional ct_block_group of the BlockGroups to (re)compute, replacing
+            their existing relationships. All BlockGroups are computed if None.
+
+    Returns:
+        list: ct_block_group of the BlockGroups with a relationship that failed, or False if the
+            intersection query failed
     """
     success_count = 0
     failed_instances = []
 
+    block_group_filter = ""
+    if block_groups is not None:
+        block_group_filter = "WHERE bg.ct_block_group IN $block_groups"
+        session.run(
+            """
+            MATCH (bg:BlockGroup)-[r:IS_WITHIN]->(:Zipcode)
+            WHERE bg.ct_block_group IN $block_groups
+            DELETE r
+            """,
+            {"block_groups": block_groups},
+        )
+
     # Query to find intersections using spatial layers
-    query = """
+    query = f"""
     MATCH (bg:BlockGroup)
+    {block_group_filter}
     CALL spatial.intersects('zipcode_layer', bg.wkt) YIELD node
     WITH bg, node
     WHERE 'Zipcode' IN labels(node)
@@ -614,7 +592,7 @@ def create_block_group_zipcode_intersection(session, verbose=False):
 
     try:
         print("Executing spatial intersection query...")
-        result = session.run(query)
+        result = session.run(query, {"block_groups": block_groups})
         print("Query executed, processing results...")
 
         # Process individual records
@@ -644,12 +622,7 @@ def create_block_group_zipcode_intersection(session, verbose=False):
                     end_props={"zipcode_number": record["zipcode"]},
                     end_match_keys=["zipcode_number"],
                     rel_type="IS_WITHIN",
-                    rel_properties={
-                        "containment_type": (
-                            "Full" if overlap_ratio > 0.95 else "Partial"
-                        ),
-                        "overlap_ratio": float(overlap_ratio),
-                    },
+                    rel_properties=get_containment_properties(overlap_ratio),
                     verbose=verbose,
                 )
                 print("Relationship created successfully")
@@ -677,7 +650,225 @@ def create_block_group_zipcode_intersection(session, verbose=False):
         for failure in failed_instances:
             print(failure)
 
-    return True
+    return sorted({str(failure["block_group"]) for failure in failed_instances})
+
+
+def delete_relationships_from(session, label, match_key, keys, rel_types):
+    """
+    Deletes the outgoing relationships of nodes, so relationships removed from the source are not kept.
+
+    Args:
+        session: Neo4j session
+        label: Label of the start nodes
+        match_key: Property identifying the start nodes
+        keys: Values of match_key of the start nodes
+        rel_types: Relationship types to delete
+    """
+    session.run(
+        f"""
+        MATCH (n:{label})-[r:{'|'.join(rel_types)}]->()
+        WHERE n.{match_key} IN $keys
+        DELETE r
+        """,
+        {"keys": list(keys)},
+    )
+
+
+def apply_administrative_topology_changes(
+    session, manifest, fingerprints, sql_filter=""
+):
+    """
+    Diffs the administrative topology against the manifest and deletes removed or outdated graph data.
+
+    Args:
+        session: Neo4j session
+        manifest (FingerprintManifest): Manifest of the previously written rows
+        fingerprints (dict): Current fingerprints keyed by "zipcodes", "cities" and "neighborhoods"
+        sql_filter (str): SQL filter applied to the source data, deletes are only detected without one
+
+    Returns:
+        dict: Changes per fingerprint kind, as returned by FingerprintManifest.diff
+    """
+    changes = {}
+    for kind, kind_fingerprints in fingerprints.items():
+        changes[kind] = manifest.diff(
+            f"{CHECKPOINT_STAGE}:{kind}", kind_fingerprints, deletes=not sql_filter
+        )
+        print_changes(kind.capitalize(), changes[kind])
+
+    # Updated zipcode geometries must be re-indexed in the spatial layer
+    for zipcode in changes["zipcodes"]["updates"] + changes["zipcodes"]["deletes"]:
+        remove_nodes_from_spatial_layer(
+            session,
+            "zipcode_layer",
+            "Zipcode",
+            {"zipcode_number": zipcode},
+            ["zipcode_number"],
+        )
+
+    deleted_nodes = [
+        ("zipcodes", "Zipcode", "zipcode_number"),
+        ("cities", "City", "city_id"),
+        ("neighborhoods", "Neighborhood", "neighborhood_id"),
+    ]
+    for kind, label, match_key in deleted_nodes:
+        for key in changes[kind]["deletes"]:
+            delete_node(session, label, {match_key: key}, match_keys=[match_key])
+        manifest.remove(f"{CHECKPOINT_STAGE}:{kind}", changes[kind]["deletes"])
+
+    # Relationships of updated rows are recreated from their current lists
+    delete_relationships_from(
+        session,
+        "City",
+        "city_id",
+        changes["cities"]["updates"],
+        ["IS_WITHIN", "HAS_NEIGHBORHOOD", "HAS_NEIGHBOR", "HAS_NEARBY"],
+    )
+    delete_relationships_from(
+        session,
+        "Neighborhood",
+        "neighborhood_id",
+        changes["neighborhoods"]["updates"],
+        ["IS_WITHIN", "HAS_NEIGHBOR", "HAS_NEARBY"],
+    )
+
+    return changes
+
+
+def get_block_group_zipcode_overlaps(block_group_properties, zipcode_properties):
+    """
+    Computes the BlockGroup IS_WITHIN Zipcode relationships with Shapely, without the spatial layers.
+
+    Args:
+        block_group_properties (list): BlockGroup node properties, with their WKT
+        zipcode_properties (list): Zipcode node properties, as returned by get_zipcode_properties
+
+    Returns:
+        list: Relationship rows for biz_opps.etl.tables.relationship_table
+    """
+    zipcodes = [
+        (properties["zipcode_number"], wkt.loads(properties["wkt"]))
+        for properties in zipcode_properties
+        if properties.get("wkt")
+    ]
+    tree = STRtree([geometry for _, geometry in zipcodes])
+
+    rows = []
+    for properties in block_group_properties:
+        bg_geom = wkt.loads(properties["wkt"])
+        for index in tree.query(bg_geom, predicate="intersects"):
+            zipcode, z_geom = zipcodes[index]
+            overlap_ratio = bg_geom.intersection(z_geom).area / bg_geom.area
+            rows.append(
+                {
+                    "start": {"ct_block_group": properties["ct_block_group"]},
+                    "end": {"zipcode_number": zipcode},
+                    "properties": get_containment_properties(overlap_ratio),
+                }
+            )
+
+    return rows
+
+
+def transform_administrative_topology(
+    zipcode_df, city_df, neighborhood_df, block_group_properties=None
+):
+    """
+    Transforms the administrative topology into node and relationship tables for bulk loading.
+    Name-based relationships are resolved to the ids of the matching nodes.
+
+    Args:
+        zipcode_df: DataFrame containing the Zipcode data
+        city_df: DataFrame containing the City data
+        neighborhood_df: DataFrame containing the Neighborhood data
+        block_group_properties (list): Optional BlockGroup node properties used to compute the
+            BlockGroup-Zipcode relationships
+
+    Returns:
+        dict: Node and relationship tables, see biz_opps.etl.tables
+    """
+    zipcode_properties = get_zipcode_properties(zipcode_df, city_df, neighborhood_df)
+    city_properties = [get_city_properties(row) for _, row in city_df.iterrows()]
+    neighborhood_properties = [
+        get_neighborhood_properties(row) for _, row in neighborhood_df.iterrows()
+    ]
+
+    # Names can be shared by several nodes, a name-based relationship ends at each of them
+    ids_by_name = {("City", "city_name"): {}, ("Neighborhood", "neighborhood_name"): {}}
+    id_keys = {"City": "city_id", "Neighborhood": "neighborhood_id"}
+    for label, name_key, properties_list in [
+        ("City", "city_name", city_properties),
+        ("Neighborhood", "neighborhood_name", neighborhood_properties),
+    ]:
+        for properties in properties_list:
+            ids_by_name[(label, name_key)].setdefault(
+                str(properties[name_key]), []
+            ).append(properties[id_keys[label]])
+
+    relationship_rows = {}
+    for label, df, relationship_columns in [
+        ("City", city_df, CITY_RELATIONSHIP_COLUMNS),
+        ("Neighborhood", neighborhood_df, NEIGHBORHOOD_RELATIONSHIP_COLUMNS),
+    ]:
+        for _, row in df.iterrows():
+            start = {id_keys[label]: str(row["id"])}
+            for relationship in get_row_relationships(row, relationship_columns):
+                end_label = relationship["end_label"]
+                ((end_key, end_value),) = relationship["end_props"].items()
+                if (end_label, end_key) in ids_by_name:
+                    end_ids = ids_by_name[(end_label, end_key)].get(end_value, [])
+                    ends = [{id_keys[end_label]: end_id} for end_id in end_ids]
+                else:
+                    ends = [relationship["end_props"]]
+
+                rows = relationship_rows.setdefault(
+                    (relationship["rel_type"], label, end_label), []
+                )
+                for end in ends:
+                    rows.append(
+                        {
+                            "start": start,
+                            "end": end,
+                            "properties": relationship["properties"],
+                        }
+                    )
+
+    if block_group_properties:
+        relationship_rows[("IS_WITHIN", "BlockGroup", "Zipcode")] = (
+            get_block_group_zipcode_overlaps(block_group_properties, zipcode_properties)
+        )
+
+    return {
+        "nodes": [
+            node_table("Zipcode", zipcode_properties),
+            node_table("City", city_properties),
+            node_table("Neighborhood", neighborhood_properties),
+        ],
+        "relationships": [
+            relationship_table(rel_type, start_label, end_label, rows)
+            for (rel_type, start_label, end_label), rows in relationship_rows.items()
+        ],
+    }
+
+
+def get_written_keys(results, step_keys, keys):
+    """
+    Gets the keys written by every one of the steps writing a kind of row.
+
+    Args:
+        results (dict): Keys written by each step that ran, keyed by step
+        step_keys (list): Steps writing the rows, steps that did not run were completed without
+            failures by a previous run
+        keys: Keys of the rows
+
+    Returns:
+        set: Keys of the rows written by all of the steps
+    """
+    written = set(keys)
+    for step_key in step_keys:
+        if step_key in results:
+            written &= set(results[step_key])
+    return written
 
 
 def populate_administrative_topology(
@@ -686,14 +877,30 @@ def populate_administrative_topology(
     cleanup=False,
     verbose=False,
     sql_filter: str = "",
+    journal=None,
+    manifest=None,
+    incremental=False,
 ):
+    """
+    Main function to populate the Zipcode, City and Neighborhood nodes and their relationships.
+
+    Args:
+        driver: Neo4j driver
+        constraints: Constraints object
+        cleanup: Cleanup existing administrative topology nodes and spatial layer
+        verbose: Print verbose output
+        sql_filter (str): An optional SQL filter to apply to the city and neighborhood queries.
+        journal (CheckpointJournal): Optional journal used to skip and record completed steps
+        manifest (FingerprintManifest): Optional manifest recording the fingerprints of written rows
+        incremental (bool): Only write rows whose fingerprint changed and delete removed rows (requires manifest)
+    """
     try:
         if cleanup:
             cleanup_neo4j(
                 driver,
                 constraints,
-                nodes=["Zipcode", "City", "Neighborhood"],
-                spatial_layers=["zipcode_layer"],
+                nodes=CLEANUP_NODES,
+                spatial_layers=CLEANUP_SPATIAL_LAYERS,
             )
 
         # Get data
@@ -701,34 +908,189 @@ def populate_administrative_topology(
             sql_filter
         )
 
-        # Create nodes and relationships
-        with driver.session() as session:
-            print("Creating Zipcode nodes...")
-            create_zipcode_nodes(
-                session,
-                constraints,
-                zipcode_df,
-                city_df,
-                neighborhood_df,
-                verbose=verbose,
-            )
+        zipcode_properties = get_zipcode_properties(
+            zipcode_df, city_df, neighborhood_df
+        )
 
-            print("\nCreating City nodes...")
-            create_city_nodes(session, constraints, city_df, verbose=verbose)
+        fingerprints = {}
+        if manifest:
+            fingerprints = {
+                "zipcodes": {
+                    properties["zipcode_number"]: fingerprint(properties)
+                    for properties in zipcode_properties
+                },
+                "cities": fingerprint_rows(city_df, "id"),
+                "neighborhoods": fingerprint_rows(neighborhood_df, "id"),
+            }
+
+        # Rows and BlockGroups to write, everything unless running incrementally
+        zipcodes = None
+        node_city_df, node_neighborhood_df = city_df, neighborhood_df
+        rel_city_df, rel_neighborhood_df = city_df, neighborhood_df
+        intersection_block_groups = None
+        block_group_fingerprints = manifest.get(BLOCK_GROUP_STAGE) if manifest else {}
 
-            print("\nCreating Neighborhood nodes...")
-            create_neighborhood_nodes(
-                session, constraints, neighborhood_df, verbose=verbose
-            )
+        # Create nodes and relationships
+        with driver.session() as session:
+            if incremental and manifest:
+                changes = apply_administrative_topology_changes(
+                    session, manifest, fingerprints, sql_filter
+                )
+                changed = {
+                    kind: set(kind_changes["inserts"]) | set(kind_changes["updates"])
+                    for kind, kind_changes in changes.items()
+                }
+                zipcodes = changed["zipcodes"]
+                node_city_df = city_df[
+                    city_df["id"].astype(str).isin(changed["cities"])
+                ]
+                node_neighborhood_df = neighborhood_df[
+                    neighborhood_df["id"].astype(str).isin(changed["neighborhoods"])
+                ]
+
+                # Relationships are matched by name, so added or removed nodes can affect any row
+                if not any(
+                    changes[kind]["inserts"] or changes[kind]["deletes"]
+                    for kind in ["cities", "neighborhoods"]
+                ):
+                    rel_city_df, rel_neighborhood_df = (
+                        node_city_df,
+                        node_neighborhood_df,
+                    )
 
-            print("\nCreating City relationships...")
-            create_city_relationships(session, city_df, verbose=verbose)
+                # Only recompute intersections of BlockGroups whose geometry changed since their
+                # intersections were computed, unless zipcode geometries changed
+                zipcodes_changed = bool(
+                    changes["zipcodes"]["updates"]
+                    or changes["zipcodes"]["inserts"]
+                    or changes["zipcodes"]["deletes"]
+                )
+                if not zipcodes_changed:
+                    block_group_changes = manifest.diff(
+                        f"{CHECKPOINT_STAGE}:block_group_zipcodes",
+                        block_group_fingerprints,
+                    )
+                    intersection_block_groups = (
+                        block_group_changes["inserts"] + block_group_changes["updates"]
+                    )
+                else:
+                    intersection_block_groups = (
+                        list(block_group_fingerprints.keys()) or None
+                    )
 
-            print("\nCreating Neighborhood relationships...")
-            create_neighborhood_relationships(session, neighborhood_df, verbose=verbose)
+            zipcode_targets = {
+                properties["zipcode_number"]
+                for properties in zipcode_properties
+                if zipcodes is None or properties["zipcode_number"] in zipcodes
+            }
+
+            def writes_all(df):
+                """Check that a step wrote every row of a DataFrame."""
+                return lambda written: set(df["id"].astype(str)) <= set(written)
+
+            # (step key, message, step, check of the step result for failed rows)
+            steps = [
+                (
+                    "zipcode_nodes",
+                    "Creating Zipcode nodes...",
+                    lambda: create_zipcode_nodes(
+                        session,
+                        constraints,
+                        zipcode_df,
+                        city_df,
+                        neighborhood_df,
+                        verbose=verbose,
+                        zipcodes=zipcodes,
+                    ),
+                    lambda written: zipcode_targets <= set(written),
+                ),
+                (
+                    "city_nodes",
+                    "\nCreating City nodes...",
+                    lambda: create_city_nodes(
+                        session, constraints, node_city_df, verbose=verbose
+                    ),
+                    writes_all(node_city_df),
+                ),
+                (
+                    "neighborhood_nodes",
+                    "\nCreating Neighborhood nodes...",
+                    lambda: create_neighborhood_nodes(
+                        session, constraints, node_neighborhood_df, verbose=verbose
+                    ),
+                    writes_all(node_neighborhood_df),
+                ),
+                (
+                    "city_relationships",
+                    "\nCreating City relationships...",
+                    lambda: create_city_relationships(
+                        session, rel_city_df, verbose=verbose
+                    ),
+                    writes_all(rel_city_df),
+                ),
+                (
+                    "neighborhood_relationships",
+                    "\nCreating Neighborhood relationships...",
+                    lambda: create_neighborhood_relationships(
+                        session, rel_neighborhood_df, verbose=verbose
+                    ),
+                    writes_all(rel_neighborhood_df),
+                ),
+                (
+                    "block_group_zipcode_relationships",
+                    "\nCreating BlockGroup-Zipcode relationships...",
+                    lambda: create_block_group_zipcode_intersection(
+                        session, verbose=verbose, block_groups=intersection_block_groups
+                    ),
+                    lambda failed_block_groups: failed_block_groups == [],
+                ),
+            ]
+
+            # Keys written by each step that ran, steps skipped as completed are not listed
+            results = {}
+            for step_key, message, step, is_complete in steps:
+                if journal and journal.is_done(CHECKPOINT_STAGE, step_key):
+                    print(f"Skipping {step_key} (already completed)")
+                    continue
+
+                print(message)
+                # Steps report their own failures, a False result means the step did not run.
+                # Only steps without failed rows are journaled, so --resume retries the others.
+                results[step_key] = step()
+                if (
+                    journal
+                    and results[step_key] is not False
+                    and is_complete(results[step_key])
+                ):
+                    journal.mark_done(CHECKPOINT_STAGE, step_key)
+
+        if manifest:
+            # Only rows whose nodes and relationships were all written are recorded, so rows
+            # that failed are retried by the next incremental run
+            kind_steps = {
+                "zipcodes": ["zipcode_nodes"],
+                "cities": ["city_nodes", "city_relationships"],
+                "neighborhoods": ["neighborhood_nodes", "neighborhood_relationships"],
+            }
+            for kind, kind_fingerprints in fingerprints.items():
+                written = get_written_keys(results, kind_steps[kind], kind_fingerprints)
+                manifest.update(
+                    f"{CHECKPOINT_STAGE}:{kind}",
+                    {key: kind_fingerprints[key] for key in written},
+                )
 
-            print("\nCreating BlockGroup-Zipcode relationships...")
-            create_block_group_zipcode_intersection(session, verbose=verbose)
+            failed_block_groups = results.get("block_group_zipcode_relationships", [])
+            if failed_block_groups is not False:
+                manifest.update(
+                    f"{CHECKPOINT_STAGE}:block_group_zipcodes",
+                    {
+                        key: value
+                        for key, value in block_group_fingerprints.items()
+                        if str(key) not in failed_block_groups
+                    },
+                )
 
     except Exception as error:
         print(f"Error executing Administrative Topology: {error}")
+        # The scheduler skips the stages depending on a failed stage
+        raise
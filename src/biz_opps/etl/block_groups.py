@@ -3,12 +3,22 @@ import geopandas as gpd
 
 from biz_opps.neo4j.cleanup import cleanup_neo4j
 from biz_opps.utils.postgres import get_sqlalchemy_engine
-from biz_opps.neo4j.construction import create_node
+from biz_opps.neo4j.construction import create_node, delete_node
 from biz_opps.neo4j.validation import validate_data
 from biz_opps.neo4j.spatial import (
     init_wkt_layer,
     add_node_to_spatial_layer,
+    remove_nodes_from_spatial_layer,
 )
+from biz_opps.etl.fingerprint import fingerprint, print_changes
+from biz_opps.etl.tables import node_table
+
+# Node labels and spatial layers owned by this component
+CLEANUP_NODES = ["BlockGroup"]
+CLEANUP_SPATIAL_LAYERS = ["block_group_layer"]
+
+# Stage name used for checkpoints
+CHECKPOINT_STAGE = "block_groups"
 
 
 def get_block_group_data(sql_filter: str = ""):
@@ -35,7 +45,56 @@ def get_block_group_data(sql_filter: str = ""):
         sql_engine.dispose()
 
 
-def create_block_group_nodes(session, constraints, gdf, verbose=False):
+def get_block_group_properties(row):
+    """
+    Builds the BlockGroup node properties from a row of the BlockGroup data.
+
+    Args:
+        row: Row of the GeoDataFrame returned by get_block_group_data
+
+    Returns:
+        dict: BlockGroup node properties
+    """
+    return {
+        "ct_block_group": str(row.ctblockgroup),
+        "census_tract": str(row.tract),
+        "block_group": str(row.blockgroup),
+        "object_id": str(row.objectid),
+        "wkt": row.wkb_geometry.wkt,
+    }
+
+
+def get_block_group_fingerprints(gdf):
+    """
+    Fingerprints each BlockGroup row, including its geometry WKT.
+
+    Args:
+        gdf: GeoDataFrame containing BlockGroup data
+
+    Returns:
+        dict: Mapping of ct_block_group to fingerprint
+    """
+    return {
+        str(row.ctblockgroup): fingerprint(get_block_group_properties(row))
+        for _, row in gdf.iterrows()
+    }
+
+
+def transform_block_groups(gdf):
+    """
+    Transforms the BlockGroup data into node and relationship tables for bulk loading.
+
+    Args:
+        gdf: GeoDataFrame containing BlockGroup data
+
+    Returns:
+        dict: Node and relationship tables, see biz_opps.etl.tables
+    """
+    properties = [get_block_group_properties(row) for _, row in gdf.iterrows()]
+    return {"nodes": [node_table("BlockGroup", properties)], "relationships": []}
+
+
+def create_block_group_nodes(session, constraints, gdf, verbose=False, journal=None):
     """
     Create BlockGroup nodes with spatial geometries.
 
@@ -44,25 +103,31 @@ def create_block_group_nodes(session, constraints, gdf, verbose=False):
         constraints: Constraints schema
         gdf: GeoDataFrame containing BlockGroup data
         verbose (bool): Whether to print verbose output
+        journal (CheckpointJournal): Optional journal used to skip and record completed BlockGroups
+
+    Returns:
+        list: ct_block_group of the BlockGroups written, including those completed by a previous run
     """
     # Initialize spatial layer
     init_wkt_layer(session, "block_group_layer", geometry_property_name="wkt")
 
     success_count = 0
+    skipped_count = 0
     failed_instances = []
+    written = []
+    completed = journal.completed(CHECKPOINT_STAGE) if journal else set()
 
     for _, row in gdf.iterrows():
+        if str(row.ctblockgroup) in completed:
+            skipped_count += 1
+            written.append(str(row.ctblockgroup))
+            continue
+
         if verbose:
             print(f"Creating BlockGroup: {row.ctblockgroup}...")
 
         try:
-            properties = {
-                "ct_block_group": str(row.ctblockgroup),
-                "census_tract": str(row.tract),
-                "block_group": str(row.blockgroup),
-                "object_id": str(row.objectid),
-                "wkt": row.wkb_geometry.wkt,
-            }
+            properties = get_block_group_properties(row)
 
             node_data = {"label": "BlockGroup", "properties": properties}
 
@@ -87,6 +152,10 @@ def create_block_group_nodes(session, constraints, gdf, verbose=False):
             ):
                 raise Exception("Failed to add geometry to BlockGroup node")
 
+            if journal:
+                journal.mark_done(CHECKPOINT_STAGE, properties["ct_block_group"])
+
+            written.append(properties["ct_block_group"])
             success_count += 1
 
         except Exception as e:
@@ -101,6 +170,8 @@ def create_block_group_nodes(session, constraints, gdf, verbose=False):
     # Summary of results
     print(f"BlockGroup Nodes Created or Updated: {success_count}")
     print(f"BlockGroup Nodes Failed: {len(failed_instances)}")
+    if skipped_count:
+        print(f"BlockGroup Nodes Skipped (already completed): {skipped_count}")
 
     # Optionally print details of failures
     if failed_instances:
@@ -108,6 +179,24 @@ def create_block_group_nodes(session, constraints, gdf, verbose=False):
         for failure in failed_instances:
             print(failure)
 
+    return written
+
+
+def delete_block_group_nodes(session, ct_block_groups):
+    """
+    Deletes BlockGroup nodes that no longer exist in the source data.
+
+    Args:
+        session: Neo4j session
+        ct_block_groups: List of ct_block_group of the BlockGroups to delete
+    """
+    for ct_block_group in ct_block_groups:
+        properties = {"ct_block_group": ct_block_group}
+        remove_nodes_from_spatial_layer(
+            session, "block_group_layer", "BlockGroup", properties, ["ct_block_group"]
+        )
+        delete_node(session, "BlockGroup", properties, match_keys=["ct_block_group"])
+
 
 def populate_block_groups(
     driver,
@@ -115,6 +204,9 @@ def populate_block_groups(
     cleanup=False,
     verbose=False,
     sql_filter: str = "",
+    journal=None,
+    manifest=None,
+    incremental=False,
 ):
     """
     Main function to populate the BlockGroup nodes in Neo4j.
@@ -126,19 +218,51 @@ def populate_block_groups(
         cleanup: Cleanup existing BlockGroup nodes and spatial layer
         verbose: Print verbose output
         sql_filter (str): An optional SQL filter to apply to the query.
+        journal (CheckpointJournal): Optional journal used to skip and record completed BlockGroups
+        manifest (FingerprintManifest): Optional manifest recording the fingerprints of written rows
+        incremental (bool): Only write rows whose fingerprint changed and delete removed rows (requires manifest)
     """
     if cleanup:
         cleanup_neo4j(
             driver,
             constraints,
-            nodes=["BlockGroup"],
-            spatial_layers=["block_group_layer"],
+            nodes=CLEANUP_NODES,
+            spatial_layers=CLEANUP_SPATIAL_LAYERS,
         )
 
     print("Populating BlockGroups...")
     # Fetch BlockGroup data from PostgreSQL
     df = get_block_group_data(sql_filter)
+    fingerprints = get_block_group_fingerprints(df) if manifest else {}
 
     # Populate Neo4j with BlockGroup nodes
     with driver.session() as session:
-        create_block_group_nodes(session, constraints, df, verbose=verbose)
+        if incremental and manifest:
+            # A filtered source does not tell us which BlockGroups were deleted
+            changes = manifest.diff(
+                CHECKPOINT_STAGE, fingerprints, deletes=not sql_filter
+            )
+            print_changes("BlockGroup", changes)
+
+            # Updated geometries must be re-indexed in the spatial layer
+            for ct_block_group in changes["updates"]:
+                remove_nodes_from_spatial_layer(
+                    session,
+                    "block_group_layer",
+                    "BlockGroup",
+                    {"ct_block_group": ct_block_group},
+                    ["ct_block_group"],
+                )
+
+            delete_block_group_nodes(session, changes["deletes"])
+            manifest.remove(CHECKPOINT_STAGE, changes["deletes"])
+
+            changed = set(changes["inserts"]) | set(changes["updates"])
+            df = df[df["ctblockgroup"].astype(str).isin(changed)]
+
+        written = create_block_group_nodes(
+            session, constraints, df, verbose=verbose, journal=journal
+        )
+
+    if manifest:
+        manifest.update(CHECKPOINT_STAGE, {key: fingerprints[key] for key in written})
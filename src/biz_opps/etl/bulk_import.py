@@ -0,0 +1,266 @@
+# This module contains functions to export the graph as neo4j-admin import files for initial graph builds.
+import os
+import shlex
+
+from biz_opps.etl.tables import (
+    empty_tables,
+    get_property_columns,
+    merge_tables,
+)
+from biz_opps.etl.transform import transform_components, validate_tables
+from biz_opps.neo4j.schema_registry import get_node_keys
+from biz_opps.neo4j.spatial import (
+    add_label_to_spatial_layer,
+    init_point_layer,
+    init_wkt_layer,
+)
+
+# neo4j-admin import column types of the schema property types
+IMPORT_TYPES = {
+    "STRING": "string",
+    "INTEGER": "long",
+    "FLOAT": "float",
+    "BOOLEAN": "boolean",
+}
+
+
+def get_import_type(prop_constraints):
+    """Get the neo4j-admin import column type of a schema property."""
+    return IMPORT_TYPES.get(prop_constraints.get("type", "STRING"), "string")
+
+
+def get_node_ids(df, keys):
+    """
+    Get the import ids of nodes: the value of their key, or the key values joined with "|" for
+    nodes identified by several properties.
+
+    Args:
+        df: DataFrame of node properties or relationship node keys
+        keys: Columns of the node keys, in order
+
+    Returns:
+        pd.Series: Import ids
+    """
+    return df[keys].astype(str).agg("|".join, axis=1)
+
+
+def _format_values(df):
+    """Format DataFrame values as neo4j-admin import expects them."""
+    df = df.copy()
+    for column in df.columns:
+        if df[column].dtype == bool:
+            df[column] = df[column].map({True: "true", False: "false"})
+    return df
+
+
+def write_node_files(output_dir, table, constraints):
+    """
+    Writes the header and data files of a node table.
+
+    Args:
+        output_dir: Directory of the import files
+        table: Node table, see biz_opps.etl.tables
+        constraints: Constraints schema
+
+    Returns:
+        tuple: (header path, data path)
+    """
+    label = table["label"]
+    properties = constraints["nodes"][label]["properties"]
+    keys = get_node_keys(constraints, label)
+    df = table["rows"].reindex(columns=list(properties.keys()))
+
+    if len(keys) == 1:
+        # The key is stored as a property and used as the import id
+        header = [f"{keys[0]}:ID({label})"]
+        columns = [keys[0]]
+        data = df[keys]
+    else:
+        # Composite keys get an unstored import id, the keys are stored as regular properties
+        header = [f":ID({label})"]
+        columns = []
+        data = get_node_ids(df, keys).to_frame(":ID")
+
+    for name, prop in properties.items():
+        if name in columns:
+            continue
+        header.append(f"{name}:{get_import_type(prop)}")
+        data = data.join(df[name])
+
+    return _write_files(output_dir, label, header, data)
+
+
+def write_relationship_files(output_dir, table, constraints):
+    """
+    Writes the header and data files of a relationship table.
+
+    Args:
+        output_dir: Directory of the import files
+        table: Relationship table, see biz_opps.etl.tables
+        constraints: Constraints schema
+
+    Returns:
+        tuple: (header path, data path)
+    """
+    rel_type = table["type"]
+    df = table["rows"]
+    properties = constraints["relationships"][rel_type]["properties"]
+
+    header = [
+        f":START_ID({table['start_label']})",
+        f":END_ID({table['end_label']})",
+    ]
+    # Key columns are ordered like the node keys so ids match the node files
+    start_keys = [
+        f"start.{key}" for key in get_node_keys(constraints, table["start_label"])
+    ]
+    end_keys = [f"end.{key}" for key in get_node_keys(constraints, table["end_label"])]
+    data = get_node_ids(df, start_keys).to_frame("start")
+    data["end"] = get_node_ids(df, end_keys)
+
+    for name in get_property_columns(df):
+        header.append(f"{name}:{get_import_type(properties.get(name, {}))}")
+        data[name] = df[name]
+
+    name = f"{table['start_label']}_{rel_type}_{table['end_label']}"
+    return _write_files(output_dir, name, header, data)
+
+
+def _write_files(output_dir, name, header, data):
+    """Write the header file and header-less data file of a table."""
+    header_path = os.path.join(output_dir, f"{name}_header.csv")
+    data_path = os.path.join(output_dir, f"{name}.csv")
+
+    with open(header_path, "w", encoding="utf-8") as file:
+        file.write(",".join(header) + "\n")
+    _format_values(data).to_csv(data_path, header=False, index=False)
+
+    return header_path, data_path
+
+
+def write_import_script(output_dir, node_files, relationship_files, database="neo4j"):
+    """
+    Writes a shell script running neo4j-admin import on the written files. Relationships to nodes
+    dropped by validation are skipped, listed in import.report and counted after the import.
+
+    Args:
+        output_dir: Directory of the import files
+        node_files: List of (label, header path, data path)
+        relationship_files: List of (relationship type, header path, data path)
+        database: Name of the database to import into
+
+    Returns:
+        str: Path of the script
+    """
+    lines = [
+        "#!/bin/sh",
+        "# Imports the graph into an empty, stopped database. Afterwards run",
+        "# scripts/populate.py --attach_spatial_layers=True to create constraints and spatial layers.",
+        'cd "$(dirname "$0")"',
+        "rm -f import.report",
+        "neo4j-admin database import full \\",
+        "  --id-type=string \\",
+        "  --skip-bad-relationships=true \\",
+        "  --report-file=import.report \\",
+    ]
+    for label, header_path, data_path in node_files:
+        files = f"{os.path.basename(header_path)},{os.path.basename(data_path)}"
+        lines.append(f"  --nodes={label}={shlex.quote(files)} \\")
+    for rel_type, header_path, data_path in relationship_files:
+        files = f"{os.path.basename(header_path)},{os.path.basename(data_path)}"
+        lines.append(f"  --relationships={rel_type}={shlex.quote(files)} \\")
+    lines.append(f'  "${{1:-{database}}}"')
+    lines.extend(
+        [
+            "status=$?",
+            "if [ -s import.report ]; then",
+            '  echo "Skipped relationships: $(wc -l < import.report), see $(pwd)/import.report"',
+            "fi",
+            "exit $status",
+        ]
+    )
+
+    script_path = os.path.join(output_dir, "import.sh")
+    with open(script_path, "w", encoding="utf-8") as file:
+        file.write("\n".join(lines) + "\n")
+    os.chmod(script_path, 0o755)
+
+    return script_path
+
+
+async def export_bulk_import(output_dir, constraints, components, verbose=False):
+    """
+    Runs the extract and transform of the selected components and writes neo4j-admin import files
+    instead of writing to Neo4j.
+
+    Args:
+        output_dir: Directory of the import files
+        constraints: Constraints schema
+        components: Names of the components to export
+        verbose: Print verbose output
+
+    Returns:
+        str: Path of the import script
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    tables = empty_tables()
+    transformed = await transform_components(constraints, components, verbose=verbose)
+    for component_tables in transformed.values():
+        merge_tables(tables, validate_tables(component_tables, constraints))
+
+    node_files = []
+    for table in tables["nodes"]:
+        if table["rows"].empty:
+            continue
+        node_files.append(
+            (table["label"], *write_node_files(output_dir, table, constraints))
+        )
+        print(f"{table['label']} nodes exported: {len(table['rows'])}")
+
+    relationship_files = []
+    for table in tables["relationships"]:
+        if table["rows"].empty:
+            continue
+        relationship_files.append(
+            (table["type"], *write_relationship_files(output_dir, table, constraints))
+        )
+        print(
+            f"{table['start_label']}-{table['type']}->{table['end_label']} "
+            f"relationships exported: {len(table['rows'])}"
+        )
+
+    script_path = write_import_script(output_dir, node_files, relationship_files)
+    print(f"Import files written to {output_dir}, import them with {script_path}")
+    return script_path
+
+
+def attach_spatial_layers(driver, constraints, batch_size=10000):
+    """
+    Creates the spatial layers of the schema and adds the nodes of their labels in batches,
+    for graphs written by neo4j-admin import rather than node by node.
+
+    Args:
+        driver: Neo4j driver
+        constraints: Constraints schema
+        batch_size: Number of nodes added per transaction
+    """
+    with driver.session() as session:
+        for layer_name, layer in constraints["spatial_layers"].items():
+            if layer["layer_class"].endswith("SimplePointLayer"):
+                init_point_layer(session, layer_name)
+                geometry_properties = ["latitude", "longitude"]
+            else:
+                geometry_property = layer.get("geomencoder_config", "wkt")
+                init_wkt_layer(
+                    session, layer_name, geometry_property_name=geometry_property
+                )
+                geometry_properties = [geometry_property]
+
+            for label in layer["nodes"]:
+                add_label_to_spatial_layer(
+                    session,
+                    layer_name,
+                    label,
+                    geometry_properties,
+                    batch_size=batch_size,
+                )
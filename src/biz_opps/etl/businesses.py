@@ -1,5 +1,7 @@
 # This module contains functions to populate the Business nodes in the knowledge graph.
+import json
 from shapely import wkt, geometry
+from shapely.strtree import STRtree
 from google.maps import places_v1
 from google.auth import default
 from google.maps.places_v1 import types
@@ -12,11 +14,28 @@ from biz_opps.neo4j.construction import (
 )
 from biz_opps.neo4j.validation import validate_data
 from biz_opps.utils.geometry import get_minimum_enclosing_circle
+from biz_opps.etl.fingerprint import fingerprint, print_changes
+from biz_opps.etl.tables import node_table, relationship_table
 from biz_opps.neo4j.spatial import (
     init_point_layer,
     add_node_to_spatial_layer,
 )
 
+# Node labels and spatial layers owned by this component
+CLEANUP_NODES = ["Business"]
+CLEANUP_SPATIAL_LAYERS = ["business_layer"]
+
+# Stage names used for checkpoints
+HARVEST_CHECKPOINT_STAGE = "business_harvest"
+LOAD_CHECKPOINT_STAGE = "businesses"
+
+GOOGLE_BUSINESS_TYPES = {
+    # "farmers_market": ["farmers_market"],
+    "grocery_store": ["grocery_store"],
+    "fast_food_restaurant": ["fast_food_restaurant"],
+    "bakery": ["bakery"],
+}
+
 
 def get_block_group_geometries(session, neo4j_filter: str = ""):
     """
@@ -40,22 +59,32 @@ def get_block_group_geometries(session, neo4j_filter: str = ""):
     geometries = {}
 
     for record in result:
-        block_group_id = record["ct_block_group"]
-        bg_wkt = record["wkt"]
+        geometries[record["ct_block_group"]] = get_block_group_geometry(record["wkt"])
 
-        # Convert WKT to Shapely geometry
-        polygon = wkt.loads(bg_wkt)
+    return geometries
 
-        # Calculate center and radius
-        center, radius = get_minimum_enclosing_circle(polygon)
 
-        geometries[block_group_id] = {
-            "polygon": polygon,
-            "center": center,
-            "radius": radius,
-        }
+def get_block_group_geometry(bg_wkt):
+    """
+    Computes the geometry used to query the businesses of a BlockGroup.
 
-    return geometries
+    Args:
+        bg_wkt: WKT of the BlockGroup
+
+    Returns:
+        dict: {"polygon": shapely.Polygon, "center": shapely.Point, "radius": int}
+    """
+    # Convert WKT to Shapely geometry
+    polygon = wkt.loads(bg_wkt)
+
+    # Calculate center and radius
+    center, radius = get_minimum_enclosing_circle(polygon)
+
+    return {
+        "polygon": polygon,
+        "center": center,
+        "radius": radius,
+    }
 
 
 def get_business_zipcode(session, ct_block_group, longitude, latitude):
@@ -108,7 +137,8 @@ async def query_nearby_places(places_client, location, radius, business_types):
         business_types: List of business types to search for
 
     Returns:
-        List of business data dictionaries
+        List of business data dictionaries, or None if the request failed, so a failed lookup
+        is not mistaken for a BlockGroup without businesses
 
     Note: This function should probably be used to query one business "category" at a time since it
     returns primary types that may be different than the requested category. e.g. "bakery" may return
@@ -150,7 +180,39 @@ async def query_nearby_places(places_client, location, radius, business_types):
 
     except Exception as e:
         print(f"Error querying Google Places API: {e}")
-        return []
+        return None
+
+
+def get_business_properties(business, business_type):
+    """
+    Builds the Business node properties from a Places API business.
+
+    Args:
+        business: Places API business
+        business_type: Business type the business was queried for
+
+    Returns:
+        dict: Business node properties
+    """
+    properties = {}
+
+    # Required fields
+    properties["business_id"] = business.id
+    properties["business_name"] = business.display_name.text
+    properties["business_type"] = business_type
+    properties["latitude"] = business.location.latitude
+    properties["longitude"] = business.location.longitude
+
+    # Optional fields
+    if hasattr(business, "formatted_address"):
+        properties["address"] = business.formatted_address
+    if hasattr(business, "rating"):
+        properties["rating"] = business.rating
+    if hasattr(business, "price_level"):
+        # The schema stores the name of the PriceLevel enum
+        properties["price_level"] = types.PriceLevel(business.price_level).name
+
+    return properties
 
 
 def create_business_nodes(
@@ -175,22 +237,7 @@ def create_business_nodes(
     for business_type, businesses in bg_businesses.items():
         for business in businesses:
             try:
-                properties = {}
-
-                # Required fields
-                properties["business_id"] = business.id
-                properties["business_name"] = business.display_name.text
-                properties["business_type"] = business_type
-                properties["latitude"] = business.location.latitude
-                properties["longitude"] = business.location.longitude
-
-                # Optional fields
-                if hasattr(business, "formatted_address"):
-                    properties["address"] = business.formatted_address
-                if hasattr(business, "rating"):
-                    properties["rating"] = business.rating
-                if hasattr(business, "price_level"):
-                    properties["price_level"] = business.price_level
+                properties = get_business_properties(business, business_type)
 
                 node_data = {"label": "Business", "properties": properties}
 
@@ -264,101 +311,394 @@ def create_business_nodes(
     return business_count, failed_instances
 
 
-async def populate_businesses(
-    driver, constraints, cleanup=False, verbose=False, neo4j_filter: str = ""
+def serialize_businesses(bg_businesses):
+    """Serialize a dict of business type to list of Places API businesses to JSON."""
+    return json.dumps(
+        {
+            business_type: [types.Place.to_json(place) for place in places]
+            for business_type, places in bg_businesses.items()
+        }
+    )
+
+
+def deserialize_businesses(payload):
+    """Deserialize businesses serialized with serialize_businesses."""
+    return {
+        business_type: [types.Place.from_json(place) for place in places]
+        for business_type, places in json.loads(payload).items()
+    }
+
+
+def get_business_fingerprints(harvested):
+    """
+    Fingerprints the Places API responses of each BlockGroup.
+
+    Args:
+        harvested: Dict returned by harvest_businesses
+
+    Returns:
+        dict: Mapping of ct_block_group to fingerprint, without the BlockGroups whose harvest failed
+    """
+    return {
+        ct_block_group: fingerprint(
+            {
+                business_type: sorted(types.Place.to_json(place) for place in places)
+                for business_type, places in businesses.items()
+            }
+        )
+        for ct_block_group, businesses in harvested.items()
+        if businesses is not None
+    }
+
+
+def delete_block_group_businesses(session, ct_block_groups):
+    """
+    Deletes the Business nodes located in BlockGroups, unless they are also located in another BlockGroup.
+
+    Args:
+        session: Neo4j session
+        ct_block_groups: ct_block_group of the BlockGroups
+    """
+    query = """
+    MATCH (b:Business)-[:LOCATED_IN]->(bg:BlockGroup)
+    WHERE bg.ct_block_group IN $ct_block_groups
+      AND NOT EXISTS {
+        MATCH (b)-[:LOCATED_IN]->(other:BlockGroup)
+        WHERE NOT other.ct_block_group IN $ct_block_groups
+      }
+    WITH DISTINCT b
+    CALL spatial.removeNode('business_layer', b) YIELD nodeId
+    WITH b
+    DETACH DELETE b
+    """
+    try:
+        session.run(query, {"ct_block_groups": list(ct_block_groups)})
+    except Exception as e:
+        print(f"Failed to delete businesses of BlockGroups: {e}")
+
+
+async def harvest_businesses(
+    driver, verbose=False, neo4j_filter: str = "", journal=None, block_groups=None
 ):
     """
-    Main function to populate Business nodes.
+    Queries the Google Places API for businesses within each BlockGroup.
+    Only requires BlockGroup nodes to exist, so it can run before the administrative topology is written.
 
     Args:
         driver: Neo4j driver
-        constraints: Constraints schema
-        cleanup: Cleanup existing Business nodes and spatial layer
         verbose: Print verbose output
         neo4j_filter: Optional Neo4j filter string
-    """
-    if cleanup:
-        cleanup_neo4j(
-            driver,
-            constraints,
-            nodes=["Business"],
-            spatial_layers=["business_layer"],
-        )
+        journal (CheckpointJournal): Optional journal storing the businesses harvested per BlockGroup,
+            so BlockGroups harvested by an interrupted run are not queried again. A BlockGroup is
+            only journaled once all its business type queries succeeded.
+        block_groups (dict): Optional BlockGroup geometries keyed by ct_block_group, as returned by
+            get_block_group_geometry. Read from Neo4j if None.
 
-    print("Populating Businesses...")
+    Returns:
+        Dict mapping ct_block_group to a dict of business type to list of businesses, or to None
+        if a Places API query of the BlockGroup failed
+    """
+    print("Harvesting Businesses...")
 
     # Initialize Google Maps client
     credentials, project = default()
     places_client = places_v1.PlacesAsyncClient(credentials=credentials)
 
-    google_business_types = {
-        # "farmers_market": ["farmers_market"],
-        "grocery_store": ["grocery_store"],
-        "fast_food_restaurant": ["fast_food_restaurant"],
-        "bakery": ["bakery"],
-    }
+    # Get all BlockGroup geometries
+    if block_groups is None:
+        with driver.session() as session:
+            block_groups = get_block_group_geometries(session, neo4j_filter)
+
+    harvested = {}
+    if journal:
+        harvested = {
+            ct_block_group: deserialize_businesses(payload)
+            for ct_block_group, payload in journal.get_payloads(
+                HARVEST_CHECKPOINT_STAGE
+            ).items()
+            if ct_block_group in block_groups
+        }
+        if harvested:
+            print(f"Reusing harvested businesses for {len(harvested)} BlockGroups")
 
-    with driver.session() as session:
-        # Initialize new point layer
-        print("Initializing point layer...")
-        init_point_layer(session, "business_layer")
+    # Process each BlockGroup
+    for ct_block_group, geom_data in block_groups.items():
+        if ct_block_group in harvested:
+            continue
 
-        # Get all BlockGroup geometries
-        block_groups = get_block_group_geometries(session, neo4j_filter)
+        polygon = geom_data["polygon"]
+        center = geom_data["center"]
+        radius = geom_data["radius"]
 
-        business_count = 0
-        failed_instances = []
+        # Get coordinates for API query
+        center_coords = (center.y, center.x)
+        if verbose:
+            print(f"Querying businesses near {ct_block_group}")
 
-        # Process each BlockGroup
-        for ct_block_group, geom_data in block_groups.items():
-            polygon = geom_data["polygon"]
-            center = geom_data["center"]
-            radius = geom_data["radius"]
+        businesses = {
+            business_type: [] for business_type in GOOGLE_BUSINESS_TYPES.keys()
+        }
 
-            # Get coordinates for API query
-            center_coords = (center.y, center.x)
-            if verbose:
-                print(f"Querying businesses near {ct_block_group}")
+        # Query nearby places for each business type
+        failed = False
+        for business_type, gtypes in GOOGLE_BUSINESS_TYPES.items():
+            places = await query_nearby_places(
+                places_client, center_coords, radius, gtypes
+            )
+            if places is None:
+                failed = True
+                continue
+
+            # Filter to businesses within BlockGroup
+            businesses_in_block_group = [
+                place
+                for place in places
+                if polygon.contains(
+                    geometry.Point(place.location.longitude, place.location.latitude)
+                )
+            ]
 
-            businesses = {
-                business_type: [] for business_type in google_business_types.keys()
-            }
+            # Add to list of businesses for this type
+            businesses[business_type].extend(businesses_in_block_group)
+
+        if failed:
+            # Partial results would look like closed businesses to an incremental load
+            print(f"Failed to harvest businesses of BlockGroup {ct_block_group}")
+            harvested[ct_block_group] = None
+            continue
+
+        harvested[ct_block_group] = businesses
+        if journal:
+            journal.mark_done(
+                HARVEST_CHECKPOINT_STAGE,
+                ct_block_group,
+                payload=serialize_businesses(businesses),
+            )
+
+    failed_count = sum(businesses is None for businesses in harvested.values())
+    print(f"Harvested businesses for {len(harvested) - failed_count} BlockGroups")
+    if failed_count:
+        print(f"BlockGroups failed to harvest: {failed_count}")
+    return harvested
+
+
+def transform_businesses(harvested, zipcode_properties=None):
+    """
+    Transforms harvested businesses into node and relationship tables for bulk loading.
+    Businesses are linked to the Zipcode containing them with Shapely, without the spatial layers.
 
-            # Query nearby places for each business type
-            for business_type, gtypes in google_business_types.items():
-                places = await query_nearby_places(
-                    places_client, center_coords, radius, gtypes
+    Args:
+        harvested: Dict returned by harvest_businesses
+        zipcode_properties (list): Optional Zipcode node properties with their WKT, Zipcode
+            relationships are only created if given
+
+    Returns:
+        dict: Node and relationship tables, see biz_opps.etl.tables
+    """
+    zipcodes = [
+        (properties["zipcode_number"], wkt.loads(properties["wkt"]))
+        for properties in zipcode_properties or []
+        if properties.get("wkt")
+    ]
+    tree = STRtree([polygon for _, polygon in zipcodes]) if zipcodes else None
+
+    business_rows = {}
+    block_group_rows = []
+    zipcode_rows = []
+    for ct_block_group, businesses in harvested.items():
+        if businesses is None:
+            continue
+        for business_type, places in businesses.items():
+            for business in places:
+                properties = get_business_properties(business, business_type)
+                business_rows[properties["business_id"]] = properties
+                start = {"business_id": properties["business_id"]}
+                block_group_rows.append(
+                    {"start": start, "end": {"ct_block_group": ct_block_group}}
                 )
 
-                # Filter to businesses within BlockGroup
-                businesses_in_block_group = [
-                    place
-                    for place in places
-                    if polygon.contains(
-                        geometry.Point(
-                            place.location.longitude, place.location.latitude
-                        )
+                if tree is None:
+                    continue
+                point = geometry.Point(properties["longitude"], properties["latitude"])
+                for index in tree.query(point, predicate="within"):
+                    zipcode_rows.append(
+                        {"start": start, "end": {"zipcode_number": zipcodes[index][0]}}
                     )
-                ]
+                    break
+
+    relationships = [
+        relationship_table("LOCATED_IN", "Business", "BlockGroup", block_group_rows)
+    ]
+    if tree is not None:
+        relationships.append(
+            relationship_table("LOCATED_IN", "Business", "Zipcode", zipcode_rows)
+        )
+
+    return {
+        "nodes": [node_table("Business", list(business_rows.values()))],
+        "relationships": relationships,
+    }
+
+
+def load_businesses(
+    driver,
+    constraints,
+    harvested,
+    verbose=False,
+    journal=None,
+    manifest=None,
+    incremental=False,
+    detect_deletes=True,
+):
+    """
+    Creates Business nodes and their relationships from harvested businesses.
+    Requires the administrative topology so businesses can be linked to their Zipcode.
+
+    Args:
+        driver: Neo4j driver
+        constraints: Constraints schema
+        harvested: Dict returned by harvest_businesses
+        verbose: Print verbose output
+        journal (CheckpointJournal): Optional journal used to skip and record loaded BlockGroups
+        manifest (FingerprintManifest): Optional manifest recording the fingerprints of loaded BlockGroups
+        incremental (bool): Only load BlockGroups whose Places responses changed (requires manifest)
+        detect_deletes (bool): Whether BlockGroups missing from harvested are deletes, disable when
+            the harvest was filtered
+
+    BlockGroups whose harvest failed are neither loaded, deleted nor fingerprinted, so their
+    businesses are kept until a later harvest succeeds.
+    """
+    print("Loading Businesses...")
+
+    failed = {
+        str(ct_block_group)
+        for ct_block_group, businesses in harvested.items()
+        if businesses is None
+    }
+    if failed:
+        print(f"Skipping {len(failed)} BlockGroups that failed to harvest")
+    harvested = {
+        ct_block_group: businesses
+        for ct_block_group, businesses in harvested.items()
+        if businesses is not None
+    }
+    fingerprints = get_business_fingerprints(harvested) if manifest else {}
+
+    with driver.session() as session:
+        # Initialize new point layer
+        print("Initializing point layer...")
+        init_point_layer(session, "business_layer")
+
+        if incremental and manifest:
+            changes = manifest.diff(
+                LOAD_CHECKPOINT_STAGE, fingerprints, deletes=detect_deletes
+            )
+            # A failed harvest is not a deleted BlockGroup
+            changes["deletes"] = [
+                key for key in changes["deletes"] if key not in failed
+            ]
+            print_changes("Business BlockGroup", changes)
+
+            # Businesses of changed BlockGroups are replaced, removing closed businesses
+            delete_block_group_businesses(
+                session, changes["updates"] + changes["deletes"]
+            )
+            manifest.remove(LOAD_CHECKPOINT_STAGE, changes["deletes"])
+
+            changed = set(changes["inserts"]) | set(changes["updates"])
+            harvested = {
+                ct_block_group: businesses
+                for ct_block_group, businesses in harvested.items()
+                if ct_block_group in changed
+            }
+
+        business_count = 0
+        skipped_count = 0
+        failed_instances = []
+        written = []
+        completed = journal.completed(LOAD_CHECKPOINT_STAGE) if journal else set()
 
-                # Add to list of businesses for this type
-                businesses[business_type].extend(businesses_in_block_group)
+        for ct_block_group, businesses in harvested.items():
+            if ct_block_group in completed:
+                skipped_count += 1
+                written.append(ct_block_group)
+                continue
 
             # Create nodes with spatial data
-            business_count, failed_instances = create_business_nodes(
+            bg_business_count, bg_failed_instances = create_business_nodes(
                 session,
                 businesses,
                 ct_block_group,
                 constraints,
                 verbose=verbose,
             )
-            business_count += business_count
-            failed_instances.extend(failed_instances)
+            business_count += bg_business_count
+            failed_instances.extend(bg_failed_instances)
+
+            if not bg_failed_instances:
+                written.append(ct_block_group)
+                if journal:
+                    journal.mark_done(LOAD_CHECKPOINT_STAGE, ct_block_group)
 
         print(f"Business Nodes Created: {business_count}")
         print(f"Business Nodes Failed: {len(failed_instances)}")
+        if skipped_count:
+            print(f"BlockGroups skipped (already loaded): {skipped_count}")
 
         if failed_instances:
             print("\nBusiness Nodes Failed:")
             for failure in failed_instances:
                 print(failure)
+
+    if manifest:
+        manifest.update(
+            LOAD_CHECKPOINT_STAGE, {key: fingerprints[key] for key in written}
+        )
+
+
+async def populate_businesses(
+    driver,
+    constraints,
+    cleanup=False,
+    verbose=False,
+    neo4j_filter: str = "",
+    journal=None,
+    manifest=None,
+    incremental=False,
+):
+    """
+    Main function to populate Business nodes.
+
+    Args:
+        driver: Neo4j driver
+        constraints: Constraints schema
+        cleanup: Cleanup existing Business nodes and spatial layer
+        verbose: Print verbose output
+        neo4j_filter: Optional Neo4j filter string
+        journal (CheckpointJournal): Optional journal used to resume an interrupted run
+        manifest (FingerprintManifest): Optional manifest recording the fingerprints of loaded BlockGroups
+        incremental (bool): Only load BlockGroups whose Places responses changed (requires manifest)
+    """
+    if cleanup:
+        cleanup_neo4j(
+            driver,
+            constraints,
+            nodes=CLEANUP_NODES,
+            spatial_layers=CLEANUP_SPATIAL_LAYERS,
+        )
+
+    print("Populating Businesses...")
+
+    harvested = await harvest_businesses(
+        driver, verbose=verbose, neo4j_filter=neo4j_filter, journal=journal
+    )
+    load_businesses(
+        driver,
+        constraints,
+        harvested,
+        verbose=verbose,
+        journal=journal,
+        manifest=manifest,
+        incremental=incremental,
+        detect_deletes=not neo4j_filter,
+    )
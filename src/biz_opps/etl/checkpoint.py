@@ -0,0 +1,102 @@
+# This module contains the checkpoint journal used to resume interrupted ETL runs.
+import os
+import sqlite3
+import threading
+
+from biz_opps.utils.file import get_root_dir
+
+DEFAULT_JOURNAL_PATH = os.path.join(get_root_dir(), "data", "checkpoints", "etl.sqlite")
+
+
+class CheckpointJournal:
+    """
+    On-disk journal of completed ETL work units (block groups, batches, steps) per stage.
+    Safe to share between the stages of a run, including stages running in worker threads.
+    """
+
+    def __init__(self, path: str = DEFAULT_JOURNAL_PATH):
+        """
+        Open (or create) the journal.
+
+        Args:
+            path: Path of the SQLite journal file.
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                stage TEXT NOT NULL,
+                key TEXT NOT NULL,
+                payload TEXT,
+                completed_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (stage, key)
+            )
+            """
+        )
+        self._connection.commit()
+
+    def is_done(self, stage: str, key: str) -> bool:
+        """Check whether a work unit of a stage has been completed."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT 1 FROM checkpoints WHERE stage = ? AND key = ?",
+                (stage, str(key)),
+            ).fetchone()
+        return row is not None
+
+    def completed(self, stage: str) -> set:
+        """Get the keys of all completed work units of a stage."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT key FROM checkpoints WHERE stage = ?", (stage,)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def mark_done(self, stage: str, key: str, payload: str = None):
+        """
+        Record a completed work unit.
+
+        Args:
+            stage: Stage name.
+            key: Work unit key, e.g. a ct_block_group or step name.
+            payload: Optional serialized output of the work unit, returned by get_payloads on resume.
+        """
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO checkpoints (stage, key, payload) VALUES (?, ?, ?)",
+                (stage, str(key), payload),
+            )
+            self._connection.commit()
+
+    def get_payloads(self, stage: str) -> dict:
+        """Get the payloads of all completed work units of a stage, keyed by work unit key."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT key, payload FROM checkpoints WHERE stage = ?", (stage,)
+            ).fetchall()
+        return {key: payload for key, payload in rows}
+
+    def reset(self, stages: list = None):
+        """
+        Forget completed work so it is redone.
+
+        Args:
+            stages: Optional list of stage names to reset. If None, the whole journal is reset.
+        """
+        with self._lock:
+            if stages is None:
+                self._connection.execute("DELETE FROM checkpoints")
+            else:
+                self._connection.executemany(
+                    "DELETE FROM checkpoints WHERE stage = ?",
+                    [(stage,) for stage in stages],
+                )
+            self._connection.commit()
+
+    def close(self):
+        """Close the journal."""
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,160 @@
+# This module contains the source row fingerprints used to write only changed data to the graph.
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+
+from biz_opps.utils.file import get_root_dir
+
+DEFAULT_MANIFEST_PATH = os.path.join(
+    get_root_dir(), "data", "checkpoints", "fingerprints.sqlite"
+)
+
+
+def fingerprint(values):
+    """
+    Computes a stable fingerprint of source values.
+
+    Args:
+        values: JSON serializable values (dict keys are sorted, other objects are converted with str).
+
+    Returns:
+        str: Hex digest of the values.
+    """
+    serialized = json.dumps(values, sort_keys=True, default=str)
+    return hashlib.sha1(serialized.encode("utf-8")).hexdigest()
+
+
+def fingerprint_rows(df, key_column):
+    """
+    Fingerprints the full contents of each row of a DataFrame.
+
+    Args:
+        df: DataFrame of source rows
+        key_column: Column identifying each row
+
+    Returns:
+        dict: Mapping of row key to fingerprint
+    """
+    return {
+        str(row[key_column]): fingerprint(row.to_dict()) for _, row in df.iterrows()
+    }
+
+
+class FingerprintManifest:
+    """
+    Local manifest of the fingerprints of the source rows written to the graph, per stage.
+    Safe to share between the stages of a run, including stages running in worker threads.
+    """
+
+    def __init__(self, path: str = DEFAULT_MANIFEST_PATH):
+        """
+        Open (or create) the manifest.
+
+        Args:
+            path: Path of the SQLite manifest file.
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS fingerprints (
+                stage TEXT NOT NULL,
+                key TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                PRIMARY KEY (stage, key)
+            )
+            """
+        )
+        self._connection.commit()
+
+    def get(self, stage: str) -> dict:
+        """Get the recorded fingerprints of a stage, keyed by source row key."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT key, fingerprint FROM fingerprints WHERE stage = ?", (stage,)
+            ).fetchall()
+        return dict(rows)
+
+    def diff(self, stage: str, fingerprints: dict, deletes: bool = True) -> dict:
+        """
+        Compares current source fingerprints against the recorded ones.
+
+        Args:
+            stage: Stage name.
+            fingerprints: Mapping of source row key to its current fingerprint.
+            deletes: Whether recorded keys missing from fingerprints are deletes. Disable when the
+                source was filtered, since missing keys are then not known to be deleted.
+
+        Returns:
+            dict: Lists of keys under "inserts", "updates", "deletes" and "unchanged".
+        """
+        recorded = self.get(stage)
+        changes = {"inserts": [], "updates": [], "deletes": [], "unchanged": []}
+
+        for key, value in fingerprints.items():
+            key = str(key)
+            if key not in recorded:
+                changes["inserts"].append(key)
+            elif recorded[key] != value:
+                changes["updates"].append(key)
+            else:
+                changes["unchanged"].append(key)
+
+        if deletes:
+            current = {str(key) for key in fingerprints}
+            changes["deletes"] = [key for key in recorded if key not in current]
+
+        return changes
+
+    def update(self, stage: str, fingerprints: dict):
+        """Record fingerprints of source rows that were written to the graph."""
+        with self._lock:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO fingerprints (stage, key, fingerprint) VALUES (?, ?, ?)",
+                [(stage, str(key), value) for key, value in fingerprints.items()],
+            )
+            self._connection.commit()
+
+    def remove(self, stage: str, keys: list):
+        """Forget fingerprints of source rows that were deleted from the graph."""
+        with self._lock:
+            self._connection.executemany(
+                "DELETE FROM fingerprints WHERE stage = ? AND key = ?",
+                [(stage, str(key)) for key in keys],
+            )
+            self._connection.commit()
+
+    def reset(self, stages: list = None):
+        """
+        Forget recorded fingerprints so all rows are written again.
+        Sub-stages named "<stage>:<name>" are reset along with their stage.
+
+        Args:
+            stages: Optional list of stage names to reset. If None, the whole manifest is reset.
+        """
+        with self._lock:
+            if stages is None:
+                self._connection.execute("DELETE FROM fingerprints")
+            else:
+                self._connection.executemany(
+                    "DELETE FROM fingerprints WHERE stage = ? OR stage LIKE ?",
+                    [(stage, f"{stage}:%") for stage in stages],
+                )
+            self._connection.commit()
+
+    def close(self):
+        """Close the manifest."""
+        with self._lock:
+            self._connection.close()
+
+
+def print_changes(name: str, changes: dict):
+    """Print a summary of the changes found by FingerprintManifest.diff."""
+    print(
+        f"{name} changes: {len(changes['inserts'])} inserts, {len(changes['updates'])} updates, "
+        f"{len(changes['deletes'])} deletes, {len(changes['unchanged'])} unchanged"
+    )
@@ -8,10 +8,28 @@ from biz_opps.neo4j.construction import (
     create_node_index,
     create_relationship,
 )
+from biz_opps.etl.fingerprint import fingerprint, print_changes
+from biz_opps.etl.tables import node_table, relationship_table
 from biz_opps.utils.file import get_root_dir
 
 # from biz_opps.neo4j.validation import validate_data  TODO: Add validation
 
+# Node labels and spatial layers owned by this component
+CLEANUP_NODES = [
+    "TotalPopulation",
+    "PopulationGrowth",
+    "AgeAverage",
+    "AgeGroup",
+    "WealthIndex",
+    "EducationLevel",
+    "CrimeIndex",
+    "FastFoodSpendingIndex",
+]
+CLEANUP_SPATIAL_LAYERS = []
+
+# Stage name used for checkpoints
+CHECKPOINT_STAGE = "geoenrichments"
+
 
 def create_enrichment_indexes(session, verbose=False):
     """Creates enrichment indexes."""
@@ -318,18 +336,16 @@ def determine_spending_level(value):
     return ([{"category": category}], [source_value])
 
 
-def create_enrichment_nodes(session, constraints, verbose=False):
+def get_enrichment_node_properties(constraints):
     """
-    Creates enrichment categorical nodes.
+    Builds the properties of every enrichment categorical node, one node per combination of enum values.
 
     Args:
-        session (neo4j.Session): Neo4j session object.
         constraints (dict): Constraints for data validation.
-        verbose (bool): Whether to print verbose output.
-    """
-    success_count = 0
-    failed_instances = []
 
+    Returns:
+        dict: Mapping of enrichment type to a list of node properties.
+    """
     node_constraints = constraints["nodes"]
 
     # Get categories from constraints
@@ -372,21 +388,46 @@ def create_enrichment_nodes(session, constraints, verbose=False):
         },
     }
 
-    # Create nodes for each enrichment type and its properties
+    enrichment_node_properties = {}
     for node_type, enum_properties in enrichment_node_categories.items():
-        if verbose:
-            print(f"Creating {node_type} nodes...")
         # Get all possible combinations of enum values
         property_names = list(enum_properties.keys())
         category_combinations = product(
             *[enum_properties[prop] for prop in property_names]
         )
+        enrichment_node_properties[node_type] = [
+            dict(zip(property_names, combination))
+            for combination in category_combinations
+        ]
+
+    return enrichment_node_properties
+
+
+def create_enrichment_nodes(session, constraints, verbose=False):
+    """
+    Creates enrichment categorical nodes.
+
+    Args:
+        session (neo4j.Session): Neo4j session object.
+        constraints (dict): Constraints for data validation.
+        verbose (bool): Whether to print verbose output.
+
+    Returns:
+        bool: Whether every enrichment node was created.
+    """
+    success_count = 0
+    failed_instances = []
+
+    # Create nodes for each enrichment type and its properties
+    for node_type, nodes in get_enrichment_node_properties(constraints).items():
+        if verbose:
+            print(f"Creating {node_type} nodes...")
 
         # Create node for each combination
-        for combination in category_combinations:
+        for properties in nodes:
             if verbose:
-                print(f"Creating {node_type} node with properties {combination}...")
-            properties = dict(zip(property_names, combination))
+                print(f"Creating {node_type} node with properties {properties}...")
+            property_names = list(properties.keys())
             try:
                 create_node(
                     session,
@@ -409,8 +450,71 @@ def create_enrichment_nodes(session, constraints, verbose=False):
         for failure in failed_instances:
             print(failure)
 
+    return not failed_instances
+
+
+def get_ct_block_group(row):
+    """Creates the ct_block_group of an enrichment row from its tractce and blkgrpce."""
+    return str(int(row["tractce"])) + str(row["blkgrpce"])
+
+
+def determine_enrichments(row):
+    """
+    Determines the enrichment categories and source values of a prepared enrichment row.
+
+    Returns:
+        dict: Mapping of enrichment type to (category combinations, source values)
+    """
+    return {
+        "TotalPopulation": determine_population_level(row["totpop_cy"]),
+        "PopulationGrowth": determine_growth_rate(row["popgrwcyfy"]),
+        "AgeAverage": determine_age_average(row["avg_age"]),
+        "AgeGroup": determine_age_group_representations(row),
+        "WealthIndex": determine_wealth_category(row["normalized_wlthindxcy"]),
+        "EducationLevel": determine_education_level(row),
+        "CrimeIndex": determine_crime_level(row["crmcytotc"]),
+        "FastFoodSpendingIndex": determine_spending_level(
+            row["normalized_fastfoodspending"]
+        ),
+    }
+
+
+def get_enrichment_fingerprints(df):
+    """
+    Fingerprints the enrichment categories and source values of each BlockGroup.
+    Normalized values depend on the whole dataset, so fingerprints are taken after preparation.
+
+    Args:
+        df (pd.DataFrame): Prepared enrichment data.
 
-def create_enrichment_relationships(session, df, verbose=False):
+    Returns:
+        dict: Mapping of ct_block_group to fingerprint
+    """
+    return {
+        get_ct_block_group(row): fingerprint(determine_enrichments(row))
+        for _, row in df.iterrows()
+    }
+
+
+def delete_enrichment_relationships(session, ct_block_groups):
+    """
+    Deletes the HAS_ENRICHMENT relationships of BlockGroups, so outdated categories are not kept.
+
+    Args:
+        session (neo4j.Session): Neo4j session object.
+        ct_block_groups (list): ct_block_group of the BlockGroups.
+    """
+    session.run(
+        """
+        MATCH (bg:BlockGroup)-[r:HAS_ENRICHMENT]->()
+        WHERE bg.ct_block_group IN $ct_block_groups
+        DELETE r
+        """,
+        {"ct_block_groups": list(ct_block_groups)},
+    )
+
+
+def create_enrichment_relationships(session, df, verbose=False, journal=None):
     """
     Creates HAS_ENRICHMENT relationships between BlockGroups and enrichment nodes.
 
@@ -418,28 +522,31 @@ def create_enrichment_relationships(session, df, verbose=False):
         session (neo4j.Session): Neo4j session object.
         df (pd.DataFrame): DataFrame containing BlockGroup data.
         verbose (bool): Whether to print verbose output.
+        journal (CheckpointJournal): Optional journal used to skip and record completed BlockGroups.
+
+    Returns:
+        list: ct_block_group of the BlockGroups whose relationships were all created,
+            including those completed by a previous run.
     """
     success_count = 0
+    skipped_count = 0
     failed_instances = []
+    written = []
+    completed = journal.completed(CHECKPOINT_STAGE) if journal else set()
 
     for _, row in df.iterrows():
         try:
-            # Create ct_block_group from tractce and blkgrpce
-            ct_block_group = str(int(row["tractce"])) + str(row["blkgrpce"])
+            ct_block_group = get_ct_block_group(row)
+
+            if ct_block_group in completed:
+                skipped_count += 1
+                written.append(ct_block_group)
+                continue
+
+            failed_count = len(failed_instances)
 
             # Create relationships for each enrichment type
-            enrichments = {
-                "TotalPopulation": determine_population_level(row["totpop_cy"]),
-                "PopulationGrowth": determine_growth_rate(row["popgrwcyfy"]),
-                "AgeAverage": determine_age_average(row["avg_age"]),
-                "AgeGroup": determine_age_group_representations(row),
-                "WealthIndex": determine_wealth_category(row["normalized_wlthindxcy"]),
-                "EducationLevel": determine_education_level(row),
-                "CrimeIndex": determine_crime_level(row["crmcytotc"]),
-                "FastFoodSpendingIndex": determine_spending_level(
-                    row["normalized_fastfoodspending"]
-                ),
-            }
+            enrichments = determine_enrichments(row)
             for enrichment_type, (
                 category_combinations,
                 source_values,
@@ -448,7 +555,7 @@ def create_enrichment_relationships(session, df, verbose=False):
                     category_combinations, source_values
                 ):
                     try:
-                        create_relationship(
+                        created = create_relationship(
                             session,
                             start_label="BlockGroup",
                             start_props={"ct_block_group": ct_block_group},
@@ -460,6 +567,10 @@ def create_enrichment_relationships(session, df, verbose=False):
                             rel_properties={"source_value": str(source_value)},
                             verbose=verbose,
                         )
+                        if not created:
+                            raise Exception(
+                                "Failed to create HAS_ENRICHMENT relationship"
+                            )
                         success_count += 1
                     except Exception as e:
                         failed_instances.append(
@@ -470,6 +581,12 @@ def create_enrichment_relationships(session, df, verbose=False):
                             }
                         )
 
+            # Only checkpoint BlockGroups whose relationships were all created
+            if len(failed_instances) == failed_count:
+                written.append(ct_block_group)
+                if journal:
+                    journal.mark_done(CHECKPOINT_STAGE, ct_block_group)
+
         except Exception as e:
             failed_instances.append(
                 {
@@ -482,14 +599,76 @@ def create_enrichment_relationships(session, df, verbose=False):
 
     print(f"Enrichment relationships created: {success_count}")
     print(f"Failed relationships: {len(failed_instances)}")
+    if skipped_count:
+        print(f"BlockGroups skipped (already completed): {skipped_count}")
 
     if failed_instances:
         print("\nFailures:")
         for failure in failed_instances:
             print(failure)
 
+    return written
+
+
+def transform_geoenrichments(df, constraints):
+    """
+    Transforms the enrichment data into node and relationship tables for bulk loading.
+
+    Args:
+        df (pd.DataFrame): Prepared enrichment data.
+        constraints (dict): Constraints for data validation.
+
+    Returns:
+        dict: Node and relationship tables, see biz_opps.etl.tables
+    """
+    relationship_rows = {label: [] for label in CLEANUP_NODES}
+    for _, row in df.iterrows():
+        ct_block_group = get_ct_block_group(row)
+        for enrichment_type, (
+            category_combinations,
+            source_values,
+        ) in determine_enrichments(row).items():
+            for combination, source_value in zip(category_combinations, source_values):
+                relationship_rows[enrichment_type].append(
+                    {
+                        "start": {"ct_block_group": ct_block_group},
+                        "end": combination,
+                        "properties": {"source_value": str(source_value)},
+                    }
+                )
+
+    return {
+        "nodes": [
+            node_table(label, nodes)
+            for label, nodes in get_enrichment_node_properties(constraints).items()
+        ],
+        "relationships": [
+            relationship_table("HAS_ENRICHMENT", "BlockGroup", label, rows)
+            for label, rows in relationship_rows.items()
+        ],
+    }
 
-def populate_geoenrichments(driver, constraints, cleanup=False, verbose=False):
+
+def get_geoenrichment_data():
+    """
+    Reads and prepares the enrichment data.
+
+    Returns:
+        pd.DataFrame: Prepared enrichment data.
+    """
+    df = pd.read_csv(f"{get_root_dir()}/data/bgs_sd_imp.csv")
+    return prepare_data(df)
+
+
+def populate_geoenrichments(
+    driver,
+    constraints,
+    cleanup=False,
+    verbose=False,
+    journal=None,
+    manifest=None,
+    incremental=False,
+):
     """
     Main function to populate geoenrichment data.
 
@@ -498,33 +677,68 @@ def populate_geoenrichments(driver, constraints, cleanup=False, verbose=False):
         constraints (dict): Constraints for data validation.
         cleanup (bool): Cleanup existing enrichment nodes and relationships
         verbose (bool): Whether to print verbose output.
+        journal (CheckpointJournal): Optional journal used to skip and record completed work.
+        manifest (FingerprintManifest): Optional manifest recording the fingerprints of written BlockGroups.
+        incremental (bool): Only write BlockGroups whose enrichments changed (requires manifest).
     """
-    enrichment_labels = [
-        "TotalPopulation",
-        "PopulationGrowth",
-        "AgeAverage",
-        "AgeGroup",
-        "WealthIndex",
-        "EducationLevel",
-        "CrimeIndex",
-        "FastFoodSpendingIndex",
-    ]
     if cleanup:
         cleanup_neo4j(
             driver,
             constraints,
-            nodes=enrichment_labels,
+            nodes=CLEANUP_NODES,
+            spatial_layers=CLEANUP_SPATIAL_LAYERS,
         )
 
-    # Get enrichment data
-    df = pd.read_csv(f"{get_root_dir()}/data/bgs_sd_imp.csv")
+    # Get and prepare enrichment data
+    df = get_geoenrichment_data()
+
+    fingerprints = get_enrichment_fingerprints(df) if manifest else {}
 
-    # Prepare the data
-    df = prepare_data(df)
+    # Enrichment nodes only change with the enrichment categories in the schema
+    nodes_fingerprint = {
+        "enrichment_nodes": fingerprint(
+            {label: constraints["nodes"][label] for label in CLEANUP_NODES}
+        )
+    }
 
     with driver.session() as session:
-        print("\nCreating enrichment nodes...")
-        create_enrichment_nodes(session, constraints, verbose=verbose)
+        nodes_unchanged = (
+            incremental
+            and manifest
+            and manifest.diff(
+                f"{CHECKPOINT_STAGE}:nodes", nodes_fingerprint, deletes=False
+            )["unchanged"]
+        )
+        if journal and journal.is_done(CHECKPOINT_STAGE, "enrichment_nodes"):
+            print("\nSkipping enrichment nodes (already completed)")
+        elif nodes_unchanged:
+            print("\nSkipping enrichment nodes (unchanged)")
+        else:
+            print("\nCreating enrichment nodes...")
+            # Failed nodes are retried by the next run, resumed or incremental
+            if create_enrichment_nodes(session, constraints, verbose=verbose):
+                if journal:
+                    journal.mark_done(CHECKPOINT_STAGE, "enrichment_nodes")
+                if manifest:
+                    manifest.update(f"{CHECKPOINT_STAGE}:nodes", nodes_fingerprint)
+
+        if incremental and manifest:
+            changes = manifest.diff(CHECKPOINT_STAGE, fingerprints)
+            print_changes("Enrichment", changes)
+
+            # Outdated categories are replaced rather than merged alongside the new ones
+            delete_enrichment_relationships(
+                session, changes["updates"] + changes["deletes"]
+            )
+            manifest.remove(CHECKPOINT_STAGE, changes["deletes"])
+
+            changed = set(changes["inserts"]) | set(changes["updates"])
+            df = df[[get_ct_block_group(row) in changed for _, row in df.iterrows()]]
 
         print("\nCreating enrichment relationships...")
-        create_enrichment_relationships(session, df, verbose=verbose)
+        written = create_enrichment_relationships(
+            session, df, verbose=verbose, journal=journal
+        )
+
+    if manifest:
+        manifest.update(CHECKPOINT_STAGE, {key: fingerprints[key] for key in written})
@@ -0,0 +1,129 @@
+# This module contains functions to load staged node and relationship tables into the knowledge graph.
+from biz_opps.etl.bulk_import import attach_spatial_layers
+from biz_opps.etl.staging import iter_batches, read_run_manifest
+from biz_opps.neo4j.schema_registry import get_node_keys
+
+# Stage name used for checkpoints, suffixed with the run id
+CHECKPOINT_STAGE = "staged_load"
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def get_node_query(constraints, label):
+    """Builds the query merging a batch of nodes on their keys."""
+    merge_pattern = ", ".join(
+        f"{key}: row.`{key}`" for key in get_node_keys(constraints, label)
+    )
+    return f"""
+    UNWIND $rows AS row
+    MERGE (n:{label} {{{merge_pattern}}})
+    SET n += row
+    """
+
+
+def get_relationship_query(constraints, rel_type, start_label, end_label):
+    """Builds the query merging a batch of relationships between nodes matched on their keys."""
+    start_keys = get_node_keys(constraints, start_label)
+    end_keys = get_node_keys(constraints, end_label)
+    start_pattern = ", ".join(f"{key}: row.start.`{key}`" for key in start_keys)
+    end_pattern = ", ".join(f"{key}: row.end.`{key}`" for key in end_keys)
+    return f"""
+    UNWIND $rows AS row
+    MATCH (a:{start_label} {{{start_pattern}}})
+    MATCH (b:{end_label} {{{end_pattern}}})
+    MERGE (a)-[r:{rel_type}]->(b)
+    SET r += row.properties
+    """
+
+
+def to_relationship_rows(rows):
+    """Nest the flat "start.<key>" and "end.<key>" columns of staged relationship rows."""
+    nested = []
+    for row in rows:
+        relationship = {"start": {}, "end": {}, "properties": {}}
+        for column, value in row.items():
+            side, _, key = column.partition(".")
+            if key and side in ("start", "end"):
+                relationship[side][key] = value
+            elif value is not None:
+                relationship["properties"][column] = value
+        nested.append(relationship)
+    return nested
+
+
+def load_staged_run(
+    driver,
+    constraints,
+    run_dir,
+    components=None,
+    batch_size=DEFAULT_BATCH_SIZE,
+    journal=None,
+    verbose=False,
+):
+    """
+    Streams a staged run into Neo4j in batches, without repeating the extract and transform.
+    Nodes of all components are loaded before relationships, then the loaded nodes are added to
+    their spatial layers.
+
+    Args:
+        driver: Neo4j driver
+        constraints: Constraints schema
+        run_dir: Directory of the staged run
+        components: Optional names of the components to load, all staged components if None
+        batch_size: Number of rows written per transaction
+        journal (CheckpointJournal): Optional journal used to skip and record loaded part files
+        verbose: Print verbose output
+    """
+    manifest = read_run_manifest(run_dir)
+    stage = f"{CHECKPOINT_STAGE}:{manifest['run_id']}"
+    completed = journal.completed(stage) if journal else set()
+
+    tables = [
+        table
+        for table in manifest["tables"]
+        if components is None or table["component"] in components
+    ]
+    # Relationships of any component can end at nodes of another one
+    tables.sort(key=lambda table: table["kind"] != "nodes")
+
+    print(f"Loading staged run {manifest['run_id']}...")
+    with driver.session() as session:
+        for table in tables:
+            if table["kind"] == "nodes":
+                name = f"{table['label']} nodes"
+                query = get_node_query(constraints, table["label"])
+            else:
+                name = (
+                    f"{table['start_label']}-{table['type']}->{table['end_label']} "
+                    "relationships"
+                )
+                query = get_relationship_query(
+                    constraints,
+                    table["type"],
+                    table["start_label"],
+                    table["end_label"],
+                )
+
+            loaded_count = 0
+            skipped_count = 0
+            for part in table["parts"]:
+                if part in completed:
+                    skipped_count += 1
+                    continue
+
+                for rows in iter_batches(run_dir, part, batch_size):
+                    if table["kind"] == "relationships":
+                        rows = to_relationship_rows(rows)
+                    session.run(query, {"rows": rows}).consume()
+                    loaded_count += len(rows)
+                    if verbose:
+                        print(f"Loaded {loaded_count} {name}")
+
+                if journal:
+                    journal.mark_done(stage, part)
+
+            print(f"{name} loaded: {loaded_count}")
+            if skipped_count:
+                print(f"{name} parts skipped (already loaded): {skipped_count}")
+
+    attach_spatial_layers(driver, constraints)
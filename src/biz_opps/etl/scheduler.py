@@ -0,0 +1,173 @@
+# This module contains a dependency-aware scheduler used to run ETL stages concurrently.
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def get_stage_order(stages):
+    """
+    Orders stages so that every stage comes after the stages it depends on.
+    Dependencies on stages that are not being run are ignored (their data is assumed to already be in the graph).
+
+    Args:
+        stages (dict): Mapping of stage name to a dict with a "depends_on" list of stage names.
+
+    Returns:
+        list: Stage names in dependency order.
+
+    Raises:
+        ValueError: If the stage dependencies contain a cycle.
+    """
+    order = []
+    visiting = set()
+    visited = set()
+
+    def visit(name):
+        if name in visited:
+            return
+        if name in visiting:
+            raise ValueError(f"Cyclic dependency detected at stage '{name}'")
+        visiting.add(name)
+        for dependency in stages[name].get("depends_on", []):
+            if dependency in stages:
+                visit(dependency)
+        visiting.remove(name)
+        visited.add(name)
+        order.append(name)
+
+    for name in stages:
+        visit(name)
+
+    return order
+
+
+def get_critical_path(stages, report):
+    """
+    Finds the chain of dependent stages with the largest total duration.
+
+    Args:
+        stages (dict): Mapping of stage name to a dict with a "depends_on" list of stage names.
+        report (dict): Stage report returned by run_stages.
+
+    Returns:
+        tuple: (list of stage names on the critical path, total duration in seconds)
+    """
+    longest = {}
+    for name in get_stage_order(stages):
+        duration = report.get(name, {}).get("duration", 0.0)
+        dependencies = [d for d in stages[name].get("depends_on", []) if d in stages]
+        previous = max(
+            (longest[d] for d in dependencies), key=lambda x: x[1], default=([], 0.0)
+        )
+        longest[name] = (previous[0] + [name], previous[1] + duration)
+
+    return max(longest.values(), key=lambda x: x[1], default=([], 0.0))
+
+
+async def run_stages(stages, results=None, max_workers=None, verbose=False):
+    """
+    Runs ETL stages as soon as the stages they depend on have completed.
+    Coroutine functions are awaited on the event loop, all other callables run in a thread pool,
+    so independent stages overlap and the wall clock is set by the critical path.
+
+    Args:
+        stages (dict): Mapping of stage name to a dict with:
+            - "run": Zero-argument callable or coroutine function executing the stage.
+            - "depends_on": Optional list of stage names that must complete first.
+        results (dict): Optional dict populated with each stage's return value as it completes,
+            allowing later stages to read the output of the stages they depend on.
+        max_workers (int): Maximum number of threads used for synchronous stages.
+        verbose (bool): Whether to print verbose output.
+
+    Returns:
+        dict: Mapping of stage name to {"status", "start", "end", "duration", "error"},
+            where times are seconds relative to the start of the run.
+    """
+    results = results if results is not None else {}
+    report = {}
+    tasks = {}
+    loop = asyncio.get_running_loop()
+    run_start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+
+        async def run_stage(name, stage):
+            dependencies = [d for d in stage.get("depends_on", []) if d in stages]
+            if dependencies:
+                await asyncio.gather(*(tasks[d] for d in dependencies))
+
+            failed = [d for d in dependencies if report[d]["status"] != "completed"]
+            if failed:
+                print(f"Skipping stage {name}: dependencies failed {failed}")
+                report[name] = {
+                    "status": "skipped",
+                    "start": None,
+                    "end": None,
+                    "duration": 0.0,
+                    "error": f"Failed dependencies: {failed}",
+                }
+                return
+
+            start = time.perf_counter() - run_start
+            if verbose:
+                print(f"Starting stage {name} at {start:.1f}s")
+
+            try:
+                if asyncio.iscoroutinefunction(stage["run"]):
+                    results[name] = await stage["run"]()
+                else:
+                    results[name] = await loop.run_in_executor(executor, stage["run"])
+                status, error = "completed", None
+            except Exception as e:
+                print(f"Stage {name} failed: {e}")
+                status, error = "failed", str(e)
+
+            end = time.perf_counter() - run_start
+            report[name] = {
+                "status": status,
+                "start": start,
+                "end": end,
+                "duration": end - start,
+                "error": error,
+            }
+
+            if verbose:
+                print(f"Finished stage {name} in {end - start:.1f}s ({status})")
+
+        for name in get_stage_order(stages):
+            tasks[name] = asyncio.create_task(run_stage(name, stages[name]))
+
+        await asyncio.gather(*tasks.values())
+
+    return report
+
+
+def print_stage_report(stages, report):
+    """
+    Prints per-stage timings, the critical path and the overall wall clock of a run.
+
+    Args:
+        stages (dict): Stages passed to run_stages.
+        report (dict): Stage report returned by run_stages.
+    """
+    print("\nETL stage timings:")
+    for name in get_stage_order(stages):
+        stage_report = report.get(name)
+        if not stage_report:
+            continue
+        if stage_report["start"] is None:
+            print(f"  {name:<28} {stage_report['status']:<10}")
+            continue
+        print(
+            f"  {name:<28} {stage_report['status']:<10} "
+            f"start {stage_report['start']:>8.1f}s  duration {stage_report['duration']:>8.1f}s"
+        )
+
+    critical_path, critical_duration = get_critical_path(stages, report)
+    wall_clock = max(
+        (r["end"] for r in report.values() if r["end"] is not None), default=0.0
+    )
+    total_duration = sum(r["duration"] for r in report.values())
+
+    print(f"Critical path: {' -> '.join(critical_path)} ({critical_duration:.1f}s)")
+    print(f"Wall clock: {wall_clock:.1f}s (sum of stages: {total_duration:.1f}s)")
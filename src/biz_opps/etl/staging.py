@@ -0,0 +1,193 @@
+# This module contains functions to stage transformed node and relationship tables as partitioned Parquet files.
+import json
+import os
+from datetime import datetime
+
+import pyarrow.parquet as pq
+
+from biz_opps.etl.transform import transform_components, validate_tables
+from biz_opps.utils.file import get_root_dir
+
+DEFAULT_STAGING_DIR = os.path.join(get_root_dir(), "data", "staging")
+
+# Maximum number of rows per Parquet part file
+PART_ROWS = 50000
+
+# Name of the file describing the tables of a staged run
+RUN_MANIFEST = "_run.json"
+
+
+def new_run_id():
+    """Create a run id from the current time, so run ids sort chronologically."""
+    return datetime.now().strftime("%Y%m%dT%H%M%S")
+
+
+def get_run_dir(run_id, staging_dir=DEFAULT_STAGING_DIR):
+    """
+    Get the directory of a staged run.
+
+    Args:
+        run_id: Run id, or "latest" for the most recent run
+        staging_dir: Directory containing the staged runs
+
+    Returns:
+        str: Directory of the run
+
+    Raises:
+        FileNotFoundError: If the run does not exist
+    """
+    if run_id == "latest":
+        runs = []
+        if os.path.isdir(staging_dir):
+            runs = sorted(
+                name
+                for name in os.listdir(staging_dir)
+                if os.path.isfile(os.path.join(staging_dir, name, RUN_MANIFEST))
+            )
+        if not runs:
+            raise FileNotFoundError(f"No staged runs found in {staging_dir}")
+        run_id = runs[-1]
+
+    run_dir = os.path.join(staging_dir, run_id)
+    if not os.path.isfile(os.path.join(run_dir, RUN_MANIFEST)):
+        raise FileNotFoundError(f"Staged run {run_id} not found in {staging_dir}")
+    return run_dir
+
+
+def _write_parts(run_dir, table_dir, df):
+    """Write a DataFrame as Parquet part files of at most PART_ROWS rows, return their relative paths."""
+    os.makedirs(os.path.join(run_dir, table_dir), exist_ok=True)
+    parts = []
+    for part, start in enumerate(range(0, len(df), PART_ROWS)):
+        path = os.path.join(table_dir, f"part-{part:05d}.parquet")
+        df.iloc[start : start + PART_ROWS].to_parquet(
+            os.path.join(run_dir, path), index=False
+        )
+        parts.append(path)
+    return parts
+
+
+def stage_tables(run_dir, component, tables):
+    """
+    Writes the node and relationship tables of a component as Parquet part files under
+    <component>/nodes/<label>/ and <component>/relationships/<start>_<TYPE>_<end>/ of the run.
+
+    Args:
+        run_dir: Directory of the staged run
+        component: Name of the component
+        tables: Node and relationship tables, see biz_opps.etl.tables
+
+    Returns:
+        list: Descriptions of the staged tables, recorded in the run manifest
+    """
+    staged = []
+    for table in tables["nodes"]:
+        if table["rows"].empty:
+            continue
+        table_dir = os.path.join(component, "nodes", table["label"])
+        staged.append(
+            {
+                "component": component,
+                "kind": "nodes",
+                "label": table["label"],
+                "rows": len(table["rows"]),
+                "parts": _write_parts(run_dir, table_dir, table["rows"]),
+            }
+        )
+        print(f"Staged {table['label']} nodes: {len(table['rows'])}")
+
+    for table in tables["relationships"]:
+        if table["rows"].empty:
+            continue
+        name = f"{table['start_label']}_{table['type']}_{table['end_label']}"
+        table_dir = os.path.join(component, "relationships", name)
+        staged.append(
+            {
+                "component": component,
+                "kind": "relationships",
+                "type": table["type"],
+                "start_label": table["start_label"],
+                "end_label": table["end_label"],
+                "rows": len(table["rows"]),
+                "parts": _write_parts(run_dir, table_dir, table["rows"]),
+            }
+        )
+        print(f"Staged {name} relationships: {len(table['rows'])}")
+
+    return staged
+
+
+def write_run_manifest(run_dir, run_id, components, staged):
+    """
+    Writes the manifest of a staged run. A run is only visible to loaders once its manifest exists.
+
+    Args:
+        run_dir: Directory of the staged run
+        run_id: Run id
+        components: Names of the staged components
+        staged: Table descriptions returned by stage_tables
+    """
+    manifest = {
+        "run_id": run_id,
+        "created_at": datetime.now().isoformat(),
+        "components": components,
+        "tables": staged,
+    }
+    with open(os.path.join(run_dir, RUN_MANIFEST), "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2)
+
+
+def read_run_manifest(run_dir):
+    """Read the manifest of a staged run."""
+    with open(os.path.join(run_dir, RUN_MANIFEST), encoding="utf-8") as file:
+        return json.load(file)
+
+
+def iter_batches(run_dir, part, batch_size):
+    """
+    Streams the rows of a Parquet part file without reading the whole file.
+
+    Args:
+        run_dir: Directory of the staged run
+        part: Path of the part file, relative to run_dir
+        batch_size: Number of rows per batch
+
+    Yields:
+        list: Rows as dicts, missing values are None
+    """
+    parquet_file = pq.ParquetFile(os.path.join(run_dir, part))
+    for batch in parquet_file.iter_batches(batch_size=batch_size):
+        yield batch.to_pylist()
+
+
+async def stage_components(
+    constraints, components, run_id=None, staging_dir=DEFAULT_STAGING_DIR, verbose=False
+):
+    """
+    Runs the extract and transform of the selected components and stages their validated tables,
+    so they can be loaded (and reloaded) without repeating the extract.
+
+    Args:
+        constraints: Constraints schema
+        components: Names of the components to stage
+        run_id: Optional run id, a new one is created if None
+        staging_dir: Directory containing the staged runs
+        verbose: Print verbose output
+
+    Returns:
+        str: Directory of the staged run
+    """
+    run_id = run_id or new_run_id()
+    run_dir = os.path.join(staging_dir, run_id)
+    os.makedirs(run_dir, exist_ok=True)
+
+    transformed = await transform_components(constraints, components, verbose=verbose)
+    staged = []
+    for component, tables in transformed.items():
+        staged.extend(
+            stage_tables(run_dir, component, validate_tables(tables, constraints))
+        )
+
+    write_run_manifest(run_dir, run_id, list(transformed.keys()), staged)
+    print(f"Staged run {run_id} written to {run_dir}")
+    return run_dir
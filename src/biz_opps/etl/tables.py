@@ -0,0 +1,97 @@
+# This module contains the node and relationship tables produced by the ETL transforms for bulk loading.
+import pandas as pd
+
+from biz_opps.neo4j.validation import get_valid_rows, validate_frame
+
+
+def node_table(label, rows):
+    """
+    Creates a table of nodes sharing a label.
+
+    Args:
+        label (str): Node label
+        rows (list): Node properties, one dict per node
+
+    Returns:
+        dict: {"label", "rows": pd.DataFrame with one column per property}
+    """
+    return {"label": label, "rows": pd.DataFrame(rows)}
+
+
+def relationship_table(rel_type, start_label, end_label, rows):
+    """
+    Creates a table of relationships sharing a type, start label and end label.
+    Like MERGE, only the last relationship between the same two nodes is kept.
+
+    Args:
+        rel_type (str): Relationship type
+        start_label (str): Label of the start nodes
+        end_label (str): Label of the end nodes
+        rows (list): Dicts with the "start" and "end" node key properties and optional relationship "properties"
+
+    Returns:
+        dict: {"type", "start_label", "end_label", "rows": pd.DataFrame with "start.<key>" and
+            "end.<key>" columns for the node keys and one column per relationship property}
+    """
+    flat_rows = [
+        {
+            **{f"start.{key}": value for key, value in row["start"].items()},
+            **{f"end.{key}": value for key, value in row["end"].items()},
+            **(row.get("properties") or {}),
+        }
+        for row in rows
+    ]
+    df = pd.DataFrame(flat_rows)
+    if not df.empty:
+        key_columns = get_key_columns(df, "start") + get_key_columns(df, "end")
+        df = df.drop_duplicates(subset=key_columns, keep="last").reset_index(drop=True)
+
+    return {
+        "type": rel_type,
+        "start_label": start_label,
+        "end_label": end_label,
+        "rows": df,
+    }
+
+
+def get_key_columns(df, side):
+    """Get the node key columns ("start.<key>" or "end.<key>") of a relationship table DataFrame."""
+    return [column for column in df.columns if column.startswith(f"{side}.")]
+
+
+def get_property_columns(df):
+    """Get the relationship property columns of a relationship table DataFrame."""
+    return [
+        column
+        for column in df.columns
+        if not column.startswith("start.") and not column.startswith("end.")
+    ]
+
+
+def empty_tables():
+    """Create an empty collection of node and relationship tables."""
+    return {"nodes": [], "relationships": []}
+
+
+def merge_tables(tables, other):
+    """Add the node and relationship tables of other to tables."""
+    tables["nodes"].extend(other["nodes"])
+    tables["relationships"].extend(other["relationships"])
+    return tables
+
+
+def validate_node_table(table, constraints):
+    """
+    Validates all nodes of a table against the constraints at once.
+
+    Args:
+        table (dict): Node table
+        constraints (dict): Constraints schema
+
+    Returns:
+        tuple: (node table with the valid nodes only, failures DataFrame of validate_frame
+            with a "label" column)
+    """
+    failures = validate_frame(table["rows"], table["label"], constraints)
+    valid_rows = get_valid_rows(table["rows"], failures)
+    return {**table, "rows": valid_rows}, failures.assign(label=table["label"])
@@ -0,0 +1,103 @@
+# This module contains functions to extract and transform the ETL components into node and relationship tables.
+from biz_opps.etl.administrative_topology import (
+    get_administrative_topology_data,
+    get_zipcode_properties,
+    transform_administrative_topology,
+)
+from biz_opps.etl.block_groups import get_block_group_data, transform_block_groups
+from biz_opps.etl.businesses import (
+    get_block_group_geometry,
+    harvest_businesses,
+    transform_businesses,
+)
+from biz_opps.etl.geoenrichment import get_geoenrichment_data, transform_geoenrichments
+from biz_opps.etl.tables import validate_node_table
+
+
+async def transform_components(constraints, components, verbose=False):
+    """
+    Runs the extract and transform of the selected components without writing to Neo4j.
+    Relationships that are computed with the spatial layers during a live load (BlockGroup and
+    Business zipcodes) are computed locally with Shapely.
+
+    Args:
+        constraints: Constraints schema
+        components: Names of the components to transform
+        verbose: Print verbose output
+
+    Returns:
+        dict: Mapping of component to its node and relationship tables, see biz_opps.etl.tables
+    """
+    transformed = {}
+
+    # BlockGroups and Zipcodes are also read by the components linked to them
+    block_group_properties = []
+    if {"block_groups", "administrative_topology", "businesses"} & set(components):
+        print("Transforming BlockGroups...")
+        block_group_tables = transform_block_groups(get_block_group_data())
+        block_group_properties = block_group_tables["nodes"][0]["rows"].to_dict(
+            "records"
+        )
+        if "block_groups" in components:
+            transformed["block_groups"] = block_group_tables
+
+    zipcode_properties = None
+    if {"administrative_topology", "businesses"} & set(components):
+        zipcode_df, city_df, neighborhood_df = get_administrative_topology_data()
+        zipcode_properties = get_zipcode_properties(
+            zipcode_df, city_df, neighborhood_df
+        )
+        if "administrative_topology" in components:
+            print("Transforming Administrative Topology...")
+            transformed["administrative_topology"] = transform_administrative_topology(
+                zipcode_df, city_df, neighborhood_df, block_group_properties
+            )
+
+    if "geoenrichments" in components:
+        print("Transforming Geoenrichments...")
+        transformed["geoenrichments"] = transform_geoenrichments(
+            get_geoenrichment_data(), constraints
+        )
+
+    if "businesses" in components:
+        block_groups = {
+            properties["ct_block_group"]: get_block_group_geometry(properties["wkt"])
+            for properties in block_group_properties
+        }
+        harvested = await harvest_businesses(
+            None, verbose=verbose, block_groups=block_groups
+        )
+        print("Transforming Businesses...")
+        transformed["businesses"] = transform_businesses(harvested, zipcode_properties)
+
+    return transformed
+
+
+def validate_tables(tables, constraints):
+    """
+    Validates the node tables of a component, dropping and printing invalid nodes.
+
+    Args:
+        tables: Node and relationship tables
+        constraints: Constraints schema
+
+    Returns:
+        dict: Node and relationship tables with the valid nodes only
+    """
+    node_tables = []
+    for table in tables["nodes"]:
+        valid_table, failures = validate_node_table(table, constraints)
+        node_tables.append(valid_table)
+
+        if not failures.empty:
+            failed_count = len(table["rows"]) - len(valid_table["rows"])
+            print(f"{table['label']} nodes failing validation: {failed_count}")
+            print("\nValidation Failures:")
+            print(
+                failures.groupby(["property", "reason"])["row"]
+                .agg(["count", "first"])
+                .rename(columns={"first": "first_row"})
+                .to_string()
+            )
+
+    return {**tables, "nodes": node_tables}
@@ -15,12 +15,16 @@ def cleanup_neo4j(
     Args:
         driver (neo4j.Driver): Neo4j driver object.
         constraints (dict): Constraints for data validation.
-        nodes (list): Optional list of node labels to delete.
-        spatial_layers (list): Optional list of spatial layer labels to delete.
+        nodes (list): Optional list of node labels to delete. If None, all node labels are deleted.
+        spatial_layers (list): Optional list of spatial layer labels to delete. If None, all layers are deleted.
     """
     print("Cleaning up Neo4j...")
-    node_labels = nodes or list(constraints["nodes"].keys())
-    spatial_layer_labels = spatial_layers or list(constraints["spatial_layers"].keys())
+    node_labels = nodes if nodes is not None else list(constraints["nodes"].keys())
+    spatial_layer_labels = (
+        spatial_layers
+        if spatial_layers is not None
+        else list(constraints["spatial_layers"].keys())
+    )
     with driver.session() as session:
         # Delete constraints
         delete_all_constraints(session, constraints)
@@ -1,21 +1,26 @@
-from biz_opps.neo4j.helpers import get_neo4j_driver
-from biz_opps.utils.file import load_json, get_root_dir
+from biz_opps.neo4j.schema_registry import (
+    get_constraints_schema_path,
+    get_index_specs,
+    get_schema_registry,
+)
 
-CONSTRAINTS_SCHEMA_PATH = f"{get_root_dir()}/configs/constraints_schema.json"
+
+def __getattr__(name):
+    # The schema path is resolved on first use rather than when the module is imported
+    if name == "CONSTRAINTS_SCHEMA_PATH":
+        return get_constraints_schema_path()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def load_constraints():
     """
-    Loads constraints from a JSON file.
-
-    Args:
-        json_path (str): Path to the JSON file containing constraints.
+    Loads constraints from the shared schema registry, parsing the JSON file only when it changed.
+    The returned dict is shared by every caller and must not be modified.
 
     Returns:
         dict: The parsed JSON containing node definitions and constraints.
     """
-    constraints = load_json(CONSTRAINTS_SCHEMA_PATH)
-    return constraints
+    return get_schema_registry().get()
 
 
 # ------------------------------ CONSTRAINTS CREATION ----------------------------------
@@ -63,30 +68,14 @@ def create_constraints(session, constraints):
     Returns:
         None: Iterates through the constraints and applies them to the database.
     """
-    nodes = constraints.get("nodes", {})
-    relationships = constraints.get("relationships", {})
-
-    for label, node_schema in nodes.items():
-        node_properties = node_schema.get("properties", {})
-        for property_name, property_constraints in node_properties.items():
-            if "unique" in property_constraints:
-                constraint_name = property_constraints["unique"]["constraint_name"]
-                create_uniqueness_constraint(
-                    session, label, constraint_name, property_name
-                )
-
-    for rel_type, rel_schema in relationships.items():
-        rel_properties = rel_schema.get("properties", {})
-        for property_name, property_constraints in rel_properties.items():
-            if "unique" in property_constraints:
-                constraint_name = property_constraints["unique"]["constraint_name"]
-                create_uniqueness_constraint(
-                    session,
-                    rel_type,
-                    constraint_name,
-                    property_name,
-                    is_relationship=True,
-                )
+    for spec in get_index_specs(constraints):
+        create_uniqueness_constraint(
+            session,
+            spec["label_or_rel_type"],
+            spec["constraint_name"],
+            spec["property_name"],
+            is_relationship=spec["is_relationship"],
+        )
 
     print("Constraints creation complete.")
 
@@ -119,21 +108,7 @@ def delete_all_constraints(session, constraints):
         constraints (dict): Dictionary with "nodes" and "relationships" keys, each containing definitions
                             and property-level constraints (e.g., uniqueness, existence, type).
     """
-    nodes = constraints.get("nodes", {})
-    relationships = constraints.get("relationships", {})
-
-    for _, node_schema in nodes.items():
-        node_properties = node_schema.get("properties", {})
-        for _, property_constraints in node_properties.items():
-            if "unique" in property_constraints:
-                constraint_name = property_constraints["unique"]["constraint_name"]
-                delete_constraint(session, constraint_name)
-
-    for _, rel_schema in relationships.items():
-        rel_properties = rel_schema.get("properties", {})
-        for _, property_constraints in rel_properties.items():
-            if "unique" in property_constraints:
-                constraint_name = property_constraints["unique"]["constraint_name"]
-                delete_constraint(session, constraint_name)
+    for spec in get_index_specs(constraints):
+        delete_constraint(session, spec["constraint_name"])
 
     print("Constraints deletion complete.")
@@ -0,0 +1,74 @@
+# This module contains the graph version stamp, bumped by the ETL whenever it writes to the graph.
+import json
+import os
+import threading
+import uuid
+from datetime import datetime
+
+from biz_opps.utils.file import get_root_dir
+
+DEFAULT_VERSION_PATH = os.path.join(get_root_dir(), "data", "graph_version.json")
+
+# Version of a graph that was never stamped by the ETL
+INITIAL_VERSION = "initial"
+
+_lock = threading.Lock()
+# Last read stamp per path, as (mtime, version)
+_read_versions = {}
+
+
+def bump_graph_version(reason, path=DEFAULT_VERSION_PATH):
+    """
+    Stamps the graph with a new version, invalidating everything cached for the previous one.
+
+    Args:
+        reason: What was written, recorded with the stamp
+        path: Path of the version file
+
+    Returns:
+        str: The new version
+    """
+    version = uuid.uuid4().hex[:12]
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # Replace the file atomically so readers never see a partial stamp
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(
+            {
+                "version": version,
+                "updated_at": datetime.now().isoformat(),
+                "reason": reason,
+            },
+            file,
+        )
+    os.replace(temp_path, path)
+
+    print(f"Graph version bumped to {version} ({reason})")
+    return version
+
+
+def get_graph_version(path=DEFAULT_VERSION_PATH):
+    """
+    Get the current graph version. The file is only read again when its mtime changes.
+
+    Args:
+        path: Path of the version file
+
+    Returns:
+        str: The current version
+    """
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return INITIAL_VERSION
+
+    with _lock:
+        cached = _read_versions.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        with open(path, encoding="utf-8") as file:
+            version = json.load(file)["version"]
+        _read_versions[path] = (mtime, version)
+        return version
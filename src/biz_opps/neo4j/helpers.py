@@ -1,5 +1,5 @@
 # Module containing helper functions that do not fit into other categories.
-from neo4j import GraphDatabase
+from neo4j import AsyncGraphDatabase, GraphDatabase
 import os
 
 # Define connection parameters for Neo4
@@ -7,6 +7,9 @@ NEO4J_URI = os.getenv("NEO4J_URI")
 NEO4J_USER = os.getenv("NEO4J_USER")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
 
+# Maximum number of connections kept open by the async driver
+NEO4J_MAX_CONNECTION_POOL_SIZE = int(os.getenv("NEO4J_MAX_CONNECTION_POOL_SIZE", "50"))
+
 # ------------------------------ CONNECTION FUNCTIONS ---------------------------------
 
 
@@ -31,3 +34,29 @@ def get_neo4j_driver():
     except Exception as error:
         print(f"Error connecting to Neo4j: {error}")
         return None
+
+
+async def get_neo4j_async_driver():
+    """
+    Establishes an async connection to the Neo4j database and returns the driver. Its sessions share
+    a pool of connections on the running event loop, so it must be created and closed inside it.
+
+    Returns:
+        An async Neo4j driver object to create sessions and execute queries.
+    """
+    try:
+        # Initialize driver for Neo4j connection
+        driver = AsyncGraphDatabase.driver(
+            NEO4J_URI,
+            auth=(NEO4J_USER, NEO4J_PASSWORD),
+            max_connection_pool_size=NEO4J_MAX_CONNECTION_POOL_SIZE,
+        )
+
+        # Verify the connection
+        await driver.verify_connectivity()
+        print("Connected to Neo4j database successfully.")
+
+        return driver
+    except Exception as error:
+        print(f"Error connecting to Neo4j: {error}")
+        return None
@@ -0,0 +1,329 @@
+# This module contains the process-wide registry of the constraints schema and the views derived from it.
+import hashlib
+import json
+import os
+import threading
+
+from biz_opps.utils.file import get_root_dir
+
+
+def get_constraints_schema_path():
+    """Get the path of the constraints schema of the repository."""
+    return os.path.join(get_root_dir(), "configs", "constraints_schema.json")
+
+
+# ------------------------------ DERIVED VIEWS ----------------------------------
+
+
+def get_node_keys(schema, label):
+    """
+    Get the properties identifying nodes of a label: its first unique property, or all of its
+    properties for categorical nodes without a unique property (e.g. enrichment nodes).
+
+    Args:
+        schema (dict): Constraints schema
+        label (str): Node label
+
+    Returns:
+        list: Property names
+    """
+    properties = schema["nodes"][label]["properties"]
+    unique_properties = [name for name, prop in properties.items() if "unique" in prop]
+    return unique_properties[:1] or list(properties.keys())
+
+
+def get_enum_sets(schema):
+    """
+    Get the allowed values of every enum property.
+
+    Args:
+        schema (dict): Constraints schema
+
+    Returns:
+        dict: {"nodes": {label: {property: frozenset}}, "relationships": {rel_type: {...}}}
+    """
+    return {
+        section: {
+            name: {
+                prop: frozenset(details["enum"])
+                for prop, details in definition.get("properties", {}).items()
+                if "enum" in details
+            }
+            for name, definition in schema.get(section, {}).items()
+        }
+        for section in ["nodes", "relationships"]
+    }
+
+
+def get_index_specs(schema):
+    """
+    Get the uniqueness constraints declared by the schema.
+
+    Args:
+        schema (dict): Constraints schema
+
+    Returns:
+        list: Dicts with "label_or_rel_type", "property_name", "constraint_name" and "is_relationship"
+    """
+    specs = []
+    for section, is_relationship in [("nodes", False), ("relationships", True)]:
+        for name, definition in schema.get(section, {}).items():
+            for property_name, details in definition.get("properties", {}).items():
+                if "unique" in details:
+                    specs.append(
+                        {
+                            "label_or_rel_type": name,
+                            "property_name": property_name,
+                            "constraint_name": details["unique"]["constraint_name"],
+                            "is_relationship": is_relationship,
+                        }
+                    )
+    return specs
+
+
+def get_geometry_properties(schema):
+    """
+    Get the properties holding WKT geometries of the spatial layers.
+
+    Args:
+        schema (dict): Constraints schema
+
+    Returns:
+        dict: {label: property name}
+    """
+    return {
+        label: layer["geomencoder_config"]
+        for layer in schema.get("spatial_layers", {}).values()
+        if layer.get("geomencoder", "").endswith("WKTGeometryEncoder")
+        for label in layer["nodes"]
+    }
+
+
+def get_schema_fragments(schema):
+    """
+    Split the LLM context of the schema into one fragment per node label, relationship type and
+    spatial layer, so prompts can include only some of them.
+
+    Args:
+        schema (dict): Constraints schema
+
+    Returns:
+        list: Dicts with the "section" ("nodes", "relationships" or "spatial_layers"), "name",
+            "labels" it refers to and formatted "text", in schema order
+    """
+    fragments = []
+
+    # Node labels and properties
+    for label, info in schema["nodes"].items():
+        lines = [f"\n{label}:"]
+        for prop, details in info["properties"].items():
+            prop_info = f"  - {prop} ({details['type']})"
+            if "enum" in details:
+                prop_info += f": {', '.join(details['enum'])}"
+            lines.append(prop_info)
+        fragments.append(
+            {
+                "section": "nodes",
+                "name": label,
+                "labels": [label],
+                "text": "\n".join(lines),
+            }
+        )
+
+    # Relationships with explicit direction
+    for rel_type, info in schema["relationships"].items():
+        lines = [f"\n{rel_type}:"]
+        if "properties" in info:
+            lines.append("  Properties:")
+            for prop, details in info["properties"].items():
+                lines.append(f"    - {prop} ({details['type']})")
+        lines.append("  Valid Directions:")
+        labels = []
+        for start, ends in info["mappings"].items():
+            for end in ends:
+                lines.append(f"    - ({start})-[:{rel_type}]->({end})")
+                labels.extend(label for label in (start, end) if label not in labels)
+        fragments.append(
+            {
+                "section": "relationships",
+                "name": rel_type,
+                "labels": labels,
+                "text": "\n".join(lines),
+            }
+        )
+
+    # Spatial layers
+    for layer, info in schema.get("spatial_layers", {}).items():
+        lines = [
+            f"\n{layer}:",
+            f"  Nodes: {', '.join(info['nodes'])}",
+            f"  Type: {info['layer_class']}",
+        ]
+        fragments.append(
+            {
+                "section": "spatial_layers",
+                "name": layer,
+                "labels": list(info["nodes"]),
+                "text": "\n".join(lines),
+            }
+        )
+
+    return fragments
+
+
+# Headers of the schema context sections
+SCHEMA_SECTION_HEADERS = {
+    "nodes": "Node Labels and Properties:",
+    "relationships": "\nRelationship Types and Directions:",
+    "spatial_layers": "\nSpatial Layers:",
+}
+
+
+def join_schema_fragments(fragments):
+    """
+    Join schema fragments into LLM context under their section headers.
+
+    Args:
+        fragments (list): Fragments returned by get_schema_fragments, in schema order
+
+    Returns:
+        str: Schema context
+    """
+    context = []
+    for section, header in SCHEMA_SECTION_HEADERS.items():
+        section_fragments = [
+            fragment["text"] for fragment in fragments if fragment["section"] == section
+        ]
+        # The relationships header is always present, like in the full context
+        if section_fragments or section == "relationships":
+            context.append(header)
+            context.extend(section_fragments)
+    return "\n".join(context)
+
+
+def format_schema_context(schema):
+    """
+    Format the schema as LLM context.
+
+    Args:
+        schema (dict): Constraints schema
+
+    Returns:
+        str: Node labels, relationship directions and spatial layers of the schema
+    """
+    return join_schema_fragments(get_schema_fragments(schema))
+
+
+# ------------------------------ REGISTRY ----------------------------------
+
+
+class SchemaRegistry:
+    """
+    Parses a constraints schema once and memoizes the views derived from it. The schema and its
+    views are reloaded when the file's modification time changes.
+    """
+
+    def __init__(self, path: str = None):
+        """
+        Args:
+            path: Path of the constraints schema, the repository schema if None.
+        """
+        self.path = path or get_constraints_schema_path()
+        self._lock = threading.RLock()
+        self._mtime = None
+        self._schema = None
+        self._version = None
+        self._views = {}
+
+    def _refresh(self):
+        """Reload the schema if the file changed since it was loaded."""
+        mtime = os.stat(self.path).st_mtime_ns
+        if mtime == self._mtime:
+            return
+
+        with open(self.path, "rb") as file:
+            content = file.read()
+        self._schema = json.loads(content)
+        self._version = hashlib.sha1(content).hexdigest()[:12]
+        self._views = {}
+        self._mtime = mtime
+
+    def get(self) -> dict:
+        """Get the parsed schema. The same object is returned until the file changes."""
+        with self._lock:
+            self._refresh()
+            return self._schema
+
+    @property
+    def version(self) -> str:
+        """Short hash of the schema file contents, changes whenever the schema does."""
+        with self._lock:
+            self._refresh()
+            return self._version
+
+    def view(self, name, derive):
+        """
+        Get a view derived from the schema, deriving it once per schema version.
+
+        Args:
+            name: Name of the view
+            derive: Function deriving the view from the schema
+
+        Returns:
+            The derived view
+        """
+        with self._lock:
+            self._refresh()
+            if name not in self._views:
+                self._views[name] = derive(self._schema)
+            return self._views[name]
+
+    def node_keys(self) -> dict:
+        """Get the key properties of every node label, see get_node_keys."""
+        return self.view(
+            "node_keys",
+            lambda schema: {
+                label: get_node_keys(schema, label) for label in schema["nodes"]
+            },
+        )
+
+    def enum_sets(self) -> dict:
+        """Get the allowed values of every enum property, see get_enum_sets."""
+        return self.view("enum_sets", get_enum_sets)
+
+    def index_specs(self) -> list:
+        """Get the uniqueness constraints declared by the schema, see get_index_specs."""
+        return self.view("index_specs", get_index_specs)
+
+    def geometry_properties(self) -> dict:
+        """Get the WKT geometry property of every spatial label, see get_geometry_properties."""
+        return self.view("geometry_properties", get_geometry_properties)
+
+    def schema_fragments(self) -> list:
+        """Get the LLM context fragments of the schema, see get_schema_fragments."""
+        return self.view("schema_fragments", get_schema_fragments)
+
+    def formatted_context(self) -> str:
+        """Get the schema formatted as LLM context, see format_schema_context."""
+        return self.view("formatted_context", format_schema_context)
+
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def get_schema_registry(path: str = None) -> SchemaRegistry:
+    """
+    Get the registry of a constraints schema, shared by the whole process.
+
+    Args:
+        path: Path of the constraints schema, the repository schema if None.
+
+    Returns:
+        SchemaRegistry: The registry of the schema
+    """
+    path = os.path.abspath(path or get_constraints_schema_path())
+    with _registries_lock:
+        if path not in _registries:
+            _registries[path] = SchemaRegistry(path)
+        return _registries[path]
@@ -94,6 +94,80 @@ def add_node_to_spatial_layer(session, node, layer_name):
         return False
 
 
+def add_label_to_spatial_layer(
+    session, layer_name, label, geometry_properties, batch_size=10000
+):
+    """
+    Add all nodes of a label that are not yet in a spatial layer, in batches.
+    Used to index nodes written without the spatial procedures, e.g. by neo4j-admin import.
+
+    Args:
+        session: Neo4j session
+        layer_name: Name of the layer
+        label: Label of the nodes to add
+        geometry_properties: Properties the layer reads the geometry from, nodes missing one are skipped
+        batch_size: Number of nodes added per transaction
+
+    Returns:
+        int: Number of nodes added
+    """
+    has_geometry = " AND ".join(f"n.{prop} IS NOT NULL" for prop in geometry_properties)
+    query = f"""
+    MATCH (n:{label})
+    WHERE NOT (n)<-[:RTREE_REFERENCE]-() AND {has_geometry}
+    WITH n LIMIT $batch_size
+    WITH collect(n) AS nodes
+    CALL spatial.addNodes($layer_name, nodes) YIELD count
+    RETURN count
+    """
+    added = 0
+    try:
+        while True:
+            result = session.run(
+                query, {"layer_name": layer_name, "batch_size": batch_size}
+            )
+            count = result.single()["count"]
+            added += count
+            # A partial batch means no nodes are left, stopping also guards against nodes
+            # that the layer fails to add being selected again
+            if count < batch_size:
+                break
+        print(f"Added {added} {label} nodes to spatial layer {layer_name}")
+    except Exception as e:
+        print(f"Failed to add {label} nodes to spatial layer {layer_name}: {e}")
+    return added
+
+
+def remove_nodes_from_spatial_layer(session, layer_name, label, properties, match_keys):
+    """
+    Remove nodes from a specified spatial layer, e.g. before their geometry is updated.
+
+    Args:
+        session: Neo4j session
+        layer_name: Name of the layer
+        label: Label of the nodes to remove
+        properties: Node properties to identify the nodes
+        match_keys: List of property names to use for matching
+    """
+    try:
+        match_str = ", ".join(f"{k}: ${k}" for k in match_keys)
+        query = f"""
+        MATCH (n:{label} {{{match_str}}})
+        WHERE (n)<-[:RTREE_REFERENCE]-()
+        CALL spatial.removeNode($layer_name, n)
+        YIELD nodeId
+        RETURN count(nodeId) as count
+        """
+        session.run(
+            query,
+            {"layer_name": layer_name, **{k: properties[k] for k in match_keys}},
+        )
+        return True
+    except Exception as e:
+        print(f"Failed to remove node from spatial layer {layer_name}: {e}")
+        return False
+
+
 def remove_spatial_layer(session, layer_name):
     query = """
     CALL spatial.removeLayer($layer_name)
@@ -1,4 +1,6 @@
 # Module containing functions to validate data before inserting into Neo4j.
+import pandas as pd
+
 from biz_opps.neo4j.constraints import load_constraints
 
 VALIDATORS = {
@@ -80,6 +82,132 @@ def validate_property(node_or_rel_data, property_name, property_constraints):
             )
 
 
+# ------------------------------ COMPILED VALIDATORS ---------------------------------
+
+# Compiled validators per constraints object and kind, see get_validators. load_constraints returns
+# the object shared by the schema registry, so validators are compiled once per schema version.
+_compiled_validators = {}
+
+
+def _compile_property_checks(schema):
+    """
+    Freezes the checks of each property of a label or relationship type schema.
+
+    Returns:
+        tuple: (property name, exists, type name, type check, enum set, min, max) per property
+            that has at least one check
+    """
+    checks = []
+    for property_name, property_constraints in schema["properties"].items():
+        exists = bool(property_constraints.get("exists"))
+        property_type = property_constraints.get("type")
+        enum = property_constraints.get("enum")
+        numeric_range = property_constraints.get("range") or {}
+
+        type_check = None
+        if property_type and property_type.upper() != "ENUM":
+            type_check = VALIDATORS.get(property_type.upper(), lambda x: False)
+
+        check = (
+            property_name,
+            exists,
+            property_type,
+            type_check,
+            frozenset(enum) if enum else None,
+            numeric_range.get("min"),
+            numeric_range.get("max"),
+        )
+        if exists or any(value is not None for value in check[3:]):
+            checks.append(check)
+
+    return tuple(checks)
+
+
+def compile_validator(schema):
+    """
+    Compiles the schema of a label or relationship type into a single validation function,
+    so validating a node does not walk the constraints or rebuild key sets.
+
+    Args:
+        schema (dict): The label or relationship type schema, with its "properties".
+
+    Returns:
+        function: Validates a properties dict, raising ValueError or TypeError like validate_property.
+    """
+    schema_property_keys = frozenset(schema["properties"].keys())
+    required_property_keys = frozenset(
+        key for key, value in schema["properties"].items() if value.get("exists")
+    )
+    checks = _compile_property_checks(schema)
+
+    def validate(properties):
+        # Check for extra properties in the data that are not in the schema
+        extra_properties = properties.keys() - schema_property_keys
+        if extra_properties:
+            raise ValueError(f"Extra properties found in data: {extra_properties}")
+
+        # Check for missing properties that are required by the schema
+        missing_properties = required_property_keys - properties.keys()
+        if missing_properties:
+            raise ValueError(f"Missing required properties: {missing_properties}")
+
+        # Validate each property against its constraints
+        for name, exists, type_name, type_check, enum, min_value, max_value in checks:
+            value = properties.get(name)
+            if value is None:
+                if exists:
+                    raise ValueError(f"Property '{name}' must exist but is missing.")
+                continue
+            if type_check and not type_check(value):
+                raise TypeError(
+                    f"Property '{name}' must be of type {type_name}, but got {type(value)}."
+                )
+            if enum is not None and value not in enum:
+                raise ValueError(
+                    f"Property '{name}' must be one of {sorted(enum)}, but got {value}."
+                )
+            if min_value is not None and value < min_value:
+                raise ValueError(
+                    f"Property '{name}' must be greater than or equal to {min_value}."
+                )
+            if max_value is not None and value > max_value:
+                raise ValueError(
+                    f"Property '{name}' must be less than or equal to {max_value}."
+                )
+
+    return validate
+
+
+def get_validators(constraints, frames=False):
+    """
+    Get the compiled validators of every label and relationship type, compiling them once per
+    constraints object.
+
+    Args:
+        constraints (dict): The constraints from the JSON configuration.
+        frames (bool): Whether to get the DataFrame validators of compile_frame_validator.
+
+    Returns:
+        dict: {"nodes": {label: validator}, "relationships": {rel_type: validator}}
+    """
+    cache_key = (id(constraints), frames)
+    cached = _compiled_validators.get(cache_key)
+    # The constraints are kept with their validators so their id cannot be reused
+    if cached is not None and cached[0] is constraints:
+        return cached[1]
+
+    compile_schema = compile_frame_validator if frames else compile_validator
+    validators = {
+        section: {
+            name: compile_schema(schema)
+            for name, schema in constraints.get(section, {}).items()
+        }
+        for section in ["nodes", "relationships"]
+    }
+    _compiled_validators[cache_key] = (constraints, validators)
+    return validators
+
+
 def validate_data(node_or_rel_data, constraints, is_relationship=False):
     """
     Validates the properties of a node or relationship before inserting them into Neo4j during the ETL process.
@@ -93,29 +221,158 @@ def validate_data(node_or_rel_data, constraints, is_relationship=False):
         None: Raises an exception if validation fails, otherwise returns successfully.
     """
     label = node_or_rel_data["label"]
-    node_or_rel_constraints = constraints.get(
+    validator = get_validators(constraints)[
         "nodes" if not is_relationship else "relationships"
-    ).get(label, None)
+    ].get(label, None)
 
-    if not node_or_rel_constraints:
+    if not validator:
         raise ValueError(f"No constraints found for label '{label}'.")
 
-    # Check for extra properties in the data that are not in the schema
-    node_or_rel_property_keys = set(node_or_rel_data["properties"].keys())
-    schema_property_keys = set(node_or_rel_constraints["properties"].keys())
-    extra_properties = node_or_rel_property_keys - schema_property_keys
-    if extra_properties:
-        raise ValueError(f"Extra properties found in data: {extra_properties}")
-
-    # Check for missing properties that are required by the schema
-    missing_properties = {
-        key
-        for key, value in node_or_rel_constraints.items()
-        if value.get("exists") and key not in node_or_rel_data["properties"]
-    }
-    if missing_properties:
-        raise ValueError(f"Missing required properties: {missing_properties}")
+    validator(node_or_rel_data["properties"])
+
+
+# ------------------------------ FRAME VALIDATION ---------------------------------
 
-    # Validate each property against its constraints
-    for property_name, property_constraints in node_or_rel_constraints.items():
-        validate_property(node_or_rel_data, property_name, property_constraints)
+# Vectorized type checks of DataFrame columns, object columns are checked per value
+FRAME_TYPE_CHECKS = {
+    "STRING": lambda col: (
+        col.map(VALIDATORS["STRING"]).astype(bool)
+        if col.dtype == object
+        else pd.Series(pd.api.types.is_string_dtype(col), index=col.index)
+    ),
+    "INTEGER": lambda col: (
+        col.map(VALIDATORS["INTEGER"]).astype(bool)
+        if col.dtype == object
+        else pd.Series(pd.api.types.is_integer_dtype(col), index=col.index)
+    ),
+    "FLOAT": lambda col: (
+        col.map(VALIDATORS["FLOAT"]).astype(bool)
+        if col.dtype == object
+        else pd.Series(pd.api.types.is_numeric_dtype(col), index=col.index)
+    ),
+    "BOOLEAN": lambda col: (
+        col.map(VALIDATORS["BOOLEAN"]).astype(bool)
+        if col.dtype == object
+        else pd.Series(pd.api.types.is_bool_dtype(col), index=col.index)
+    ),
+}
+
+
+# Columns of the failure table returned by validate_frame
+FAILURE_COLUMNS = ["row", "property", "reason"]
+
+
+def compile_frame_validator(schema):
+    """
+    Compiles the schema of a label or relationship type into a function validating whole
+    DataFrames with column masks, treating missing values (None or NaN) as absent properties.
+
+    Args:
+        schema (dict): The label or relationship type schema, with its "properties".
+
+    Returns:
+        function: Takes a DataFrame with one column per property and returns its failures,
+            see validate_frame.
+    """
+    schema_property_keys = frozenset(schema["properties"].keys())
+    checks = _compile_property_checks(schema)
+
+    def validate(df):
+        failures = []
+
+        def fail(name, mask, reason):
+            if mask.any():
+                failures.append(
+                    pd.DataFrame(
+                        {
+                            "row": df.index[mask.to_numpy()],
+                            "property": name,
+                            "reason": reason,
+                        }
+                    )
+                )
+
+        # Values of extra properties are failures
+        for column in sorted(set(df.columns) - schema_property_keys):
+            fail(column, df[column].notna(), "not in schema")
+
+        for name, exists, type_name, _, enum, min_value, max_value in checks:
+            if name not in df.columns:
+                if exists:
+                    fail(name, pd.Series(True, index=df.index), "missing")
+                continue
+
+            col = df[name]
+            present = col.notna()
+            if exists:
+                fail(name, ~present, "missing")
+
+            # Each value only reports its first failing check
+            checked = present
+            if type_name and type_name.upper() != "ENUM":
+                type_check = FRAME_TYPE_CHECKS.get(type_name.upper())
+                if type_check:
+                    type_valid = type_check(col)
+                else:
+                    type_valid = pd.Series(False, index=df.index)
+                fail(name, checked & ~type_valid, f"not of type {type_name}")
+                checked = checked & type_valid
+            if enum is not None:
+                enum_valid = col.isin(enum)
+                fail(name, checked & ~enum_valid, "not in enum")
+                checked = checked & enum_valid
+            if min_value is not None or max_value is not None:
+                numeric = pd.to_numeric(col.where(checked), errors="coerce")
+                if min_value is not None:
+                    fail(name, checked & (numeric < min_value), f"below {min_value}")
+                if max_value is not None:
+                    fail(name, checked & (numeric > max_value), f"above {max_value}")
+
+        if not failures:
+            return pd.DataFrame(columns=FAILURE_COLUMNS)
+        return pd.concat(failures, ignore_index=True)
+
+    return validate
+
+
+def validate_frame(df, label, constraints=None, is_relationship=False):
+    """
+    Validates every row of a DataFrame of node or relationship properties at once, checking
+    existence, type, enum membership and numeric range column by column.
+
+    Args:
+        df (pd.DataFrame): One row per node or relationship, one column per property.
+        label (str): The node label or relationship type.
+        constraints (dict): The constraints from the JSON configuration, the schema registry's
+            if None.
+        is_relationship (bool): Whether the rows are relationships (default is False for nodes).
+
+    Returns:
+        pd.DataFrame: One row per failing value, with the "row" index label, the "property" and
+            the "reason" it failed. Empty if all rows are valid.
+    """
+    if constraints is None:
+        constraints = load_constraints()
+
+    validator = get_validators(constraints, frames=True)[
+        "nodes" if not is_relationship else "relationships"
+    ].get(label, None)
+
+    if not validator:
+        raise ValueError(f"No constraints found for label '{label}'.")
+
+    return validator(df)
+
+
+def get_valid_rows(df, failures):
+    """
+    Get the rows of a DataFrame without failures.
+
+    Args:
+        df (pd.DataFrame): Validated DataFrame.
+        failures (pd.DataFrame): Failures returned by validate_frame.
+
+    Returns:
+        pd.DataFrame: The rows of df that passed validation.
+    """
+    return df[~df.index.isin(failures["row"])]
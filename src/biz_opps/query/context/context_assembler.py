@@ -0,0 +1,164 @@
+from typing import Dict, List, Optional, Union
+import math
+
+from biz_opps.neo4j.schema_registry import (
+    SchemaRegistry,
+    get_schema_fragments,
+    join_schema_fragments,
+)
+from biz_opps.query.context.doc_index import BM25
+from biz_opps.query.context.doc_loader import DocumentationLoader
+
+# Default token budget of the schema and documents of a prompt
+DEFAULT_MAX_CONTEXT_TOKENS = 2000
+
+# Share of the budget reserved for the schema, the documents get the rest
+SCHEMA_BUDGET_SHARE = 0.6
+
+# Document chunks retrieved per question, before the budget is applied
+DOC_TOP_K = 8
+
+# Document chunks scoring below this share of the best chunk are left out
+MIN_RELATIVE_DOC_SCORE = 0.3
+
+
+def count_tokens(text: str) -> int:
+    """Estimate the number of LLM tokens of a text, about 4 characters per token."""
+    return math.ceil(len(text) / 4)
+
+
+class ContextAssembler:
+    """
+    Assembles the schema and documentation context of a question within a token budget,
+    keeping the schema fragments and document chunks that score highest against it.
+    """
+
+    def __init__(
+        self,
+        registry: SchemaRegistry,
+        doc_loader: DocumentationLoader,
+        max_tokens: int = DEFAULT_MAX_CONTEXT_TOKENS,
+        verbose: bool = False,
+    ):
+        """
+        Initialize context assembler.
+
+        Args:
+            registry: Schema registry of the schema context.
+            doc_loader: Loader of the documents.
+            max_tokens: Token budget of the schema and documents of a prompt.
+            verbose: Whether to print verbose output.
+        """
+        self.registry = registry
+        self.doc_loader = doc_loader
+        self.max_tokens = max_tokens
+        self.verbose = verbose
+
+    def _schema_index(self) -> BM25:
+        """BM25 index of the schema fragments, rebuilt when the schema changes."""
+        return self.registry.view(
+            "schema_bm25",
+            lambda schema: BM25(
+                [fragment["text"] for fragment in get_schema_fragments(schema)]
+            ),
+        )
+
+    def _select_schema(self, question: str, budget: int) -> str:
+        """
+        Select the schema fragments of a question within a token budget.
+
+        Node labels are taken by descending score, then the relationships and spatial layers
+        between the selected labels, then any other scoring fragment that still fits.
+        """
+        fragments = self.registry.schema_fragments()
+        full_context = self.registry.formatted_context()
+        if count_tokens(full_context) <= budget:
+            return full_context
+
+        scores = self._schema_index().scores(question)
+        if not any(scores):
+            # Nothing to go on, the truncated full schema is better than none
+            return full_context[: budget * 4]
+
+        ranked = sorted(range(len(fragments)), key=lambda i: -scores[i])
+        selected, used = set(), 0
+
+        def take(index):
+            nonlocal used
+            tokens = count_tokens(fragments[index]["text"])
+            if index not in selected and used + tokens <= budget:
+                selected.add(index)
+                used += tokens
+
+        for index in ranked:
+            if fragments[index]["section"] == "nodes" and scores[index] > 0:
+                take(index)
+
+        labels = {fragments[index]["name"] for index in selected}
+        for index in ranked:
+            if fragments[index]["section"] != "nodes" and set(
+                fragments[index]["labels"]
+            ).issubset(labels):
+                take(index)
+
+        for index in ranked:
+            if scores[index] > 0:
+                take(index)
+
+        # Keep the schema order, so prompts of similar questions share their layout
+        return join_schema_fragments([fragments[index] for index in sorted(selected)])
+
+    def _select_docs(
+        self, question: str, budget: int, include_docs: Optional[List[str]]
+    ) -> Dict[str, str]:
+        """Select the document chunks of a question within a token budget."""
+        chunks = self.doc_loader.search_chunks(
+            question, top_k=DOC_TOP_K, doc_names=include_docs
+        )
+
+        selected, used = [], 0
+        for chunk in chunks:
+            if chunk["score"] < chunks[0]["score"] * MIN_RELATIVE_DOC_SCORE:
+                break
+            tokens = count_tokens(chunk["text"])
+            if used + tokens <= budget:
+                selected.append(chunk)
+                used += tokens
+
+        # Chunks of a document keep their order in it
+        docs = {}
+        for chunk in sorted(selected, key=lambda chunk: chunk["id"]):
+            docs.setdefault(chunk["doc"], []).append(chunk["text"])
+        return {doc_name: "\n\n".join(texts) for doc_name, texts in docs.items()}
+
+    def assemble(
+        self,
+        question: str,
+        additional_context: Optional[Union[Dict[str, str], str]] = None,
+        include_docs: Optional[List[str]] = None,
+    ) -> Dict[str, str]:
+        """
+        Assemble the context of a question.
+
+        Args:
+            question: Natural language question
+            additional_context: Additional context of the question, also used for scoring
+            include_docs: Documents to select chunks from, None for all documents
+
+        Returns:
+            dict: "schema" context and the selected chunks per document name
+        """
+        if isinstance(additional_context, dict):
+            additional_context = " ".join(map(str, additional_context.values()))
+        text = f"{question} {additional_context or ''}"
+        schema_budget = int(self.max_tokens * SCHEMA_BUDGET_SHARE)
+        schema = self._select_schema(text, schema_budget)
+        # The documents get what the schema leaves of the budget
+        doc_budget = self.max_tokens - count_tokens(schema)
+        docs = self._select_docs(text, doc_budget, include_docs)
+
+        if self.verbose:
+            tokens = count_tokens(schema) + sum(map(count_tokens, docs.values()))
+            print(f"\nAssembled context of {tokens} tokens (budget {self.max_tokens})")
+
+        return {"schema": schema, **docs}
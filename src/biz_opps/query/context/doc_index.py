@@ -0,0 +1,224 @@
+from typing import Dict, List, Optional
+import json
+import math
+import os
+import re
+
+from biz_opps.query.text import STOPWORDS, tokenize
+from biz_opps.utils.file import get_root_dir
+
+DEFAULT_INDEX_PATH = os.path.join(get_root_dir(), "data", "cache", "doc_index.json")
+
+# Bumped whenever the chunking or the index format changes, so stale indexes are rebuilt
+INDEX_FORMAT_VERSION = 1
+
+DEFAULT_TOP_K = 8
+
+# Chunks are split beyond this many characters
+MAX_CHUNK_CHARS = 1200
+
+# Single line paragraphs of up to this many words, e.g. titles or procedure names, start a chunk
+MAX_HEADING_WORDS = 4
+
+# BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+
+class BM25:
+    """Okapi BM25 inverted index of a set of documents."""
+
+    def __init__(self, documents: List[str]):
+        self.lengths = []
+        self.postings: Dict[str, List[List[int]]] = {}
+        for doc_id, document in enumerate(documents):
+            terms = tokenize(document)
+            self.lengths.append(len(terms))
+            counts = {}
+            for term in terms:
+                counts[term] = counts.get(term, 0) + 1
+            for term, count in counts.items():
+                self.postings.setdefault(term, []).append([doc_id, count])
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "BM25":
+        """Restore an index saved with to_dict."""
+        index = cls([])
+        index.lengths = data["lengths"]
+        index.postings = data["postings"]
+        return index
+
+    def to_dict(self) -> Dict:
+        """Get the index as JSON serializable data."""
+        return {"lengths": self.lengths, "postings": self.postings}
+
+    def scores(self, query: str) -> List[float]:
+        """Score every document against a query."""
+        total = len(self.lengths)
+        avg_length = sum(self.lengths) / total if total else 0
+        scores = [0.0] * total
+        for term in set(tokenize(query)) - STOPWORDS:
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, count in postings:
+                length_norm = BM25_K1 * (
+                    1 - BM25_B + BM25_B * self.lengths[doc_id] / (avg_length or 1)
+                )
+                scores[doc_id] += idf * count * (BM25_K1 + 1) / (count + length_norm)
+        return scores
+
+
+def _is_heading(paragraph: str) -> bool:
+    """Check whether a paragraph is a title or the name of a procedure."""
+    return (
+        "\n" not in paragraph
+        and "(" not in paragraph
+        and len(paragraph.split()) <= MAX_HEADING_WORDS
+    )
+
+
+def chunk_document(text: str) -> List[str]:
+    """
+    Split a document into chunks of consecutive paragraphs, each starting at a heading, e.g. a
+    procedure name followed by its description and signature.
+
+    Args:
+        text: Document content
+
+    Returns:
+        list: Chunks of the document, in order
+    """
+    chunks, current = [], []
+
+    def flush():
+        if current:
+            chunks.append("\n\n".join(current))
+            current.clear()
+
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        # A heading after a body starts the next chunk, consecutive headings stay together
+        if _is_heading(paragraph) and current and not _is_heading(current[-1]):
+            flush()
+        if current and sum(map(len, current)) + len(paragraph) > MAX_CHUNK_CHARS:
+            flush()
+        current.append(paragraph)
+    flush()
+    return chunks
+
+
+class DocumentIndex:
+    """
+    BM25 index of the chunks of the documents of a directory. The index is cached on disk and
+    only rebuilt when a document is added, removed or modified.
+    """
+
+    def __init__(
+        self,
+        docs_dir: str,
+        index_path: str = DEFAULT_INDEX_PATH,
+        verbose: bool = False,
+    ):
+        """
+        Load or build the index.
+
+        Args:
+            docs_dir: Directory containing documentation files.
+            index_path: Path of the cached index.
+            verbose: Whether to print verbose output.
+        """
+        self.docs_dir = docs_dir
+        self.index_path = index_path
+        self.verbose = verbose
+
+        key = {"version": INDEX_FORMAT_VERSION, "docs": self._get_mtimes()}
+        data = self._load_cached(key)
+        if data is None:
+            data = self._build(key)
+            self._save(data)
+
+        self.chunks: List[Dict] = data["chunks"]
+        self.bm25 = BM25.from_dict(data["bm25"])
+
+    def _get_mtimes(self) -> Dict[str, int]:
+        """Get the modification time of every document."""
+        return {
+            doc_name: os.stat(os.path.join(self.docs_dir, doc_name)).st_mtime_ns
+            for doc_name in sorted(os.listdir(self.docs_dir))
+            if os.path.isfile(os.path.join(self.docs_dir, doc_name))
+        }
+
+    def _load_cached(self, key: Dict) -> Optional[Dict]:
+        """Load the cached index, or None if it is missing or stale."""
+        try:
+            with open(self.index_path, encoding="utf-8") as file:
+                data = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        if data.get("key") != key:
+            return None
+        if self.verbose:
+            print(
+                f"\nLoaded {len(data['chunks'])} document chunks from {self.index_path}"
+            )
+        return data
+
+    def _build(self, key: Dict) -> Dict:
+        """Chunk and index every document."""
+        chunks = []
+        for doc_name in key["docs"]:
+            with open(os.path.join(self.docs_dir, doc_name), encoding="utf-8") as file:
+                content = file.read()
+            name = os.path.splitext(doc_name)[0]
+            chunks.extend(
+                {"doc": name, "text": text} for text in chunk_document(content)
+            )
+
+        if self.verbose:
+            print(f"\nIndexed {len(chunks)} chunks of {len(key['docs'])} documents")
+
+        bm25 = BM25([chunk["text"] for chunk in chunks])
+        return {"key": key, "chunks": chunks, "bm25": bm25.to_dict()}
+
+    def _save(self, data: Dict):
+        """Cache the index, replacing the file atomically."""
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        temp_path = f"{self.index_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(data, file)
+        os.replace(temp_path, self.index_path)
+
+    def search(
+        self,
+        query: str,
+        top_k: int = DEFAULT_TOP_K,
+        doc_names: Optional[List[str]] = None,
+    ) -> List[Dict]:
+        """
+        Find the chunks most relevant to a query.
+
+        Args:
+            query: Natural language query
+            top_k: Maximum number of chunks to return
+            doc_names: Documents to search, None for all documents
+
+        Returns:
+            list: Chunks with their "id" (position in the documents), "doc", "text" and "score",
+                highest score first. Chunks sharing no term with the query are left out.
+        """
+        scores = self.bm25.scores(query)
+        ranked = sorted(range(len(scores)), key=lambda i: -scores[i])
+        results = []
+        for chunk_id in ranked:
+            if len(results) >= top_k or scores[chunk_id] <= 0:
+                break
+            chunk = self.chunks[chunk_id]
+            if doc_names and chunk["doc"] not in doc_names:
+                continue
+            results.append({"id": chunk_id, **chunk, "score": scores[chunk_id]})
+        return results
@@ -1,6 +1,7 @@
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 import os
 
+from biz_opps.query.context.doc_index import DEFAULT_TOP_K, DocumentIndex
 from biz_opps.utils.file import get_root_dir
 
 
@@ -20,7 +21,16 @@ class DocumentationLoader:
             verbose: Whether to print verbose output.
         """
         self.docs_dir = docs_dir
-        self.context_docs = self._load_docs(verbose)
+        self.verbose = verbose
+        self._context_docs = None
+        self.index = DocumentIndex(docs_dir, verbose=verbose)
+
+    @property
+    def context_docs(self) -> Dict[str, str]:
+        """Full documents, only loaded on first use since the context assembler retrieves chunks."""
+        if self._context_docs is None:
+            self._context_docs = self._load_docs(self.verbose)
+        return self._context_docs
 
     def get_context_docs(self, doc_names: Optional[list[str]] = None) -> Dict[str, str]:
         """
@@ -40,13 +50,32 @@ class DocumentationLoader:
             }
         return self.context_docs
 
+    def search_chunks(
+        self,
+        query: str,
+        top_k: int = DEFAULT_TOP_K,
+        doc_names: Optional[List[str]] = None,
+    ) -> List[Dict]:
+        """
+        Get the document chunks most relevant to a query.
+
+        Args:
+            query: Natural language query.
+            top_k: Maximum number of chunks to return.
+            doc_names: Optional list of document names to search. If None, all documents are searched.
+
+        Returns:
+            List of chunks with their "id", "doc", "text" and "score", highest score first.
+        """
+        return self.index.search(query, top_k, doc_names)
+
     def _load_docs(self, verbose: bool) -> Dict[str, str]:
         """Load all documents."""
-        docs = {
-            os.path.splitext(doc_name)[0]: self._load_doc(doc_name)
-            for doc_name in os.listdir(self.docs_dir)
-            if self._load_doc(doc_name)
-        }
+        docs = {}
+        for doc_name in os.listdir(self.docs_dir):
+            content = self._load_doc(doc_name)
+            if content:
+                docs[os.path.splitext(doc_name)[0]] = content
 
         if verbose:
             print(f"\nLoaded {len(docs)} documents from {self.docs_dir}")
@@ -1,8 +1,6 @@
-from typing import Dict
-import json
-import os
+from typing import Dict, List
 
-from biz_opps.utils.file import get_root_dir
+from biz_opps.neo4j.schema_registry import get_schema_registry
 
 
 class SchemaLoader:
@@ -10,57 +8,24 @@ class SchemaLoader:
 
     def __init__(
         self,
-        schema_path: str = os.path.join(
-            get_root_dir(), "configs", "constraints_schema.json"
-        ),
+        schema_path: str = None,
         verbose: bool = False,
     ):
-        self.schema = self._load_schema(schema_path, verbose)
-
-    def _load_schema(self, path: str, verbose: bool) -> Dict:
-        """Load schema from file."""
-        with open(path) as f:
-            schema = json.load(f)
+        # The registry is shared with the ETL and validation, the schema is parsed once per process
+        self.registry = get_schema_registry(schema_path)
 
         if verbose:
-            print(f"\nLoaded schema from {path}")
+            print(f"\nLoaded schema from {self.registry.path}")
 
-        return schema
+    @property
+    def schema(self) -> Dict:
+        """Parsed schema, reloaded when the schema file changes."""
+        return self.registry.get()
 
     def get_formatted_context(self) -> str:
-        """Format schema for LLM context."""
-        context = []
-
-        # Node labels and properties
-        context.append("Node Labels and Properties:")
-        for label, info in self.schema["nodes"].items():
-            props = info["properties"]
-            context.append(f"\n{label}:")
-            for prop, details in props.items():
-                prop_info = f"  - {prop} ({details['type']})"
-                if "enum" in details:
-                    prop_info += f": {', '.join(details['enum'])}"
-                context.append(prop_info)
-
-        # Relationships with explicit direction
-        context.append("\nRelationship Types and Directions:")
-        for rel_type, info in self.schema["relationships"].items():
-            context.append(f"\n{rel_type}:")
-            if "properties" in info:
-                context.append("  Properties:")
-                for prop, details in info["properties"].items():
-                    context.append(f"    - {prop} ({details['type']})")
-            context.append("  Valid Directions:")
-            for start, ends in info["mappings"].items():
-                for end in ends:
-                    context.append(f"    - ({start})-[:{rel_type}]->({end})")
-
-        # Spatial layers
-        if "spatial_layers" in self.schema:
-            context.append("\nSpatial Layers:")
-            for layer, info in self.schema["spatial_layers"].items():
-                context.append(f"\n{layer}:")
-                context.append(f"  Nodes: {', '.join(info['nodes'])}")
-                context.append(f"  Type: {info['layer_class']}")
+        """Format schema for LLM context, formatted once per schema version."""
+        return self.registry.formatted_context()
 
-        return "\n".join(context)
+    def get_schema_fragments(self) -> List[Dict]:
+        """Get the per-label, relationship and spatial layer fragments of the formatted context."""
+        return self.registry.schema_fragments()
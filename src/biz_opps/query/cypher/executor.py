@@ -1,72 +1,314 @@
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 import asyncio
-from neo4j.graph import Graph
+import random
+import time
+from neo4j import AsyncDriver
+from neo4j.exceptions import ClientError
+
+from biz_opps.neo4j.graph_version import get_graph_version
+from biz_opps.query.cypher.projection import (
+    get_geometry_property_names,
+    project_properties,
+)
+from biz_opps.query.cypher.result_collector import (
+    DEFAULT_MAX_BYTES,
+    DEFAULT_MAX_NODES,
+    DEFAULT_MAX_RECORDS,
+    ResultCollector,
+    ResultGraph,
+    inject_limit,
+)
+from biz_opps.query.cypher.result_cache import (
+    ENTITY_OVERHEAD_BYTES,
+    ResultCache,
+    is_cacheable,
+    normalize_cypher,
+)
+from biz_opps.query.cypher.slow_query_log import SlowQueryLog, summarize_profile
 
 
 class CypherExecutor:
     """Executes and handles Cypher queries."""
 
-    def __init__(self, driver, schema=None, verbose=False):
+    def __init__(
+        self,
+        driver,
+        schema=None,
+        verbose=False,
+        max_records: int = DEFAULT_MAX_RECORDS,
+        max_nodes: int = DEFAULT_MAX_NODES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        add_limit: bool = True,
+        result_cache: Optional[ResultCache] = None,
+        slow_query_log: Optional[SlowQueryLog] = None,
+        profile_sample_rate: float = 0.0,
+        slow_query_ms: Optional[float] = None,
+    ):
+        """
+        Args:
+            driver: Neo4j driver. With an AsyncDriver queries run natively on the event loop,
+                with a synchronous driver they run in the default thread pool.
+            schema: Optional constraints schema
+            verbose: Whether to print verbose output
+            max_records: Maximum number of records read from a result
+            max_nodes: Maximum number of distinct nodes collected from a result
+            max_bytes: Maximum estimated size of the collected node and relationship properties
+            add_limit: Whether to add a LIMIT to queries whose final RETURN has none
+            result_cache: Optional cache of read query results, keyed by normalized query and
+                graph version
+            slow_query_log: Optional log of profiled queries, required for profiling
+            profile_sample_rate: Share of the queries run with PROFILE and logged
+            slow_query_ms: Queries slower than this many milliseconds are logged, and their
+                next run is profiled, None to disable
+        """
         self.driver = driver
         self.schema = schema
         self.verbose = verbose
+        self.is_async = isinstance(driver, AsyncDriver)
+        self.max_records = max_records
+        self.max_nodes = max_nodes
+        self.max_bytes = max_bytes
+        self.add_limit = add_limit
+        self.geometry_properties = get_geometry_property_names(schema)
+        self.result_cache = result_cache
+        self.slow_query_log = slow_query_log
+        self.profile_sample_rate = profile_sample_rate
+        self.slow_query_ms = slow_query_ms
+        # Normalized slow queries whose next run is profiled
+        self._profile_next = set()
 
-    async def execute_query(self, cypher: str) -> Graph:
+    async def execute_query(self, cypher: str) -> Tuple[ResultGraph, Dict]:
         """
-        Execute Cypher query and return results.
+        Execute Cypher query and return results. Records are streamed and reading stops at the
+        first record exceeding the record, node or byte cap.
 
         Returns:
-            Tuple[Graph, Dict]: Neo4j graph object and parsed graph data for LLM interpretation and visualization determination
+            Tuple[ResultGraph, Dict]: Graph of the collected nodes and relationships, and parsed graph
+                data for LLM interpretation and visualization determination, with its "truncation"
         """
         try:
+            cache_key = None
+            if self.result_cache is not None and is_cacheable(cypher):
+                # The caps are part of the key since they change the result
+                cache_key = (
+                    normalize_cypher(cypher),
+                    get_graph_version(),
+                    self.max_records,
+                    self.max_nodes,
+                    self.max_bytes,
+                    self.add_limit,
+                )
+                cached = self.result_cache.get(cache_key)
+                if cached is not None:
+                    if self.verbose:
+                        print(f"Result cache hit: {self.result_cache.stats()}")
+                    return cached
+
+            limit_injected = False
+            if self.add_limit:
+                # One record more than the cap, so a truncated result can be told apart
+                limited_cypher = inject_limit(cypher, self.max_records + 1)
+                if limited_cypher is not None:
+                    cypher = limited_cypher
+                    limit_injected = True
+
             if self.verbose:
                 print(f"\nExecuting Cypher query:\n{cypher}")
 
-            # Run query in thread pool since neo4j-driver is synchronous
-            loop = asyncio.get_event_loop()
-            with self.driver.session() as session:
-                if self.verbose:
-                    print("Running query...")
+            if self.verbose:
+                print("Running query...")
+
+            collector = ResultCollector(
+                max_records=self.max_records,
+                max_nodes=self.max_nodes,
+                max_bytes=self.max_bytes,
+            )
+            normalized = normalize_cypher(cypher)
+            profile_reason = None
+            if self.slow_query_log is not None:
+                if normalized in self._profile_next:
+                    self._profile_next.discard(normalized)
+                    profile_reason = "slow"
+                elif random.random() < self.profile_sample_rate:
+                    profile_reason = "sampled"
+            run_cypher = f"PROFILE {cypher}" if profile_reason else cypher
 
-                # Execute query and get result
-                result = await loop.run_in_executor(None, session.run, cypher)
+            start = time.perf_counter()
+            if self.is_async:
+                summary = await self._run_async(run_cypher, collector)
+            else:
+                # The synchronous driver blocks, run the whole query in one thread pool hop
+                loop = asyncio.get_running_loop()
+                summary = await loop.run_in_executor(
+                    None, self._run_sync, run_cypher, collector
+                )
+            wall_ms = (time.perf_counter() - start) * 1000
 
-                # Collect all records to ensure they're consumed
-                records = await loop.run_in_executor(None, lambda: list(result))
+            self._log_query(
+                cypher, normalized, summary, wall_ms, profile_reason, collector.records
+            )
 
-                # Get graph from result
-                graph = result.graph()
+            graph = collector.graph
+            # Parse graph for LLM interpretation and visualization determination
+            parsed_graph = self._parse_graph(graph)
+            parsed_graph["truncation"] = collector.get_truncation(limit_injected)
 
-                # Parse graph for LLM interpretation and visualization determination
-                parsed_graph = self._parse_graph(graph)
+            if parsed_graph["truncation"]["truncated"]:
+                print(
+                    f"Query result truncated by {collector.truncated_by} after "
+                    f"{collector.records} records"
+                )
+
+            if self.verbose:
+                print(
+                    f"Got {len(graph.nodes)} nodes and {len(graph.relationships)} relationships"
+                )
 
-                if self.verbose:
-                    print(
-                        f"Got {len(graph.nodes)} nodes and {len(graph.relationships)} relationships"
-                    )
+            if cache_key is not None:
+                truncation = parsed_graph["truncation"]
+                size = truncation["bytes"] + ENTITY_OVERHEAD_BYTES * (
+                    truncation["nodes"] + truncation["relationships"]
+                )
+                self.result_cache.put(cache_key, (graph, parsed_graph), size)
 
-                return graph, parsed_graph
+            return graph, parsed_graph
 
         except Exception as e:
             print(f"Query execution failed: {str(e)}")
             raise
 
-    def _parse_graph(self, graph: Graph) -> Dict:
-        """Parse graph for LLM interpretation and visualization determination."""
+    async def explain(self, cypher: str) -> List[str]:
+        """
+        Plan a query with EXPLAIN, which checks it without reading any data.
+
+        Returns:
+            list: The syntax or semantic error of the query, or its scans of all nodes,
+                empty if the query can run as is
+        """
+        try:
+            if self.is_async:
+                async with self.driver.session() as session:
+                    result = await session.run(f"EXPLAIN {cypher}")
+                    summary = await result.consume()
+            else:
+                loop = asyncio.get_running_loop()
+                summary = await loop.run_in_executor(None, self._explain_sync, cypher)
+        except ClientError as e:
+            return [f"Neo4j rejected the query: {e.message}"]
+
+        issues = []
+        operators = self._get_plan_operators(summary.plan)
+        if "AllNodesScan" in operators:
+            issues.append(
+                "The query scans all nodes, a node pattern is missing its label"
+            )
+        if self.verbose:
+            print(f"Query plan operators: {', '.join(sorted(operators))}")
+        return issues
+
+    def _explain_sync(self, cypher: str):
+        """Plan a query with the synchronous driver and get its summary."""
+        with self.driver.session() as session:
+            return session.run(f"EXPLAIN {cypher}").consume()
+
+    @staticmethod
+    def _get_plan_operators(plan: Optional[Dict]) -> set:
+        """Get the operator types of a query plan, e.g. "NodeByLabelScan"."""
+        operators = set()
+        stack = [plan] if plan else []
+        while stack:
+            operator = stack.pop()
+            # Operator types are suffixed with the database, e.g. "AllNodesScan@neo4j"
+            operators.add(operator["operatorType"].split("@")[0])
+            stack.extend(operator.get("children", []))
+        return operators
+
+    def _log_query(
+        self,
+        cypher: str,
+        normalized: str,
+        summary,
+        wall_ms: float,
+        profile_reason: Optional[str],
+        rows: int,
+    ):
+        """
+        Log the profile of a profiled query. A slow query is logged with its wall time and
+        rows, and flagged so its next run is profiled, instead of being run again now.
+        """
+        if self.slow_query_log is None:
+            return
+
+        if profile_reason:
+            plan = summarize_profile(summary.profile)
+            self.slow_query_log.record(
+                cypher, normalized, profile_reason, wall_ms, plan
+            )
+        elif self.slow_query_ms is not None and wall_ms >= self.slow_query_ms:
+            print(f"Slow query ({wall_ms:.0f} ms), profiling its next run")
+            self.slow_query_log.record(cypher, normalized, "slow", wall_ms, rows=rows)
+            self._profile_next.add(normalized)
+
+    async def _run_async(self, cypher: str, collector: ResultCollector):
+        """
+        Stream a query with the async driver into a collector, discarding records past its caps.
+
+        Returns:
+            The result summary
+        """
+        async with self.driver.session(fetch_size=self._fetch_size()) as session:
+            result = await session.run(cypher)
+            async for record in result:
+                if not collector.add(record):
+                    break
+            # Discards the remaining records without transferring them
+            return await result.consume()
+
+    def _run_sync(self, cypher: str, collector: ResultCollector):
+        """
+        Stream a query with the synchronous driver into a collector, discarding records past its caps.
+
+        Returns:
+            The result summary
+        """
+        with self.driver.session(fetch_size=self._fetch_size()) as session:
+            result = session.run(cypher)
+            for record in result:
+                if not collector.add(record):
+                    break
+            # Discards the remaining records without transferring them
+            return result.consume()
+
+    def _fetch_size(self) -> int:
+        """Records fetched per batch, no more than the records that can be kept."""
+        return min(self.max_records + 1, 1000)
+
+    def _parse_graph(self, graph: ResultGraph) -> Dict:
+        """
+        Parse graph for LLM interpretation and visualization determination. Geometries are
+        replaced by summaries (type, vertex count, bbox), the WKT itself only goes to the map
+        through the graph.
+        """
         # Format graph data for LLM consumption
         nodes_info = []
         for node in graph.nodes:
+            properties, geometries = project_properties(
+                node.items(), self.geometry_properties
+            )
             node_info = {
                 "labels": list(node.labels),
-                "properties": dict(node.items()),
+                "properties": properties,
             }
+            if geometries:
+                node_info["geometries"] = geometries
             nodes_info.append(node_info)
 
         rels_info = []
         for rel in graph.relationships:
+            properties, _ = project_properties(rel.items(), self.geometry_properties)
             rel_info = {
                 "type": rel.type,
-                "properties": dict(rel.items()),
+                "properties": properties,
                 "start_node_labels": list(rel.start_node.labels),
                 "end_node_labels": list(rel.end_node.labels),
             }
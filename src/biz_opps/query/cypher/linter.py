@@ -0,0 +1,255 @@
+from typing import Dict, List, Optional, Set
+import re
+
+# Properties Neo4j Spatial adds to the nodes of its layers
+SPATIAL_PROPERTIES = {"bbox", "gtype", "geometry"}
+
+# String literals and comments of a Cypher query
+LITERAL_PATTERN = re.compile(
+    r"""'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|//[^\n]*|/\*.*?\*/""", re.DOTALL
+)
+
+# Contents of a node pattern, e.g. "bg:BlockGroup {block_group: $1}"
+NODE_PATTERN = re.compile(
+    r"^\s*(?P<var>\w+)?\s*(?P<labels>(?::\s*\w+\s*(?:[|&]\s*\w+\s*)*)*)"
+    r"(?P<props>\{.*\})?\s*$",
+    re.DOTALL,
+)
+
+# A node pattern, a relationship pattern and, looked ahead, the next node pattern
+PATH_PATTERN = re.compile(
+    r"\((?P<start>[^()]*)\)\s*(?P<left><)?-\[(?P<rel>[^\[\]]*)\]-(?P<right>>)?"
+    r"\s*(?=\((?P<end>[^()]*)\))"
+)
+
+# Contents of a relationship pattern, e.g. "r:IS_WITHIN|LOCATED_IN *1..2"
+REL_PATTERN = re.compile(
+    r"^\s*(?P<var>\w+)?\s*(?::\s*(?P<types>\w+(?:\s*\|\s*:?\w+)*))?"
+)
+
+# Properties of an inline map, e.g. {category: $__literal_0, zipcode_number: $zip}
+MAP_ENTRY_PATTERN = re.compile(r"(\w+)\s*:\s*([^,}]+)")
+
+PROPERTY_ACCESS_PATTERN = re.compile(r"\b(\w+)\.(\w+)\b")
+
+# Comparison of a property with literals, e.g. e.category = $__literal_0 or
+# e.category IN [$__literal_0, $__literal_1]
+COMPARISON_PATTERN = re.compile(
+    r"\b(\w+)\.(\w+)\s*(?:=|<>|\bIN\b)\s*(\$\w+|\[[^\]]*\])", re.IGNORECASE
+)
+
+# Placeholder of the string literal of an index
+PLACEHOLDER_PATTERN = re.compile(r"\$__literal_(\d+)")
+
+
+def _split_labels(labels: str) -> List[str]:
+    """Split the label expression of a node pattern, e.g. ":City|Neighborhood"."""
+    return [label for label in re.split(r"[\s:|&]+", labels) if label]
+
+
+class CypherLinter:
+    """
+    Checks the labels, relationship types and directions, properties and enum values of a
+    Cypher query against the constraints schema, without a round trip to the database.
+    """
+
+    def __init__(self, schema: Dict):
+        """
+        Args:
+            schema: Constraints schema
+        """
+        self.schema = schema
+        self.spatial_labels = {
+            label
+            for layer in schema.get("spatial_layers", {}).values()
+            for label in layer["nodes"]
+        }
+
+    def _strip_literals(self, cypher: str):
+        """
+        Replace string literals by $__literal_<index> placeholders and drop comments, so patterns are
+        never matched inside strings.
+
+        Returns:
+            tuple: (query without literals, list of literal values)
+        """
+        literals = []
+
+        def replace(match):
+            token = match.group(0)
+            if token.startswith("/"):
+                return " "
+            literals.append(token[1:-1])
+            return f"$__literal_{len(literals) - 1}"
+
+        return LITERAL_PATTERN.sub(replace, cypher), literals
+
+    def _get_properties(self, labels: Set[str], rel_types: Set[str]) -> Optional[Dict]:
+        """
+        Get the properties defined on any of the labels or relationship types, or None if
+        none of them is in the schema.
+        """
+        if not (
+            labels & self.schema["nodes"].keys()
+            or rel_types & self.schema["relationships"].keys()
+        ):
+            return None
+
+        properties = {}
+        for label in labels:
+            properties.update(self.schema["nodes"].get(label, {}).get("properties", {}))
+            if label in self.spatial_labels:
+                properties.update({prop: {} for prop in SPATIAL_PROPERTIES})
+        for rel_type in rel_types:
+            properties.update(
+                self.schema["relationships"].get(rel_type, {}).get("properties") or {}
+            )
+        return properties
+
+    def _check_values(self, owner, prop, details, expression, literals, issues):
+        """Check the string literals of an expression against the enum of a property."""
+        enum = details.get("enum")
+        if not enum:
+            return
+        for index in PLACEHOLDER_PATTERN.findall(expression):
+            value = literals[int(index)]
+            if value not in enum:
+                issues.append(
+                    f"'{value}' is not a valid value of {owner}.{prop}, "
+                    f"expected one of: {', '.join(enum)}"
+                )
+
+    def lint(self, cypher: str) -> List[str]:
+        """
+        Lint a Cypher query.
+
+        Args:
+            cypher: Cypher query
+
+        Returns:
+            list: Descriptions of the problems found, empty if the query matches the schema
+        """
+        query, literals = self._strip_literals(cypher)
+        issues = []
+
+        # Labels and inline properties of the node patterns
+        node_labels: Dict[str, Set[str]] = {}
+        for content in re.findall(r"\(([^()]*)\)", query):
+            match = NODE_PATTERN.match(content)
+            if not match or not match.group("labels"):
+                continue
+            labels = _split_labels(match.group("labels"))
+            for label in labels:
+                if label not in self.schema["nodes"]:
+                    issues.append(f"Label :{label} does not exist in the schema")
+            if match.group("var"):
+                node_labels.setdefault(match.group("var"), set()).update(labels)
+            properties = self._get_properties(set(labels), set())
+            if match.group("props") and properties is not None:
+                for prop, value in MAP_ENTRY_PATTERN.findall(match.group("props")):
+                    owner = "|".join(labels)
+                    if prop not in properties:
+                        issues.append(f"Property {prop} does not exist on :{owner}")
+                    else:
+                        self._check_values(
+                            owner, prop, properties[prop], value, literals, issues
+                        )
+
+        # Relationship types and directions
+        rel_types: Dict[str, Set[str]] = {}
+        for match in PATH_PATTERN.finditer(query):
+            rel = REL_PATTERN.match(match.group("rel"))
+            if not rel or not rel.group("types"):
+                continue
+            types = _split_labels(rel.group("types"))
+            if rel.group("var"):
+                rel_types.setdefault(rel.group("var"), set()).update(types)
+
+            start_labels = self._get_pattern_labels(match.group("start"), node_labels)
+            end_labels = self._get_pattern_labels(match.group("end"), node_labels)
+            if match.group("left") and not match.group("right"):
+                start_labels, end_labels = end_labels, start_labels
+            directed = bool(match.group("left")) != bool(match.group("right"))
+            # The end node of a variable length relationship may be several hops away
+            variable_length = "*" in match.group("rel")
+
+            known_types = []
+            for rel_type in types:
+                if rel_type not in self.schema["relationships"]:
+                    issues.append(
+                        f"Relationship type :{rel_type} does not exist in the schema"
+                    )
+                else:
+                    known_types.append(rel_type)
+
+            if not (
+                directed
+                and not variable_length
+                and known_types
+                and start_labels
+                and end_labels
+            ):
+                continue
+            # An alternation is fine as long as any of its types connects the labels
+            mappings = [
+                self.schema["relationships"][rel_type]["mappings"]
+                for rel_type in known_types
+            ]
+            if any(self._connects(m, start_labels, end_labels) for m in mappings):
+                continue
+            owner = "|".join(known_types)
+            if any(self._connects(m, end_labels, start_labels) for m in mappings):
+                issues.append(
+                    f":{owner} points the wrong way, it goes from "
+                    f"({'|'.join(sorted(end_labels))}) to ({'|'.join(sorted(start_labels))})"
+                )
+            else:
+                issues.append(
+                    f":{owner} never connects ({'|'.join(sorted(start_labels))}) to "
+                    f"({'|'.join(sorted(end_labels))})"
+                )
+
+        # Properties of the variables bound to labels or relationship types
+        for var, prop in dict.fromkeys(PROPERTY_ACCESS_PATTERN.findall(query)):
+            labels = node_labels.get(var, set())
+            types = rel_types.get(var, set())
+            properties = self._get_properties(labels, types)
+            if properties is not None and prop not in properties:
+                owner = "|".join(sorted(labels | types))
+                issues.append(f"Property {prop} does not exist on {var}:{owner}")
+
+        for var, prop, expression in COMPARISON_PATTERN.findall(query):
+            properties = self._get_properties(
+                node_labels.get(var, set()), rel_types.get(var, set())
+            )
+            if properties and prop in properties:
+                self._check_values(
+                    var, prop, properties[prop], expression, literals, issues
+                )
+
+        # Keep the first occurrence of every problem
+        return list(dict.fromkeys(issues))
+
+    def _get_pattern_labels(
+        self, content: str, node_labels: Dict[str, Set[str]]
+    ) -> Set[str]:
+        """
+        Get the schema labels of a node pattern, or of its variable when it has none. Labels
+        missing from the schema are already reported and left out.
+        """
+        match = NODE_PATTERN.match(content)
+        if not match:
+            return set()
+        labels = set(_split_labels(match.group("labels") or ""))
+        if not labels and match.group("var"):
+            labels = node_labels.get(match.group("var"), set())
+        return labels & self.schema["nodes"].keys()
+
+    @staticmethod
+    def _connects(mappings: Dict, start_labels: Set[str], end_labels: Set[str]) -> bool:
+        """Check whether a relationship connects any of the start labels to any end label."""
+        return any(
+            end in end_labels
+            for start in start_labels
+            for end in mappings.get(start, [])
+        )
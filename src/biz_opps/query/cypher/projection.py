@@ -0,0 +1,71 @@
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+import re
+
+from biz_opps.neo4j.schema_registry import get_geometry_properties
+
+# Geometry property used when no schema is given
+DEFAULT_GEOMETRY_PROPERTIES = {"wkt"}
+
+# Coordinate pairs of a WKT string
+COORDINATE_PATTERN = re.compile(
+    r"(-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)\s+(-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)"
+)
+
+
+def get_geometry_property_names(schema: Optional[Dict] = None) -> Set[str]:
+    """Get the names of the properties holding geometries, from the schema's spatial layers."""
+    if not schema:
+        return set(DEFAULT_GEOMETRY_PROPERTIES)
+    return set(get_geometry_properties(schema).values()) or set(
+        DEFAULT_GEOMETRY_PROPERTIES
+    )
+
+
+def summarize_wkt(wkt: str) -> Dict:
+    """
+    Summarize a WKT geometry without parsing it into shapes.
+
+    Args:
+        wkt: WKT string, e.g. "MULTIPOLYGON (((-117.1 32.7, ...)))"
+
+    Returns:
+        dict: Geometry "type", number of "vertices" and "bbox" as [min x, min y, max x, max y]
+    """
+    geometry_type = wkt.lstrip().split("(", 1)[0].strip().upper() or None
+    xs, ys = [], []
+    for x, y in COORDINATE_PATTERN.findall(wkt):
+        xs.append(float(x))
+        ys.append(float(y))
+
+    summary = {"type": geometry_type, "vertices": len(xs)}
+    if xs:
+        summary["bbox"] = [
+            round(min(xs), 5),
+            round(min(ys), 5),
+            round(max(xs), 5),
+            round(max(ys), 5),
+        ]
+    return summary
+
+
+def project_properties(
+    properties: Iterable[Tuple[str, Any]], geometry_properties: Set[str]
+) -> Tuple[Dict, Dict]:
+    """
+    Split the properties of a node or relationship into scalar properties and geometry summaries,
+    so geometries only reach the map and the LLM gets compact stats.
+
+    Args:
+        properties: (name, value) pairs
+        geometry_properties: Names of the properties holding WKT geometries
+
+    Returns:
+        tuple: (scalar properties, {geometry property: summary})
+    """
+    scalars, geometries = {}, {}
+    for name, value in properties:
+        if name in geometry_properties and isinstance(value, str):
+            geometries[name] = summarize_wkt(value)
+        else:
+            scalars[name] = value
+    return scalars, geometries
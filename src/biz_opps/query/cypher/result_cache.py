@@ -0,0 +1,129 @@
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+import re
+import threading
+import time
+
+# Default bounds of the result cache
+DEFAULT_CACHE_BYTES = 64_000_000
+DEFAULT_CACHE_TTL_SECONDS = 600
+
+# Estimated size of a cached node or relationship besides its properties, in bytes
+ENTITY_OVERHEAD_BYTES = 200
+
+# String literals, and runs of comments and whitespace of a Cypher query
+CYPHER_TOKEN_PATTERN = re.compile(
+    r"""('(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|`[^`]*`)|((?:\s+|//[^\n]*|/\*.*?\*/)+)""",
+    re.DOTALL,
+)
+
+# Clauses of queries that write to the graph, whose results must not be cached
+WRITE_CLAUSE_PATTERN = re.compile(
+    r"\b(CREATE|MERGE|DELETE|SET|REMOVE|DROP|FOREACH|LOAD\s+CSV)\b", re.IGNORECASE
+)
+
+
+def is_cacheable(cypher: str) -> bool:
+    """Check that a query has no write clause outside its string literals."""
+    without_literals = CYPHER_TOKEN_PATTERN.sub(
+        lambda match: " " if match.group(1) is None else "''", cypher
+    )
+    return WRITE_CLAUSE_PATTERN.search(without_literals) is None
+
+
+def normalize_cypher(cypher: str) -> str:
+    """
+    Normalize a Cypher query for use as a cache key: comments are removed, whitespace runs
+    outside string literals collapse to one space and the trailing semicolon is dropped.
+
+    Args:
+        cypher: Cypher query
+
+    Returns:
+        str: Normalized query
+    """
+
+    normalized = CYPHER_TOKEN_PATTERN.sub(
+        lambda match: match.group(1) if match.group(1) is not None else " ", cypher
+    )
+    return normalized.strip().rstrip(";").rstrip()
+
+
+class ResultCache:
+    """
+    LRU cache of query results with a time to live and a bound on their estimated size.
+    Keys include the graph version, so results of a graph rewritten by the ETL are never served.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_CACHE_BYTES,
+        ttl_seconds: float = DEFAULT_CACHE_TTL_SECONDS,
+    ):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a cached value, or None if it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, key: Hashable, value: Any, size: int):
+        """
+        Cache a value, evicting the least recently used values beyond the size bound.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            size: Estimated size of the value in bytes
+        """
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, size, value)
+            self.bytes += size
+
+            while self.bytes > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def _remove(self, key: Hashable):
+        """Remove an entry, the lock must be held."""
+        _, size, _ = self._entries.pop(key)
+        self.bytes -= size
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict:
+        """Get the hit, miss and eviction counters and the current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+            }
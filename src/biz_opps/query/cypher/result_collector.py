@@ -0,0 +1,166 @@
+from typing import Any, Dict, List, Optional
+import re
+
+from neo4j.graph import Node, Path, Relationship
+
+# Default caps of a query result
+DEFAULT_MAX_RECORDS = 1000
+DEFAULT_MAX_NODES = 2000
+DEFAULT_MAX_BYTES = 5_000_000
+
+# Estimated size of non-string property values, in bytes
+SCALAR_BYTES = 8
+
+
+def inject_limit(cypher: str, limit: int) -> Optional[str]:
+    """
+    Add a LIMIT to a query whose final RETURN has none, so the database stops producing rows
+    the executor would discard anyway.
+
+    Args:
+        cypher: Cypher query
+        limit: Maximum number of records
+
+    Returns:
+        str: The query with a LIMIT, or None if it already has one or cannot safely get one
+            (no RETURN, or a UNION where the LIMIT would only apply to the last part)
+    """
+    query = cypher.strip().rstrip(";").rstrip()
+    if re.search(r"\bUNION\b", query, re.IGNORECASE):
+        return None
+
+    returns = list(re.finditer(r"\bRETURN\b", query, re.IGNORECASE))
+    if not returns:
+        return None
+
+    final_return = query[returns[-1].end() :]
+    # A RETURN inside a subquery is followed by its closing brace
+    if "}" in final_return or re.search(r"\bLIMIT\b", final_return, re.IGNORECASE):
+        return None
+
+    return f"{query}\nLIMIT {limit}"
+
+
+def estimate_size(value: Any) -> int:
+    """Estimate the size of a property value in bytes, e.g. the length of a WKT string."""
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_size(item) for item in value)
+    if isinstance(value, dict):
+        return sum(len(key) + estimate_size(item) for key, item in value.items())
+    return SCALAR_BYTES
+
+
+class ResultGraph:
+    """Nodes and relationships collected from the records of a query."""
+
+    def __init__(self):
+        self._nodes: Dict[str, Node] = {}
+        self._relationships: Dict[str, Relationship] = {}
+
+    @property
+    def nodes(self) -> List[Node]:
+        return list(self._nodes.values())
+
+    @property
+    def relationships(self) -> List[Relationship]:
+        return list(self._relationships.values())
+
+
+class ResultCollector:
+    """
+    Collects the graph of a query record by record and stops once a record, node or byte cap
+    would be exceeded, so runaway queries never get fully pulled into memory.
+    """
+
+    def __init__(
+        self,
+        max_records: int = DEFAULT_MAX_RECORDS,
+        max_nodes: int = DEFAULT_MAX_NODES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.max_records = max_records
+        self.max_nodes = max_nodes
+        self.max_bytes = max_bytes
+        self.graph = ResultGraph()
+        self.records = 0
+        self.bytes = 0
+        self.truncated_by = None
+
+    def _entities(self, value: Any, nodes: Dict, relationships: Dict):
+        """Gather the nodes and relationships of a record value."""
+        if isinstance(value, Node):
+            nodes[value.element_id] = value
+        elif isinstance(value, Relationship):
+            relationships[value.element_id] = value
+            for node in (value.start_node, value.end_node):
+                if node is not None:
+                    nodes[node.element_id] = node
+        elif isinstance(value, Path):
+            for node in value.nodes:
+                nodes[node.element_id] = node
+            for relationship in value.relationships:
+                relationships[relationship.element_id] = relationship
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                self._entities(item, nodes, relationships)
+        elif isinstance(value, dict):
+            for item in value.values():
+                self._entities(item, nodes, relationships)
+
+    def add(self, record) -> bool:
+        """
+        Add the nodes and relationships of a record, unless that would exceed a cap.
+
+        Returns:
+            bool: False if the record was rejected and collection should stop
+        """
+        if self.records >= self.max_records:
+            self.truncated_by = "max_records"
+            return False
+
+        nodes, relationships = {}, {}
+        for value in record.values():
+            self._entities(value, nodes, relationships)
+
+        new_nodes = {
+            element_id: node
+            for element_id, node in nodes.items()
+            if element_id not in self.graph._nodes
+        }
+        new_relationships = {
+            element_id: relationship
+            for element_id, relationship in relationships.items()
+            if element_id not in self.graph._relationships
+        }
+
+        if len(self.graph._nodes) + len(new_nodes) > self.max_nodes:
+            self.truncated_by = "max_nodes"
+            return False
+
+        record_bytes = sum(
+            estimate_size(dict(entity.items()))
+            for entity in [*new_nodes.values(), *new_relationships.values()]
+        )
+        if self.bytes + record_bytes > self.max_bytes:
+            self.truncated_by = "max_bytes"
+            return False
+
+        self.graph._nodes.update(new_nodes)
+        self.graph._relationships.update(new_relationships)
+        self.records += 1
+        self.bytes += record_bytes
+        return True
+
+    def get_truncation(self, limit_injected: bool = False) -> Dict:
+        """Describe what was collected and whether the result was cut short."""
+        return {
+            "truncated": self.truncated_by is not None,
+            "reason": self.truncated_by,
+            "records": self.records,
+            "nodes": len(self.graph._nodes),
+            "relationships": len(self.graph._relationships),
+            "bytes": self.bytes,
+            "limit_injected": limit_injected,
+        }
@@ -0,0 +1,105 @@
+from typing import Dict, List
+
+# Properties with at most this many distinct values are profiled as categories
+MAX_CATEGORIES = 20
+
+# Quantiles of numeric properties
+QUANTILES = [0.25, 0.5, 0.75]
+
+
+def _profile_properties(rows: List[Dict]) -> Dict:
+    """
+    Profile the properties of nodes or relationships sharing a label or type.
+
+    Returns:
+        dict: {"numeric": {property: stats}, "categorical": {property: {value: count}}}
+    """
+    # pandas is only needed once a result is profiled, not to import the query engine
+    import pandas as pd
+
+    df = pd.DataFrame(rows)
+    numeric, categorical = {}, {}
+    for column in df.columns:
+        values = df[column].dropna()
+        if values.empty:
+            continue
+
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(
+            values
+        ):
+            quantiles = values.quantile(QUANTILES)
+            numeric[column] = {
+                "count": int(values.count()),
+                "mean": float(values.mean()),
+                "min": float(values.min()),
+                **{f"p{int(q * 100)}": float(quantiles[q]) for q in QUANTILES},
+                "max": float(values.max()),
+            }
+            continue
+
+        try:
+            distinct = values.nunique()
+        except TypeError:
+            # Lists and maps cannot be counted
+            continue
+        if distinct <= MAX_CATEGORIES and (distinct < len(values) or len(values) == 1):
+            categorical[column] = {
+                str(value): int(count) for value, count in values.value_counts().items()
+            }
+
+    return {"numeric": numeric, "categorical": categorical}
+
+
+def profile_result(parsed_graph: Dict) -> Dict:
+    """
+    Compute exact statistics of a query result: counts per node label and relationship type,
+    numeric min/max/mean/quantiles and histograms of categorical (e.g. enum) properties.
+
+    Args:
+        parsed_graph: Parsed graph returned by CypherExecutor.execute_query
+
+    Returns:
+        dict: {"nodes": {label: profile}, "relationships": {rel_type: profile}}, each profile
+            with its "count", "numeric" and "categorical" properties
+    """
+    nodes_by_label = {}
+    for node in parsed_graph["nodes"]:
+        for label in node["labels"]:
+            nodes_by_label.setdefault(label, []).append(node["properties"])
+
+    rels_by_type = {}
+    for rel in parsed_graph["relationships"]:
+        rels_by_type.setdefault(rel["type"], []).append(rel["properties"])
+
+    groups_by_section = {"nodes": nodes_by_label, "relationships": rels_by_type}
+    return {
+        section: {
+            name: {"count": len(rows), **_profile_properties(rows)}
+            for name, rows in groups.items()
+        }
+        for section, groups in groups_by_section.items()
+    }
+
+
+def format_profile(profile: Dict) -> str:
+    """Format a result profile as LLM context."""
+    lines = []
+    for section, title in [("nodes", "Nodes"), ("relationships", "Relationships")]:
+        for name, stats in profile[section].items():
+            lines.append(f"\n{name} {title} ({stats['count']}):")
+            for prop, values in stats["numeric"].items():
+                quantiles = ", ".join(
+                    f"p{int(q * 100)} {values[f'p{int(q * 100)}']:.4g}"
+                    for q in QUANTILES
+                )
+                lines.append(
+                    f"  - {prop}: mean {values['mean']:.4g}, min {values['min']:.4g}, "
+                    f"{quantiles}, max {values['max']:.4g} (n={values['count']})"
+                )
+            for prop, counts in stats["categorical"].items():
+                histogram = ", ".join(
+                    f"{value}: {count}" for value, count in counts.items()
+                )
+                lines.append(f"  - {prop}: {histogram}")
+
+    return "\n".join(lines) if lines else "No nodes or relationships returned."
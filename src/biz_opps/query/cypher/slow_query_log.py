@@ -0,0 +1,198 @@
+from typing import Dict, List, Optional
+import json
+import os
+import sqlite3
+import threading
+
+from biz_opps.utils.file import get_root_dir
+
+DEFAULT_LOG_PATH = os.path.join(get_root_dir(), "data", "logs", "slow_queries.sqlite")
+
+# Columns the offenders can be ranked by
+RANKING_COLUMNS = {
+    "wall_ms": "AVG(wall_ms)",
+    "db_hits": "AVG(db_hits)",
+    "total_ms": "SUM(wall_ms)",
+    "count": "COUNT(*)",
+}
+
+
+def summarize_profile(profile: Optional[Dict]) -> Optional[Dict]:
+    """
+    Keep the operator tree of a PROFILE plan, with the db hits and rows of every operator.
+
+    Args:
+        profile: Profiled plan of a result summary
+
+    Returns:
+        dict: Operator tree of "operator", "db_hits", "rows" and "children", or None
+    """
+    if not profile:
+        return None
+    return {
+        # Operator types are suffixed with the database, e.g. "NodeByLabelScan@neo4j"
+        "operator": profile.get("operatorType", "").split("@")[0],
+        "db_hits": profile.get("dbHits", 0),
+        "rows": profile.get("rows", 0),
+        "children": [summarize_profile(child) for child in profile.get("children", [])],
+    }
+
+
+def get_total_db_hits(plan: Optional[Dict]) -> int:
+    """Sum the db hits of an operator tree returned by summarize_profile."""
+    if not plan:
+        return 0
+    return plan["db_hits"] + sum(get_total_db_hits(child) for child in plan["children"])
+
+
+def get_hot_operators(plan: Optional[Dict], limit: int = 3) -> List[Dict]:
+    """Get the operators of an operator tree with the most db hits."""
+    operators, stack = [], [plan] if plan else []
+    while stack:
+        operator = stack.pop()
+        operators.append(operator)
+        stack.extend(operator["children"])
+    return sorted(operators, key=lambda operator: -operator["db_hits"])[:limit]
+
+
+class SlowQueryLog:
+    """
+    On-disk log of profiled queries: wall time, db hits, rows and operator tree. Safe to share
+    between concurrent queries of a process.
+    """
+
+    def __init__(self, path: str = DEFAULT_LOG_PATH):
+        """
+        Open (or create) the log.
+
+        Args:
+            path: Path of the SQLite log file.
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS queries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                cypher TEXT NOT NULL,
+                normalized TEXT NOT NULL,
+                reason TEXT NOT NULL,
+                wall_ms REAL NOT NULL,
+                db_hits INTEGER,
+                rows INTEGER,
+                plan TEXT,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+            """)
+        self._connection.commit()
+
+    def record(
+        self,
+        cypher: str,
+        normalized: str,
+        reason: str,
+        wall_ms: float,
+        plan: Optional[Dict] = None,
+        rows: Optional[int] = None,
+    ):
+        """
+        Log a query.
+
+        Args:
+            cypher: Executed Cypher query
+            normalized: Normalized query, grouping the executions of a query
+            reason: Why the query was logged, "sampled" or "slow"
+            wall_ms: Wall time of the execution, in milliseconds
+            plan: Operator tree returned by summarize_profile, None if the query was not profiled
+            rows: Rows returned by an execution that was not profiled
+        """
+        if plan:
+            rows = plan["rows"]
+        with self._lock:
+            self._connection.execute(
+                """
+                INSERT INTO queries (cypher, normalized, reason, wall_ms, db_hits, rows, plan)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    cypher,
+                    normalized,
+                    reason,
+                    wall_ms,
+                    get_total_db_hits(plan) if plan else None,
+                    rows,
+                    json.dumps(plan) if plan else None,
+                ),
+            )
+            self._connection.commit()
+
+    def top_offenders(
+        self, by: str = "wall_ms", limit: int = 10, since_days: Optional[float] = None
+    ) -> List[Dict]:
+        """
+        Rank the logged queries, grouped by normalized query.
+
+        Args:
+            by: Ranking, one of RANKING_COLUMNS
+            limit: Maximum number of queries
+            since_days: Only consider queries logged in this many last days
+
+        Returns:
+            list: Dicts with the "cypher", "count", "avg_ms", "max_ms", "avg_db_hits",
+                "max_rows", "last_seen" and latest operator tree ("plan") of each query
+        """
+        if by not in RANKING_COLUMNS:
+            raise ValueError(
+                f"Unknown ranking {by}, expected one of {list(RANKING_COLUMNS)}"
+            )
+
+        where, parameters = "", []
+        if since_days is not None:
+            where = "WHERE created_at >= datetime('now', ?)"
+            parameters.append(f"-{since_days} days")
+
+        with self._lock:
+            rows = self._connection.execute(
+                f"""
+                SELECT normalized, COUNT(*), AVG(wall_ms), MAX(wall_ms), AVG(db_hits),
+                    MAX(rows), MAX(created_at),
+                    (SELECT plan FROM queries AS latest
+                     WHERE latest.normalized = queries.normalized AND latest.plan IS NOT NULL
+                     ORDER BY latest.id DESC LIMIT 1)
+                FROM queries
+                {where}
+                GROUP BY normalized
+                ORDER BY {RANKING_COLUMNS[by]} DESC
+                LIMIT ?
+                """,
+                (*parameters, limit),
+            ).fetchall()
+
+        return [
+            {
+                "cypher": normalized,
+                "count": count,
+                "avg_ms": avg_ms,
+                "max_ms": max_ms,
+                "avg_db_hits": avg_db_hits,
+                "max_rows": max_rows,
+                "last_seen": last_seen,
+                "plan": json.loads(plan) if plan else None,
+            }
+            for (
+                normalized,
+                count,
+                avg_ms,
+                max_ms,
+                avg_db_hits,
+                max_rows,
+                last_seen,
+                plan,
+            ) in rows
+        ]
+
+    def close(self):
+        """Close the log."""
+        with self._lock:
+            self._connection.close()
@@ -1,12 +1,20 @@
-from typing import Dict, Optional, List, Union
-
-from neo4j import graph
+from typing import AsyncIterator, Dict, Optional, List, Union
+import asyncio
 
+from biz_opps.query.context.context_assembler import (
+    DEFAULT_MAX_CONTEXT_TOKENS,
+    ContextAssembler,
+)
 from biz_opps.query.context.schema_loader import SchemaLoader
 from biz_opps.query.context.doc_loader import DocumentationLoader
 from biz_opps.query.visualization.map_viewer import MapViewer
 from biz_opps.query.cypher.executor import CypherExecutor
+from biz_opps.query.cypher.linter import CypherLinter
+from biz_opps.query.cypher.result_cache import ResultCache
+from biz_opps.query.cypher.slow_query_log import SlowQueryLog
 from biz_opps.query.llm.openai_client import OpenAIClient
+from biz_opps.query.llm.question_cache import QuestionCache
+from biz_opps.query.llm.response_cache import ResponseCache
 
 
 class QueryEngine:
@@ -17,16 +25,72 @@ class QueryEngine:
         neo4j_driver,
         openai_api_key,
         verbose: bool = False,
+        two_step_cypher: bool = False,
+        context_budget: Optional[int] = DEFAULT_MAX_CONTEXT_TOKENS,
+        validate_cypher: bool = True,
+        profile_sample_rate: float = 0.0,
+        slow_query_ms: Optional[float] = None,
     ):
         self.schema_context = SchemaLoader(verbose=verbose)
         self.doc_loader = DocumentationLoader(verbose=verbose)
+        # Prompts only get the schema and documents relevant to the question, None for all
+        self.context_assembler = (
+            ContextAssembler(
+                self.schema_context.registry,
+                self.doc_loader,
+                max_tokens=context_budget,
+                verbose=verbose,
+            )
+            if context_budget
+            else None
+        )
+        # Repeated questions are answered from cached results until the ETL writes the graph
+        self.result_cache = ResultCache()
         self.cypher_executor = CypherExecutor(
-            neo4j_driver, self.schema_context.schema, verbose=verbose
+            neo4j_driver,
+            self.schema_context.schema,
+            verbose=verbose,
+            result_cache=self.result_cache,
+            # Sampled and slow queries are profiled into data/logs/slow_queries.sqlite
+            slow_query_log=(
+                SlowQueryLog()
+                if profile_sample_rate or slow_query_ms is not None
+                else None
+            ),
+            profile_sample_rate=profile_sample_rate,
+            slow_query_ms=slow_query_ms,
         )
-        self.openai_client = OpenAIClient(api_key=openai_api_key, verbose=verbose)
-        self.map_viewer = MapViewer(verbose=verbose)
+        self.openai_client = OpenAIClient(
+            api_key=openai_api_key,
+            verbose=verbose,
+            response_cache=ResponseCache(),
+            two_step=two_step_cypher,
+        )
+        # Paraphrased questions reuse the Cypher of earlier questions
+        self.question_cache = QuestionCache()
+        # Generated Cypher is linted and planned before it runs, and repaired once if invalid
+        self.validate_cypher = validate_cypher
         self.verbose = verbose
 
+    async def _validate(self, cypher: str) -> List[str]:
+        """
+        Check a Cypher query against the schema, then plan it with EXPLAIN.
+
+        Returns:
+            list: Problems of the query, empty if it is valid
+        """
+        linter = self.schema_context.registry.view("cypher_linter", CypherLinter)
+        issues = linter.lint(cypher)
+        issues += await self.cypher_executor.explain(cypher)
+        return issues
+
+    def _show_map(self, graph):
+        """Show the spatial nodes of a result on a map."""
+        # A new map per query, so a long-running engine does not accumulate layers
+        map_viewer = MapViewer(verbose=self.verbose)
+        map_viewer.add_results(graph)
+        map_viewer.show()
+
     async def process_query(
         self,
         query: str,
@@ -42,6 +106,39 @@ class QueryEngine:
             include_docs: Optional list of document names to include as context.
                 Defaults to all documents.
         """
+        async for event in self.process_query_stream(
+            query, additional_context, include_docs
+        ):
+            if event["stage"] == "result":
+                return event["result"]
+
+    async def process_query_stream(
+        self,
+        query: str,
+        additional_context: Optional[Union[Dict[str, str], str]] = None,
+        include_docs: Optional[List[str]] = None,
+    ) -> AsyncIterator[Dict]:
+        """
+        Process natural language query end-to-end, yielding an event as each stage completes.
+        The Cypher completion is structured JSON and not streamed, a "generating" event is
+        yielded before it so clients can show progress.
+
+        Args:
+            query: Natural language query
+            additional_context: Optional textual additional context
+            include_docs: Optional list of document names to include as context.
+                Defaults to all documents.
+
+        Yields:
+            dict: Events with their "stage":
+                - "generating": the Cypher is being generated, not sent for reused Cypher
+                - "plan": "analysis" of the question
+                - "validation": "issues" of the generated Cypher, which is then repaired once
+                - "cypher": "cypher" query, its "reasoning" and whether it was "cached"
+                - "rows": numbers of "records", "nodes" and "relationships" and the "truncation"
+                - "interpretation": "delta" of the interpretation text, as it is generated
+                - "result": final "result", as returned by process_query (also on errors)
+        """
         try:
             if not query:
                 raise ValueError("Query cannot be empty")
@@ -49,66 +146,129 @@ class QueryEngine:
             print(f"\nProcessing query: {query}")
 
             # Get schema and documentation context
-            schema_context = self.schema_context.get_formatted_context()
-            if include_docs:
-                doc_context = self.doc_loader.get_context_docs(include_docs)
+            if self.context_assembler:
+                context = self.context_assembler.assemble(
+                    query, additional_context, include_docs
+                )
             else:
-                doc_context = self.doc_loader.get_context_docs()
+                if include_docs:
+                    doc_context = self.doc_loader.get_context_docs(include_docs)
+                else:
+                    doc_context = self.doc_loader.get_context_docs()
 
-            # Combine contexts
-            context = {
-                "schema": schema_context,
-                **doc_context,
-            }
+                # Combine contexts
+                context = {
+                    "schema": self.schema_context.get_formatted_context(),
+                    **doc_context,
+                }
+            schema_context = context["schema"]
 
             # Add additional context if provided
             if additional_context:
                 context["additional"] = additional_context
 
-            # Generate and parse Cypher query
-            query_info = await self.openai_client.generate_cypher(query, context)
+            # Reuse the Cypher of a similar question, or generate and parse a Cypher query
+            schema_version = self.schema_context.registry.version
+            query_info = self.question_cache.lookup(
+                query, additional_context, schema_version, include_docs
+            )
+            if query_info is not None:
+                print(
+                    f"Reusing Cypher of similar question: {query_info['cached_question']}"
+                )
+            else:
+                yield {"stage": "generating"}
+                query_info = await self.openai_client.generate_cypher(query, context)
 
             if not query_info["cypher"]:
                 raise ValueError("No valid Cypher query generated")
 
+            yield {"stage": "plan", "analysis": query_info.get("analysis")}
+
+            # Cached Cypher already executed successfully
+            if self.validate_cypher and "cached_question" not in query_info:
+                issues = await self._validate(query_info["cypher"])
+                if issues:
+                    print(f"Generated Cypher is invalid: {issues}")
+                    yield {"stage": "validation", "issues": issues}
+                    query_info = await self.openai_client.repair_cypher(
+                        query, context, query_info, issues
+                    )
+                    if not query_info["cypher"]:
+                        raise ValueError("No valid Cypher query generated")
+            yield {
+                "stage": "cypher",
+                "cypher": query_info["cypher"],
+                "reasoning": query_info["reasoning"],
+                "cached": "cached_question" in query_info,
+            }
+
             # Execute query and get graph
             graph, parsed_graph = await self.cypher_executor.execute_query(
                 query_info["cypher"]
             )
 
-            # Interpret results
-            results_info = await self.openai_client.interpret_results(
-                parsed_graph, query, query_info, schema_context
-            )
+            # Only Cypher that executed is reused
+            if "cached_question" not in query_info:
+                self.question_cache.add(
+                    query, additional_context, schema_version, query_info, include_docs
+                )
+
+            yield {
+                "stage": "rows",
+                "records": parsed_graph["truncation"]["records"],
+                "nodes": len(parsed_graph["nodes"]),
+                "relationships": len(parsed_graph["relationships"]),
+                "truncation": parsed_graph["truncation"],
+            }
 
             # Determine if visualization is needed
-            needs_viz = self.map_viewer.needs_visualization(graph)
+            needs_viz = MapViewer.needs_visualization(graph)
 
             print(f"Needs visualization: {needs_viz}")
 
+            # The map only depends on the result, build it while the interpretation streams
+            map_future = None
             if needs_viz:
                 if self.verbose:
                     print("\nCreating visualization...")
+                # Building the map is synchronous, keep it off the event loop
+                loop = asyncio.get_running_loop()
+                map_future = loop.run_in_executor(None, self._show_map, graph)
 
-                self.map_viewer.add_results(graph)
-                self.map_viewer.show()
+            try:
+                deltas = []
+                async for delta in self.openai_client.stream_interpretation(
+                    parsed_graph, query, query_info, schema_context
+                ):
+                    deltas.append(delta)
+                    yield {"stage": "interpretation", "delta": delta}
+                results_info = self.openai_client.parse_interpretation("".join(deltas))
+            except Exception as e:
+                results_info = self.openai_client.interpretation_error(e)
+
+            if map_future is not None:
+                await map_future
 
             if self.verbose:
                 print("\nQuery processing complete")
 
-            return {
+            result = {
                 "query": query_info["cypher"],
                 "reasoning": query_info["reasoning"],
                 "interpretation": results_info["interpretation"],
                 "suggested_queries": results_info["suggested_queries"],
+                "truncation": parsed_graph["truncation"],
             }
 
         except Exception as e:
             if self.verbose:
                 print(f"\nError processing query: {str(e)}")
-            return {
+            result = {
                 "error": str(e),
                 "query": query,
                 "context_used": bool(additional_context),
                 "docs_used": include_docs or [],
             }
+
+        yield {"stage": "result", "result": result}
@@ -1,7 +1,169 @@
+import json
 import os
+from functools import lru_cache
 from openai import AsyncOpenAI
-from typing import Dict, Optional
-from neo4j import graph
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from biz_opps.query.cypher.result_profiler import format_profile, profile_result
+from biz_opps.query.llm.response_cache import ResponseCache, get_response_key
+
+# System prompt of the query analysis step
+ANALYSIS_PROMPT = """You are a Neo4j query planner. 
+
+IMPORTANT SCHEMA GUIDELINES:
+1. Spatial Data Availability:
+   - BlockGroups and Zipcodes: Have polygon geometries (EditableLayerImpl)
+   - Businesses: Have point geometries (SimplePointLayer)
+   - Cities and Neighborhoods: NO geometries - must use IS_WITHIN relationships
+
+2. Spatial Operations:
+   - spatial.intersects()
+   - spatial.closest()
+   - spatial.bbox()
+   - spatial.withinDistance()
+   - For Cities/Neighborhoods: Must query through IS_WITHIN relationships to Zipcodes
+
+3. Relationship Patterns:
+   - IS_WITHIN flows FROM (BlockGroup/City/Neighborhood) TO (Zipcode)
+   - BlockGroups->IS_WITHIN->Zipcode has overlap_ratio property
+   - Cities/Neighborhoods/BlockGroups->IS_WITHIN->Zipcode has containment_type property (Partial, Full)
+
+4. CRITICAL ENRICHMENT RULES:
+   - ONLY BlockGroups have HAS_ENRICHMENT relationships
+   - Cities and Neighborhoods MUST be mapped to enrichments through their contained BlockGroups
+   - Pattern for City/Neighborhood enrichments:
+     (City/Neighborhood)-[:IS_WITHIN]->(Zipcode)<-[:IS_WITHIN]-(BlockGroup)-[:HAS_ENRICHMENT]->(Enrichment)
+   - Aggregate BlockGroup enrichments to understand City/Neighborhood characteristics
+
+5. Schema Adherence:
+   - Use ONLY properties defined in the schema
+   - Match enum values EXACTLY as specified
+   - Follow property types (STRING, FLOAT, etc.)
+   - Use correct property names as defined
+
+Analyze the query requirements focusing on:
+1. What data needs to be retrieved
+2. Which node types and relationships are involved
+3. Whether spatial operations are needed and which type
+4. What constraints or filters should be applied
+5. Any enrichment categories that need to be matched
+6. For City/Neighborhood queries: How to properly map to BlockGroup enrichments
+
+Be specific about the requirements and verify all properties against the schema."""
+
+# System prompt guidelines of the Cypher generation
+CYPHER_GUIDELINES = """You are a Neo4j query expert. Generate a Cypher query following these guidelines:
+
+1. Spatial Query Patterns:
+   - spatial.intersects()
+   - spatial.closest()
+   - spatial.bbox()
+   - spatial.withinDistance()
+   - For Cities/Neighborhoods leverage IS_WITHIN relationships to Zipcodes
+
+2. CRITICAL ENRICHMENT PATTERNS:
+   - ONLY BlockGroups have direct HAS_ENRICHMENT relationships
+   - For City/Neighborhood enrichment queries:
+     MATCH (area:City|Neighborhood)-[:IS_WITHIN]->(z:Zipcode)<-[:IS_WITHIN]-(bg:BlockGroup)-[:HAS_ENRICHMENT]->(e:EnrichmentType)
+   - Consider using COUNT, AVG, or other aggregations to summarize BlockGroup enrichments
+   - Example City enrichment query:
+     MATCH (c:City)-[:IS_WITHIN]->(z:Zipcode)<-[:IS_WITHIN]-(bg:BlockGroup)
+     MATCH (bg)-[:HAS_ENRICHMENT]->(e:EnrichmentType)
+     WITH c, e.category as cat, COUNT(bg) as count
+     ORDER BY count DESC
+
+3. Common Patterns:
+   - Finding businesses in a city: 
+     MATCH (c:City)-[:IS_WITHIN]->(z:Zipcode)<-[:IS_WITHIN]-(bg:BlockGroup)
+   - Spatial with demographics:
+     MATCH (bg:BlockGroup)-[:HAS_ENRICHMENT]->(e:EnrichmentType)
+     WHERE spatial.intersects('block_group_layer', bg.wkt)
+
+4. Schema Validation:
+   - Verify all property names against schema
+   - Use exact enum values from schema
+   - Follow property types (STRING, FLOAT, etc.)
+   - Include only valid relationships
+   - Return complete nodes (not just properties) for spatial types to enable visualization"""
+
+# Response format of the two-step Cypher generation
+CYPHER_FORMAT = """IMPORTANT: Your response must be in this format:
+```cypher
+YOUR_QUERY_HERE
+```
+
+REASONING:
+Explain how the query works and why it will answer the original question.
+Include confirmation that all properties and enums match schema exactly."""
+
+# Response format of the single-call Cypher generation
+PLAN_FORMAT = """IMPORTANT: Answer in a single response. First analyze the query as a query planner
+would, then write the Cypher query and explain it. Respond with a JSON object with these keys:
+- "analysis": What data, node types, relationships, spatial operations and filters the query needs
+- "cypher": The Cypher query, without code fences
+- "reasoning": How the query works and why it will answer the original question, including
+  confirmation that all properties and enums match schema exactly"""
+
+# Structured output schema of the single-call Cypher generation
+PLAN_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "cypher_plan",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "analysis": {"type": "string"},
+                "cypher": {"type": "string"},
+                "reasoning": {"type": "string"},
+            },
+            "required": ["analysis", "cypher", "reasoning"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+# System prompt of the result interpretation
+INTERPRETATION_PROMPT = """You are a business analyst interpreting Neo4j query results.
+
+TASK:
+1. Explain what the results mean in relation to the original query
+2. Highlight key insights and patterns
+3. Suggest 2-3 follow-up questions that can be answered using our schema
+
+FORMAT YOUR RESPONSE AS:
+Interpretation: [Your interpretation of the results]
+
+Suggested Follow-up Questions:
+1. [Question that uses available data]
+2. [Question that uses available data]
+3. [Question that uses available data]"""
+
+# Instructions of each call, which open its prompt
+SINGLE_CALL_INSTRUCTIONS = (ANALYSIS_PROMPT, f"{CYPHER_GUIDELINES}\n\n{PLAN_FORMAT}")
+ANALYSIS_INSTRUCTIONS = (ANALYSIS_PROMPT,)
+CYPHER_INSTRUCTIONS = (f"{CYPHER_GUIDELINES}\n\n{CYPHER_FORMAT}",)
+INTERPRETATION_INSTRUCTIONS = (INTERPRETATION_PROMPT,)
+
+
+@lru_cache(maxsize=32)
+def get_prefix_messages(instructions: Tuple[str, ...], schema: str) -> Tuple[Dict, ...]:
+    """
+    Get the stable prefix of a prompt: the system messages of its instructions followed by the
+    schema context. Every prompt opens with its prefix, so provider-side prompt caching matches
+    it across queries, and each prefix is only built once per schema.
+
+    Args:
+        instructions: System prompts of the call
+        schema: Schema context
+
+    Returns:
+        tuple: System messages, which must not be modified
+    """
+    return (
+        *({"role": "system", "content": content} for content in instructions),
+        {"role": "system", "content": f"Schema Context:\n{schema}"},
+    )
 
 
 class OpenAIClient:
@@ -12,10 +174,105 @@ class OpenAIClient:
         api_key: str,
         model: str = "gpt-4o-mini",
         verbose: bool = False,
+        response_cache: Optional[ResponseCache] = None,
+        two_step: bool = False,
+        client=None,
     ):
-        self.client = AsyncOpenAI(api_key=api_key)
+        """
+        Args:
+            api_key: OpenAI API key
+            model: Chat completion model
+            verbose: Whether to print verbose output
+            response_cache: Optional cache replaying the responses of deterministic calls
+            two_step: Generate Cypher with a separate analysis call before the Cypher call,
+                instead of a single structured call returning both
+            client: Optional OpenAI compatible async client, e.g. a stub for benchmarks
+        """
+        self.client = client or AsyncOpenAI(api_key=api_key)
         self.model = model
         self.verbose = verbose
+        self.response_cache = response_cache
+        self.two_step = two_step
+
+    async def _complete(
+        self,
+        messages: List[Dict],
+        temperature: float,
+        response_format: Optional[Dict] = None,
+        parse: Optional[Callable[[str], Any]] = None,
+    ) -> Any:
+        """
+        Get the content of a chat completion. Deterministic calls (temperature 0 or 0.1) are
+        answered from the response cache when the same model and messages were sent before.
+
+        Args:
+            messages: Chat messages
+            temperature: Sampling temperature
+            response_format: Optional structured output format
+            parse: Optional parser of the content, raising ValueError on a malformed response.
+                Only content it parses is cached, so a malformed completion is not replayed.
+
+        Returns:
+            The content, parsed if a parser is given
+        """
+        parse = parse or (lambda content: content)
+
+        key = None
+        if self.response_cache is not None and ResponseCache.is_cacheable(temperature):
+            key = get_response_key(
+                self.model, temperature, messages, response_format=response_format
+            )
+            content = self.response_cache.get(key)
+            if content is not None:
+                try:
+                    parsed = parse(content)
+                    if self.verbose:
+                        print("LLM response cache hit")
+                    return parsed
+                except ValueError:
+                    # Cached before it was parsed, ask again and replace it
+                    pass
+
+        options = {"response_format": response_format} if response_format else {}
+        response = await self.client.chat.completions.create(
+            model=self.model, messages=messages, temperature=temperature, **options
+        )
+        content = response.choices[0].message.content
+        parsed = parse(content)
+
+        if key is not None and content is not None:
+            self.response_cache.put(key, self.model, content)
+        return parsed
+
+    async def _stream(
+        self, messages: List[Dict], temperature: float
+    ) -> AsyncIterator[str]:
+        """
+        Stream the content of a chat completion as it is generated. Like _complete, deterministic
+        calls are answered from the response cache, in a single delta.
+        """
+        key = None
+        if self.response_cache is not None and ResponseCache.is_cacheable(temperature):
+            key = get_response_key(self.model, temperature, messages)
+            content = self.response_cache.get(key)
+            if content is not None:
+                if self.verbose:
+                    print("LLM response cache hit")
+                yield content
+                return
+
+        stream = await self.client.chat.completions.create(
+            model=self.model, messages=messages, temperature=temperature, stream=True
+        )
+        deltas = []
+        async for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                deltas.append(delta)
+                yield delta
+
+        if key is not None:
+            self.response_cache.put(key, self.model, "".join(deltas))
 
     def _summarize_nodes(self, nodes_info: list) -> str:
         """Create a summary of node information."""
@@ -25,7 +282,7 @@ class OpenAIClient:
             for label in node["labels"]:
                 if label not in nodes_by_label:
                     nodes_by_label[label] = []
-                nodes_by_label[label].append(node["properties"])
+                nodes_by_label[label].append(node)
 
         # Create summary
         summary = []
@@ -34,8 +291,14 @@ class OpenAIClient:
             # Show properties from first node as example
             if nodes:
                 summary.append("Example properties:")
-                for prop, value in nodes[0].items():
+                for prop, value in nodes[0]["properties"].items():
                     summary.append(f"  - {prop}: {value}")
+                # Geometries are summarized, never sent as WKT
+                for prop, geometry in nodes[0].get("geometries", {}).items():
+                    summary.append(
+                        f"  - {prop}: {geometry['type']} with {geometry['vertices']} "
+                        f"vertices, bbox {geometry.get('bbox')}"
+                    )
 
         return "\n".join(summary)
 
@@ -66,75 +329,102 @@ class OpenAIClient:
 
         return "\n".join(summary)
 
+    def _summarize_truncation(self, truncation: Optional[Dict]) -> str:
+        """Describe a truncated result, so partial counts are not read as totals."""
+        if not truncation or not truncation["truncated"]:
+            return ""
+        return (
+            f"Note: The result was truncated ({truncation['reason']}) after "
+            f"{truncation['records']} records, counts are lower bounds."
+        )
+
+    def _get_context_messages(self, context: Dict[str, str]) -> List[Dict]:
+        """Get the system messages of the contexts besides the schema (like spatial docs)."""
+        return [
+            {"role": "system", "content": f"{k} Context:\n{v}"}
+            for k, v in context.items()
+            if k != "schema"
+        ]
+
     async def generate_cypher(
         self,
         query: str,
         context: Dict[str, str],
     ) -> Dict[str, str]:
-        """Generate Cypher query from natural language."""
+        """
+        Generate Cypher query from natural language, with a single structured call or, in
+        two-step mode, an analysis call followed by a Cypher call.
+
+        Returns:
+            dict: "cypher", "reasoning" and "analysis"
+        """
         if self.verbose:
             print("\nGenerating Cypher query...")
             print(f"Input query: {query}")
             print("Context keys:", list(context.keys()))
 
-        # First message: Analyze the query requirements
-        analysis_messages = [
-            {
-                "role": "system",
-                "content": """You are a Neo4j query planner. 
+        if self.two_step:
+            query_info = await self._generate_cypher_two_step(query, context)
+        else:
+            query_info = await self._generate_cypher_single_call(query, context)
 
-IMPORTANT SCHEMA GUIDELINES:
-1. Spatial Data Availability:
-   - BlockGroups and Zipcodes: Have polygon geometries (EditableLayerImpl)
-   - Businesses: Have point geometries (SimplePointLayer)
-   - Cities and Neighborhoods: NO geometries - must use IS_WITHIN relationships
+        if self.verbose:
+            print("\nGenerated Cypher:")
+            print(query_info["cypher"])
+            print("\nReasoning:")
+            print(query_info["reasoning"])
 
-2. Spatial Operations:
-   - spatial.intersects()
-   - spatial.closest()
-   - spatial.bbox()
-   - spatial.withinDistance()
-   - For Cities/Neighborhoods: Must query through IS_WITHIN relationships to Zipcodes
+        return query_info
 
-3. Relationship Patterns:
-   - IS_WITHIN flows FROM (BlockGroup/City/Neighborhood) TO (Zipcode)
-   - BlockGroups->IS_WITHIN->Zipcode has overlap_ratio property
-   - Cities/Neighborhoods/BlockGroups->IS_WITHIN->Zipcode has containment_type property (Partial, Full)
+    async def _generate_cypher_single_call(
+        self, query: str, context: Dict[str, str]
+    ) -> Dict[str, str]:
+        """Analyze the query and generate its Cypher in one structured output call."""
+        plan_messages = [
+            *get_prefix_messages(SINGLE_CALL_INSTRUCTIONS, context["schema"]),
+            *self._get_context_messages(context),
+            {"role": "user", "content": query},
+        ]
 
-4. CRITICAL ENRICHMENT RULES:
-   - ONLY BlockGroups have HAS_ENRICHMENT relationships
-   - Cities and Neighborhoods MUST be mapped to enrichments through their contained BlockGroups
-   - Pattern for City/Neighborhood enrichments:
-     (City/Neighborhood)-[:IS_WITHIN]->(Zipcode)<-[:IS_WITHIN]-(BlockGroup)-[:HAS_ENRICHMENT]->(Enrichment)
-   - Aggregate BlockGroup enrichments to understand City/Neighborhood characteristics
+        plan = await self._complete(
+            plan_messages,
+            temperature=0,
+            response_format=PLAN_RESPONSE_FORMAT,
+            parse=self._parse_plan_response,
+        )
 
-5. Schema Adherence:
-   - Use ONLY properties defined in the schema
-   - Match enum values EXACTLY as specified
-   - Follow property types (STRING, FLOAT, etc.)
-   - Use correct property names as defined
+        cypher = plan.get("cypher", "").strip()
+        # Models sometimes fence the query despite the instructions
+        if cypher.startswith("```"):
+            cypher = cypher.strip("`").strip()
+            if cypher.lower().startswith("cypher"):
+                cypher = cypher[len("cypher") :].strip()
 
-Analyze the query requirements focusing on:
-1. What data needs to be retrieved
-2. Which node types and relationships are involved
-3. Whether spatial operations are needed and which type
-4. What constraints or filters should be applied
-5. Any enrichment categories that need to be matched
-6. For City/Neighborhood queries: How to properly map to BlockGroup enrichments
+        if self.verbose:
+            print("\nQuery Analysis:")
+            print(plan.get("analysis", ""))
 
-Be specific about the requirements and verify all properties against the schema.""",
-            },
-            {"role": "system", "content": f"Schema Context:\n{context['schema']}"},
+        return {
+            "cypher": cypher,
+            "reasoning": plan.get("reasoning", "").strip(),
+            "analysis": plan.get("analysis", "").strip(),
+        }
+
+    async def _generate_cypher_two_step(
+        self, query: str, context: Dict[str, str]
+    ) -> Dict[str, str]:
+        """Analyze the query, then generate its Cypher from the analysis."""
+
+        # First message: Analyze the query requirements
+        analysis_messages = [
+            *get_prefix_messages(ANALYSIS_INSTRUCTIONS, context["schema"]),
             {
                 "role": "user",
                 "content": f"Query: {query}\n\nAnalyze what's needed to answer this query.",
             },
         ]
 
-        analysis_response = await self.client.chat.completions.create(
-            model=self.model, messages=analysis_messages, temperature=0.1
-        )
-        query_analysis = analysis_response.choices[0].message.content
+        query_analysis = await self._complete(analysis_messages, temperature=0.1)
 
         if self.verbose:
             print("\nQuery Analysis:")
@@ -142,69 +432,35 @@ Be specific about the requirements and verify all properties against the schema.
 
         # Second message: Generate the Cypher query
         cypher_messages = [
-            {
-                "role": "system",
-                "content": """You are a Neo4j query expert. Generate a Cypher query following these guidelines:
-
-1. Spatial Query Patterns:
-   - spatial.intersects()
-   - spatial.closest()
-   - spatial.bbox()
-   - spatial.withinDistance()
-   - For Cities/Neighborhoods leverage IS_WITHIN relationships to Zipcodes
-
-2. CRITICAL ENRICHMENT PATTERNS:
-   - ONLY BlockGroups have direct HAS_ENRICHMENT relationships
-   - For City/Neighborhood enrichment queries:
-     MATCH (area:City|Neighborhood)-[:IS_WITHIN]->(z:Zipcode)<-[:IS_WITHIN]-(bg:BlockGroup)-[:HAS_ENRICHMENT]->(e:EnrichmentType)
-   - Consider using COUNT, AVG, or other aggregations to summarize BlockGroup enrichments
-   - Example City enrichment query:
-     MATCH (c:City)-[:IS_WITHIN]->(z:Zipcode)<-[:IS_WITHIN]-(bg:BlockGroup)
-     MATCH (bg)-[:HAS_ENRICHMENT]->(e:EnrichmentType)
-     WITH c, e.category as cat, COUNT(bg) as count
-     ORDER BY count DESC
-
-3. Common Patterns:
-   - Finding businesses in a city: 
-     MATCH (c:City)-[:IS_WITHIN]->(z:Zipcode)<-[:IS_WITHIN]-(bg:BlockGroup)
-   - Spatial with demographics:
-     MATCH (bg:BlockGroup)-[:HAS_ENRICHMENT]->(e:EnrichmentType)
-     WHERE spatial.intersects('block_group_layer', bg.wkt)
-
-4. Schema Validation:
-   - Verify all property names against schema
-   - Use exact enum values from schema
-   - Follow property types (STRING, FLOAT, etc.)
-   - Include only valid relationships
-   - Return complete nodes (not just properties) for spatial types to enable visualization
-
-IMPORTANT: Your response must be in this format:
-```cypher
-YOUR_QUERY_HERE
-```
-
-REASONING:
-Explain how the query works and why it will answer the original question.
-Include confirmation that all properties and enums match schema exactly.""",
-            },
-            {"role": "system", "content": f"Schema Context:\n{context['schema']}"},
-            {"role": "system", "content": "Query Analysis:\n" + query_analysis},
+            *get_prefix_messages(CYPHER_INSTRUCTIONS, context["schema"]),
             # Add any additional context (like spatial docs)
-            *[
-                {"role": "system", "content": f"{k} Context:\n{v}"}
-                for k, v in context.items()
-                if k != "schema"
-            ],
+            *self._get_context_messages(context),
+            # The analysis differs per query, it follows everything that can be shared
+            {"role": "system", "content": "Query Analysis:\n" + query_analysis},
             {"role": "user", "content": query},
         ]
 
-        cypher_response = await self.client.chat.completions.create(
-            model=self.model, messages=cypher_messages, temperature=0
+        cypher, reasoning = await self._complete(
+            cypher_messages, temperature=0, parse=self._parse_cypher_response
         )
 
-        # Parse response
-        content = cypher_response.choices[0].message.content
-        parts = content.split("```")
+        return {"cypher": cypher, "reasoning": reasoning, "analysis": query_analysis}
+
+    @staticmethod
+    def _parse_plan_response(content: str) -> Dict:
+        """Parse a response in PLAN_RESPONSE_FORMAT into its fields."""
+        try:
+            plan = json.loads(content)
+        except (TypeError, json.JSONDecodeError):
+            raise ValueError("Response not in expected format")
+        if not isinstance(plan, dict):
+            raise ValueError("Response not in expected format")
+        return plan
+
+    @staticmethod
+    def _parse_cypher_response(content: str) -> Tuple[str, str]:
+        """Parse a response in CYPHER_FORMAT into the Cypher query and its reasoning."""
+        parts = (content or "").split("```")
 
         if len(parts) >= 3:
             cypher = parts[1].replace("cypher", "").strip()
@@ -212,120 +468,164 @@ Include confirmation that all properties and enums match schema exactly.""",
         else:
             raise ValueError("Response not in expected format")
 
+        return cypher, reasoning
+
+    async def repair_cypher(
+        self,
+        query: str,
+        context: Dict[str, str],
+        query_info: Dict[str, str],
+        issues: List[str],
+    ) -> Dict[str, str]:
+        """
+        Ask for a corrected Cypher query once, given the problems found by validation.
+
+        Args:
+            query: Natural language query
+            context: Context the query was generated with
+            query_info: Query info returned by generate_cypher
+            issues: Problems of its Cypher query
+
+        Returns:
+            dict: "cypher", "reasoning" and "analysis" of the corrected query
+        """
         if self.verbose:
-            print("\nGenerated Cypher:")
+            print("\nRepairing Cypher query:")
+            print("\n".join(f"- {issue}" for issue in issues))
+
+        problems = "\n".join(f"- {issue}" for issue in issues)
+        repair_messages = [
+            *get_prefix_messages(CYPHER_INSTRUCTIONS, context["schema"]),
+            *self._get_context_messages(context),
+            {"role": "user", "content": query},
+            {"role": "assistant", "content": f"```cypher\n{query_info['cypher']}\n```"},
+            {
+                "role": "user",
+                "content": f"The query has these problems:\n{problems}\n\n"
+                "Fix them and answer with the corrected query in the same format.",
+            },
+        ]
+
+        cypher, reasoning = await self._complete(
+            repair_messages, temperature=0, parse=self._parse_cypher_response
+        )
+
+        if self.verbose:
+            print("\nRepaired Cypher:")
             print(cypher)
-            print("\nReasoning:")
-            print(reasoning)
 
-        return {"cypher": cypher, "reasoning": reasoning, "analysis": query_analysis}
+        return {
+            "cypher": cypher,
+            "reasoning": reasoning,
+            "analysis": query_info.get("analysis"),
+        }
 
-    async def interpret_results(
+    def _get_interpretation_messages(
         self,
         parsed_graph: Dict,
         query: str,
         query_info: Dict[str, str],
         schema_context: str,
-    ) -> Dict:
-        """Generate natural language interpretation of query results."""
-        try:
-            # Build summaries
-            nodes_summary = self._summarize_nodes(parsed_graph["nodes"])
-            rels_summary = self._summarize_relationships(parsed_graph["relationships"])
-
-            if self.verbose:
-                print("\nGenerating statistical analysis...")
-
-            # First message: Get statistical analysis
-            stats_messages = [
-                {
-                    "role": "system",
-                    "content": """You are a data analyst analyzing Neo4j graph results.
-Analyze the results focusing on:
-1. Node and relationship counts by type
-2. Important property value ranges or distributions
-3. Notable patterns in the data structure
-Be precise and quantitative.""",
-                },
-                {"role": "system", "content": f"Schema Context:\n{schema_context}"},
-                {
-                    "role": "user",
-                    "content": f"""
-Query: {query}
-Node Summary: {nodes_summary}
-Relationship Summary: {rels_summary}
-""",
-                },
+    ) -> List[Dict]:
+        """Build the interpretation prompt from local summaries of the query results."""
+        # Build summaries
+        nodes_summary = self._summarize_nodes(parsed_graph["nodes"])
+        rels_summary = self._summarize_relationships(parsed_graph["relationships"])
+        truncation_note = self._summarize_truncation(parsed_graph.get("truncation"))
+        profile = format_profile(profile_result(parsed_graph))
+
+        # The summaries are computed locally and go straight into the interpretation prompt
+        result_summary = "\n".join(
+            part
+            for part in [
+                f"Statistics (exact): {profile}",
+                f"Node Summary: {nodes_summary}",
+                f"Relationship Summary: {rels_summary}",
+                truncation_note,
             ]
+            if part
+        )
 
-            stats_response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=stats_messages,
-                temperature=0.1,
-            )
-            statistical_analysis = stats_response.choices[0].message.content
-
-            if self.verbose:
-                print("\nStatistical Analysis:")
-                print(statistical_analysis)
-                print("\nGenerating interpretation and suggestions...")
-
-            # Second message: Interpret results and suggest follow-ups
-            interpret_messages = [
-                {
-                    "role": "system",
-                    "content": """You are a business analyst interpreting Neo4j query results.
-
-TASK:
-1. Explain what the results mean in relation to the original query
-2. Highlight key insights and patterns
-3. Suggest 2-3 follow-up questions that can be answered using our schema
-
-FORMAT YOUR RESPONSE AS:
-Interpretation: [Your interpretation of the results]
+        if self.verbose:
+            print("\nResult Summary:")
+            print(result_summary)
+            print("\nGenerating interpretation and suggestions...")
 
-Suggested Follow-up Questions:
-1. [Question that uses available data]
-2. [Question that uses available data]
-3. [Question that uses available data]""",
-                },
-                {"role": "system", "content": f"Schema Context:\n{schema_context}"},
-                {
-                    "role": "user",
-                    "content": f"""
+        # Interpret results and suggest follow-ups
+        return [
+            *get_prefix_messages(INTERPRETATION_INSTRUCTIONS, schema_context),
+            {
+                "role": "user",
+                "content": f"""
 Original Query: {query}
 Cypher Used: {query_info['cypher']}
 Query Reasoning: {query_info['reasoning']}
 
-Statistical Analysis:
-{statistical_analysis}
+Result Summary:
+{result_summary}
 """,
-                },
-            ]
+            },
+        ]
 
-            interpret_response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=interpret_messages,
-                temperature=0.3,
-            )
+    @staticmethod
+    def parse_interpretation(response_text: str) -> Dict:
+        """Parse an interpretation response into the interpretation and suggestions."""
+        parts = response_text.split("Suggested Follow-up Questions:")
+
+        interpretation = parts[0].replace("Interpretation:", "").strip()
+        suggestions = parts[1].strip() if len(parts) > 1 else ""
+
+        return {
+            "interpretation": interpretation,
+            "suggested_queries": suggestions,
+        }
+
+    def interpretation_error(self, error: Exception) -> Dict:
+        """Get the results info of an interpretation that failed."""
+        if self.verbose:
+            print(f"Error interpreting results: {str(error)}")
+        return {
+            "interpretation": "Failed to interpret results",
+            "suggested_queries": "",
+            "error": str(error),
+        }
 
-            # Parse response into interpretation and suggestions
-            response_text = interpret_response.choices[0].message.content
-            parts = response_text.split("Suggested Follow-up Questions:")
+    async def interpret_results(
+        self,
+        parsed_graph: Dict,
+        query: str,
+        query_info: Dict[str, str],
+        schema_context: str,
+    ) -> Dict:
+        """Generate natural language interpretation of query results."""
+        try:
+            interpret_messages = self._get_interpretation_messages(
+                parsed_graph, query, query_info, schema_context
+            )
 
-            interpretation = parts[0].replace("Interpretation:", "").strip()
-            suggestions = parts[1].strip() if len(parts) > 1 else ""
+            # Not cached, follow-up suggestions are expected to vary
+            response_text = await self._complete(interpret_messages, temperature=0.3)
 
-            return {
-                "interpretation": interpretation,
-                "suggested_queries": suggestions,
-            }
+            return self.parse_interpretation(response_text)
 
         except Exception as e:
-            if self.verbose:
-                print(f"Error interpreting results: {str(e)}")
-            return {
-                "interpretation": "Failed to interpret results",
-                "suggested_queries": "",
-                "error": str(e),
-            }
+            return self.interpretation_error(e)
+
+    async def stream_interpretation(
+        self,
+        parsed_graph: Dict,
+        query: str,
+        query_info: Dict[str, str],
+        schema_context: str,
+    ) -> AsyncIterator[str]:
+        """
+        Stream the interpretation of query results as it is generated.
+
+        Yields:
+            str: Text deltas of the response, to be joined and parsed with parse_interpretation
+        """
+        interpret_messages = self._get_interpretation_messages(
+            parsed_graph, query, query_info, schema_context
+        )
+        async for delta in self._stream(interpret_messages, temperature=0.3):
+            yield delta
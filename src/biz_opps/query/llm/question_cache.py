@@ -0,0 +1,186 @@
+from typing import Dict, List, Optional
+import math
+import threading
+import zlib
+
+import numpy as np
+
+from biz_opps.query.text import STOPWORDS, WORD_PATTERN
+
+# Dimension of the hashed n-gram embeddings
+EMBEDDING_DIM = 4096
+
+# Minimum cosine similarity for a cached question to be reused
+DEFAULT_SIMILARITY_THRESHOLD = 0.8
+
+DEFAULT_MAX_ENTRIES = 1000
+
+
+def _features(text: str) -> List[str]:
+    """Word unigrams and bigrams, and character trigrams of each word."""
+    words = WORD_PATTERN.findall(text.lower())
+    features = [f"w:{word}" for word in words]
+    features += [f"b:{first} {second}" for first, second in zip(words, words[1:])]
+    for word in words:
+        padded = f"#{word}#"
+        features += [f"c:{padded[i : i + 3]}" for i in range(len(padded) - 2)]
+    return features
+
+
+def embed_question(text: str) -> np.ndarray:
+    """
+    Embed a question as L2-normalized hashed n-gram counts, a cheap local embedding that
+    scores paraphrases sharing most of their words and word pieces as similar.
+
+    Args:
+        text: Question
+
+    Returns:
+        np.ndarray: Embedding of EMBEDDING_DIM floats
+    """
+    counts = {}
+    for feature in _features(text):
+        # crc32 is stable across processes, unlike hash()
+        index = zlib.crc32(feature.encode("utf-8")) % EMBEDDING_DIM
+        counts[index] = counts.get(index, 0) + 1
+
+    vector = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    for index, count in counts.items():
+        vector[index] = 1 + math.log(count)
+
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def get_content_words(text: str) -> frozenset:
+    """Words of a question besides stopwords, which must match for a question to be reused."""
+    return frozenset(WORD_PATTERN.findall(text.lower())) - STOPWORDS
+
+
+class QuestionCache:
+    """
+    Maps questions to the validated Cypher generated for similar earlier questions, so
+    paraphrases skip the LLM planning calls. Questions only match when their additional
+    context, documents, content words and schema version are the same.
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._vectors = np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+        self._entries: List[Dict] = []
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _normalize_context(additional_context) -> str:
+        """Normalize the additional context of a question for exact comparison."""
+        if not additional_context:
+            return ""
+        return " ".join(str(additional_context).split()).lower()
+
+    def lookup(
+        self,
+        question: str,
+        additional_context,
+        schema_version: str,
+        include_docs: Optional[List[str]] = None,
+    ) -> Optional[Dict]:
+        """
+        Find the query info of the most similar cached question.
+
+        Args:
+            question: Natural language question
+            additional_context: Additional context of the question
+            schema_version: Version of the schema the Cypher must have been generated for
+            include_docs: Documents included as context, None for all documents
+
+        Returns:
+            dict: Query info ("cypher", "reasoning", ...) with the matched "cached_question" and
+                its "similarity", or None if no cached question is similar enough
+        """
+        vector = embed_question(question)
+        context = self._normalize_context(additional_context)
+        content_words = get_content_words(question)
+        docs = tuple(sorted(include_docs)) if include_docs else None
+
+        with self._lock:
+            if not self._entries:
+                self.misses += 1
+                return None
+
+            similarities = self._vectors @ vector
+            for index in np.argsort(-similarities):
+                similarity = float(similarities[index])
+                if similarity < self.threshold:
+                    break
+                entry = self._entries[index]
+                if (
+                    entry["schema_version"] == schema_version
+                    and entry["context"] == context
+                    and entry["docs"] == docs
+                    and entry["content_words"] == content_words
+                ):
+                    self.hits += 1
+                    return {
+                        **entry["query_info"],
+                        "cached_question": entry["question"],
+                        "similarity": similarity,
+                    }
+
+            self.misses += 1
+            return None
+
+    def add(
+        self,
+        question: str,
+        additional_context,
+        schema_version: str,
+        query_info: Dict,
+        include_docs: Optional[List[str]] = None,
+    ):
+        """
+        Cache the query info of a question whose Cypher executed successfully.
+
+        Args:
+            question: Natural language question
+            additional_context: Additional context of the question
+            schema_version: Version of the schema the Cypher was generated for
+            query_info: Query info returned by generate_cypher
+            include_docs: Documents included as context, None for all documents
+        """
+        entry = {
+            "question": question,
+            "context": self._normalize_context(additional_context),
+            "docs": tuple(sorted(include_docs)) if include_docs else None,
+            "content_words": get_content_words(question),
+            "schema_version": schema_version,
+            "query_info": {
+                "cypher": query_info["cypher"],
+                "reasoning": query_info["reasoning"],
+                "analysis": query_info.get("analysis"),
+            },
+        }
+        vector = embed_question(question)
+
+        with self._lock:
+            # The oldest questions are dropped first
+            if len(self._entries) >= self.max_entries:
+                self._entries.pop(0)
+                self._vectors = self._vectors[1:]
+            self._entries.append(entry)
+            self._vectors = np.vstack([self._vectors, vector])
+
+    def stats(self) -> Dict:
+        """Get the hit and miss counters and the number of cached questions."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+            }
@@ -0,0 +1,97 @@
+from typing import Dict, List, Optional
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+
+from biz_opps.utils.file import get_root_dir
+
+DEFAULT_CACHE_PATH = os.path.join(
+    get_root_dir(), "data", "cache", "llm_responses.sqlite"
+)
+
+# Only calls at these temperatures are (close to) deterministic and worth replaying
+CACHEABLE_TEMPERATURES = {0, 0.1}
+
+
+def get_response_key(
+    model: str,
+    temperature: float,
+    messages: List[Dict],
+    response_format: Optional[Dict] = None,
+) -> str:
+    """Hash the inputs of a chat completion into a cache key."""
+    inputs = {"model": model, "temperature": temperature, "messages": messages}
+    # Only part of the key when set, so keys of plain calls stay the same
+    if response_format:
+        inputs["response_format"] = response_format
+    payload = json.dumps(inputs, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    On-disk, content-addressed cache of chat completion responses. Safe to share between
+    concurrent queries of a process.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        """
+        Open (or create) the cache.
+
+        Args:
+            path: Path of the SQLite cache file.
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                content TEXT NOT NULL,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+            """)
+        self._connection.commit()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def is_cacheable(temperature: float) -> bool:
+        """Check whether responses at a temperature can be replayed."""
+        return temperature in CACHEABLE_TEMPERATURES
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached response content, or None if it is missing."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT content FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, model: str, content: str):
+        """Cache a response content."""
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses (key, model, content) VALUES (?, ?, ?)",
+                (key, model, content),
+            )
+            self._connection.commit()
+
+    def clear(self):
+        """Remove all cached responses."""
+        with self._lock:
+            self._connection.execute("DELETE FROM responses")
+            self._connection.commit()
+
+    def close(self):
+        """Close the cache."""
+        with self._lock:
+            self._connection.close()
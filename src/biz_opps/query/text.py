@@ -0,0 +1,33 @@
+from typing import List
+import re
+
+WORD_PATTERN = re.compile(r"\w+")
+
+# Words paraphrases may change without changing the Cypher. Every other word, e.g. "highest" or a
+# zip code, must appear in both questions.
+STOPWORDS = frozenset(
+    """a an and any are be can could do does for from has have how i in is it me might of on or
+    please show some that the there these this those to was we were what where which who why
+    with would you""".split()
+)
+
+TERM_PATTERN = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+
+def _stem(term: str) -> str:
+    """Strip plural endings, so "businesses" matches "Business"."""
+    if term.endswith("sses"):
+        return term[:-2]
+    if term.endswith("ies") and len(term) > 4:
+        return term[:-3] + "y"
+    if term.endswith("s") and not term.endswith("ss") and len(term) > 3:
+        return term[:-1]
+    return term
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split a text into lowercase, stemmed terms. camelCase and snake_case identifiers are split,
+    so "BlockGroup" and "median_income" match "block group" and "median income".
+    """
+    return [_stem(term.lower()) for term in TERM_PATTERN.findall(text)]
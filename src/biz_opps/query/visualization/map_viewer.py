@@ -1,13 +1,11 @@
 from typing import Dict, List, Any
-import folium
-from folium import plugins
 from neo4j.graph import Node, Graph
 import webbrowser
 import os
 import time
-import geopandas as gpd
-from shapely import wkt
-import pandas as pd
+
+# folium, geopandas and pandas are imported by the methods using them, so that importing this
+# module (e.g. to check whether results need a map) stays cheap
 
 
 class MapViewer:
@@ -20,6 +18,9 @@ class MapViewer:
         verbose: bool = False,
     ):
         """Initialize map centered on San Diego by default."""
+        import folium
+        from folium import plugins
+
         self.map = folium.Map(
             location=[center_lat, center_lon], zoom_start=11, tiles="cartodbpositron"
         )
@@ -50,6 +51,8 @@ class MapViewer:
 
     def _add_businesses(self, nodes: List[Node], color: str = "red"):
         """Add business markers to map."""
+        import folium
+
         for node in nodes:
             popup_html = self._create_popup_html(node)
 
@@ -61,6 +64,10 @@ class MapViewer:
 
     def _add_polygons(self, nodes: List[Node], layer_name: str, color: str = "blue"):
         """Add polygon features to map."""
+        import folium
+        import geopandas as gpd
+        import pandas as pd
+
         if self.verbose:
             print(f"\nAdding {len(nodes)} polygons to {layer_name}")
 
@@ -121,6 +128,8 @@ class MapViewer:
 
     def _add_points(self, nodes: List[Node], layer_name: str, color: str = "blue"):
         """Add point features (cities/neighborhoods) to map."""
+        import folium
+
         for node in nodes:
             popup_html = self._create_popup_html(node)
 
@@ -133,8 +142,9 @@ class MapViewer:
                 radius=8,
             ).add_to(self.layers[layer_name])
 
-    def needs_visualization(self, graph: Graph) -> bool:
-        """Determine if visualization is needed."""
+    @staticmethod
+    def needs_visualization(graph: Graph) -> bool:
+        """Determine if visualization is needed, without creating a map."""
         spatial_nodes = {"BlockGroup", "Zipcode", "Business"}
         return any(
             any(label in spatial_nodes for label in node.labels) for node in graph.nodes
@@ -184,6 +194,8 @@ class MapViewer:
 
     def show(self):
         """Display the map in browser."""
+        import folium
+
         try:
             # Add layers to map
             for layer in self.layers.values():
@@ -1,11 +1,14 @@
 import os
 import json
+from functools import lru_cache
 
 
+@lru_cache(maxsize=None)
 def get_root_dir():
     """
     Walk upwards from this module's directory to find the repository root.
     The root is identified by the presence of a .git folder or pyproject.toml file.
+    The result is cached, the directory tree is only walked once per process.
 
     Returns:
         str: Absolute path to the repository root.
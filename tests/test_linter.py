@@ -0,0 +1,90 @@
+import json
+
+import pytest
+
+from biz_opps.neo4j.schema_registry import get_constraints_schema_path
+from biz_opps.query.cypher.linter import CypherLinter
+
+
+@pytest.fixture(scope="module")
+def linter():
+    with open(get_constraints_schema_path()) as file:
+        return CypherLinter(json.load(file))
+
+
+def test_valid_query(linter):
+    cypher = (
+        "MATCH (b:Business)-[:LOCATED_IN]->(bg:BlockGroup) "
+        "WHERE b.business_type = 'bakery' RETURN bg.ct_block_group, count(b)"
+    )
+    assert linter.lint(cypher) == []
+
+
+def test_unknown_label_and_relationship_type(linter):
+    issues = linter.lint("MATCH (s:Store)-[:SELLS]->(b:Business) RETURN s")
+    assert "Label :Store does not exist in the schema" in issues
+    assert "Relationship type :SELLS does not exist in the schema" in issues
+
+
+def test_unknown_property(linter):
+    issues = linter.lint("MATCH (b:Business) RETURN b.revenue")
+    assert issues == ["Property revenue does not exist on b:Business"]
+
+
+def test_wrong_direction(linter):
+    issues = linter.lint(
+        "MATCH (bg:BlockGroup)-[:LOCATED_IN]->(b:Business) RETURN count(b)"
+    )
+    assert issues == [
+        ":LOCATED_IN points the wrong way, it goes from (Business) to (BlockGroup)"
+    ]
+
+
+def test_left_pointing_relationship(linter):
+    cypher = "MATCH (bg:BlockGroup)<-[:LOCATED_IN]-(b:Business) RETURN count(b)"
+    assert linter.lint(cypher) == []
+
+
+def test_alternation_connecting_labels(linter):
+    cypher = "MATCH (c:City)-[:HAS_NEIGHBORHOOD|HAS_NEARBY]->(n:Neighborhood) RETURN n.neighborhood_name"
+    assert linter.lint(cypher) == []
+
+
+def test_alternation_never_connecting_labels(linter):
+    issues = linter.lint(
+        "MATCH (z:Zipcode)-[:HAS_NEIGHBORHOOD|HAS_NEARBY]->(n:Neighborhood) RETURN n"
+    )
+    assert issues == [
+        ":HAS_NEIGHBORHOOD|HAS_NEARBY never connects (Zipcode) to (Neighborhood)"
+    ]
+
+
+def test_variable_length_relationship(linter):
+    cypher = (
+        "MATCH (b:Business)-[:LOCATED_IN|IS_WITHIN*1..2]->(z:Zipcode) "
+        "RETURN z.zipcode_number, count(b)"
+    )
+    assert linter.lint(cypher) == []
+
+
+def test_invalid_enum_value(linter):
+    issues = linter.lint("MATCH (b:Business {business_type: 'spaceport'}) RETURN b")
+    assert len(issues) == 1
+    assert issues[0].startswith(
+        "'spaceport' is not a valid value of Business.business_type"
+    )
+
+
+def test_literals_are_not_linted(linter):
+    cypher = (
+        "MATCH (b:Business) WHERE b.business_name = '(x:Store)-[:SELLS]->()' RETURN b"
+    )
+    assert linter.lint(cypher) == []
+
+
+def test_age_average_enrichment(linter):
+    cypher = (
+        "MATCH (bg:BlockGroup)-[:HAS_ENRICHMENT]->(a:AgeAverage) "
+        "WHERE a.group = '25-44' RETURN bg.ct_block_group"
+    )
+    assert linter.lint(cypher) == []